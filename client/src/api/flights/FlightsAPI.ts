@@ -2,6 +2,9 @@ import axios, { AxiosInstance } from "axios";
 import { CreateFlightDTO, FlightDTO } from "../../models/flights/FlightDTO";
 import { IFlightsAPI } from "./IFlightsAPI";
 
+// Server prima najvise 1000 id-jeva (MAX_BATCH_IDS), ali i URL mora da stane u request liniju (gunicorn 4094 B)
+const FLIGHT_IDS_PER_REQUEST = 200;
+
 export class FlightsAPI implements IFlightsAPI {
 	private readonly axiosInstance: AxiosInstance;
 
@@ -20,6 +23,24 @@ export class FlightsAPI implements IFlightsAPI {
 		return (await this.axiosInstance.get<FlightDTO>(`/flights/${id}`)).data;
 	}
 
+	async getFlightsByIds(ids: number[]): Promise<Record<number, FlightDTO>> {
+		const unique = [...new Set(ids)];
+		const chunks: number[][] = [];
+		for (let start = 0; start < unique.length; start += FLIGHT_IDS_PER_REQUEST) {
+			chunks.push(unique.slice(start, start + FLIGHT_IDS_PER_REQUEST));
+		}
+		const pages = await Promise.all(
+			chunks.map(async (chunk) =>
+				(
+					await this.axiosInstance.get<Record<number, FlightDTO>>("/flights", {
+						params: { ids: chunk.join(",") },
+					})
+				).data
+			)
+		);
+		return Object.assign({}, ...pages);
+	}
+
 	async createFlight(token: string, data: CreateFlightDTO): Promise<FlightDTO> {
 		return (
 			await this.axiosInstance.post<FlightDTO>("/flights", data, {
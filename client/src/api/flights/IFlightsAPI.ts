@@ -3,6 +3,7 @@ import { CreateFlightDTO, FlightDTO } from "../../models/flights/FlightDTO";
 export interface IFlightsAPI {
 	getAllFlights(): Promise<FlightDTO[]>;
 	getFlightById(id: number): Promise<FlightDTO>;
+	getFlightsByIds(ids: number[]): Promise<Record<number, FlightDTO>>;
 	createFlight(token: string, data: CreateFlightDTO): Promise<FlightDTO>;
 	updateFlight(token: string, id: number, data: CreateFlightDTO): Promise<FlightDTO>;
 	approveFlight(token: string, id: number): Promise<FlightDTO>;
@@ -1,7 +1,7 @@
 import { CreatePurchaseResponse, PurchaseDTO } from "../../models/purchases/PurchaseDTO";
 
 export interface IPurchasesAPI {
-  createPurchase(data: { user_id: number; flight_id: number; user_email?: string }): Promise<CreatePurchaseResponse>;
+  createPurchase(data: { user_id: number; flight_id: number; user_email?: string }, idempotencyKey: string): Promise<CreatePurchaseResponse>;
   getUserPurchases(userId: number): Promise<PurchaseDTO[]>;
   cancelPurchase(purchaseId: number, token?: string | null): Promise<PurchaseDTO>;
 }
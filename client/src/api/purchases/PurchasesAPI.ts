@@ -12,8 +12,10 @@ export class PurchasesAPI implements IPurchasesAPI {
     });
   }
 
-  async createPurchase(data: { user_id: number; flight_id: number; user_email?: string }): Promise<CreatePurchaseResponse> {
-    return (await this.axiosInstance.post<CreatePurchaseResponse>("/purchase", data)).data;
+  async createPurchase(data: { user_id: number; flight_id: number; user_email?: string }, idempotencyKey: string): Promise<CreatePurchaseResponse> {
+    // Kljuc pravi pozivalac jednom po nameri kupovine - isti kljuc pri ponovnom slanju vraca postojecu kupovinu
+    const config = { headers: { "Idempotency-Key": idempotencyKey } };
+    return (await this.axiosInstance.post<CreatePurchaseResponse>("/purchase", data, config)).data;
   }
 
   async getUserPurchases(userId: number): Promise<PurchaseDTO[]> {
@@ -10,4 +10,7 @@ export interface CreatePurchaseResponse {
   message: string;
   purchase_id: number;
   status: string;
+  flight_id?: number;
+  ticket_price?: number;
+  duplicate?: boolean;
 }
@@ -34,22 +34,16 @@ export const AdminReviewsPage: React.FC = () => {
       setLoading(true);
       setError("");
       
-      // Fetch ratings and flights in parallel
-      const [fetchedRatings, fetchedFlights] = await Promise.all([
-        ratingsAPI.getAllRatings(),
-        flightsAPI.getAllFlights()
-      ]);
-
-      // Create a map of flights by ID for quick lookup
-      const flightsMap = new Map<number, FlightDTO>();
-      fetchedFlights.forEach(flight => {
-        flightsMap.set(flight.id, flight);
-      });
+      // Fetch ratings, then only the rated flights in one batch call
+      const fetchedRatings = await ratingsAPI.getAllRatings();
+      const flightsById = await flightsAPI.getFlightsByIds(
+        fetchedRatings.map(rating => rating.flight_id)
+      );
 
       // Combine ratings with flight information
       const reviewsWithFlights: ReviewWithFlight[] = fetchedRatings.map(rating => ({
         ...rating,
-        flight: flightsMap.get(rating.flight_id)
+        flight: flightsById[rating.flight_id]
       }));
 
       setReviews(reviewsWithFlights);
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { FlightsAPI } from "../api/flights/FlightsAPI";
 import { FlightDTO } from "../models/flights/FlightDTO";
@@ -271,6 +271,8 @@ const FlightsPage: React.FC = () => {
   const { user: authUser } = useAuth();
   const [purchaseMsg, setPurchaseMsg] = useState<string | null>(null);
   const [isPurchasing, setIsPurchasing] = useState<number | null>(null);
+  // Idempotency kljuc po letu: isti kljuc za ponovljene pokusaje iste kupovine, nov tek posle ishoda
+  const purchaseKeys = useRef<Record<number, string>>({});
   if (loading) {
     return (
       <div
@@ -824,13 +826,21 @@ const FlightsPage: React.FC = () => {
                               setIsPurchasing(f.id);
                               setPurchaseMsg(null);
                               console.log("Sending", { user_id: authUser?.id, flight_id: f.id });
+                              const idempotencyKey = purchaseKeys.current[f.id] ??= crypto.randomUUID();
                               const res = await purchasesAPI.createPurchase({
                                 user_id: authUser.id,
                                 flight_id: f.id,
                                 user_email: authUser.email,
-                              });
+                              }, idempotencyKey);
+                              delete purchaseKeys.current[f.id];
                               setPurchaseMsg('Kupovina zapoceta! Potvrda kupovine ce stici na vas email.');
                             } catch (err: any){
+                              // Odbijena kupovina (4xx) je zavrsena - sledeci klik je nova kupovina;
+                              // bez odgovora ili 5xx kupovina je mozda upisana, pa retry nosi isti kljuc
+                              const status = err.response?.status;
+                              if (status !== undefined && status < 500) {
+                                delete purchaseKeys.current[f.id];
+                              }
                               setPurchaseMsg('Kupovina neuspesna:' + (err.response?.data?.error || err.message));
                             } finally {
                               setIsPurchasing(null);
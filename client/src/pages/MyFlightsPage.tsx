@@ -62,12 +62,15 @@ const MyFlightsPage: React.FC = () => {
         }
 
         const purchases = await purchasesAPI.getUserPurchases(authUser.id);
-        const allFlights = await flightsAPI.getAllFlights();
-        const allRatings = await ratingsAPI.getAllRatings();
+        // Samo letovi iz kupovina, jednim pozivom
+        const [flightsById, allRatings] = await Promise.all([
+          flightsAPI.getFlightsByIds(purchases.map((purchase) => purchase.flight_id)),
+          ratingsAPI.getAllRatings(),
+        ]);
 
         const combined: PurchasedFlight[] = purchases
           .map((purchase) => {
-            const flight = allFlights.find((f) => f.id === purchase.flight_id);
+            const flight = flightsById[purchase.flight_id];
             return flight ? { ...flight, purchase } : null;
           })
           .filter(Boolean) as PurchasedFlight[];
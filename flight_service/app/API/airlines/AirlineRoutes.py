@@ -3,6 +3,7 @@ from pydantic import ValidationError
 
 from app.API.airlines.AirlineService import AirlineService
 from app.Domain.DTOs.AirlineDTO import CreateAirlineDTO
+from app.Services.CollectionVersions import CollectionVersions
 
 airlines_bp = Blueprint("airlines", __name__, url_prefix="/api/v1/airlines")
 
@@ -10,8 +11,14 @@ airlines_bp = Blueprint("airlines", __name__, url_prefix="/api/v1/airlines")
 @airlines_bp.route("", methods=["GET"])
 def get_all_airlines():
     try:
+        etag = CollectionVersions.etag("airlines")
+        if request.if_none_match.contains_weak(etag):
+            return CollectionVersions.not_modified(etag)
+
         airlines = AirlineService.get_all_airlines()
-        return jsonify([a.model_dump() for a in airlines]), 200
+        response = jsonify([a.model_dump() for a in airlines])
+        response.set_etag(etag)
+        return response, 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1,26 +1,149 @@
+from datetime import datetime
 from flask import Blueprint, jsonify, request, current_app
 from pydantic import ValidationError
 from app.API.flights.FlightService import FlightService
 from app.Domain.DTOs.FlightDTO import CreateFlightDTO
+from app.Domain.enums.FlightStatus import FlightStatus
+from app.Services.CollectionVersions import CollectionVersions
+from app.Services.FlightCatalog import FlightCatalog
+from app.Helpers.fields import parse_fields
 from app.Middleware.auth import jwt_required_custom, get_current_user, admin_required, manager_or_admin_required
 
 flights_bp = Blueprint("flights", __name__, url_prefix="/api/v1/flights")
 
+def _parse_flight_filters(args) -> dict:
+    """Filteri iz query stringa: status, airline_id, departure_airport, arrival_airport, departure_from, departure_to"""
+    filters = {}
+
+    status = args.get("status")
+    if status:
+        try:
+            filters["status"] = FlightStatus[status.upper()]
+        except KeyError:
+            raise ValueError(f"Invalid status: {status}")
+
+    airline_id = args.get("airline_id")
+    if airline_id:
+        try:
+            filters["airline_id"] = int(airline_id)
+        except ValueError:
+            raise ValueError("airline_id must be an integer")
+
+    filters["departure_airport"] = args.get("departure_airport")
+    filters["arrival_airport"] = args.get("arrival_airport")
+
+    for key in ("departure_from", "departure_to"):
+        value = args.get(key)
+        if value:
+            try:
+                filters[key] = datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"{key} must be in format YYYY-MM-DD HH:MM:SS")
+
+    return filters
+
+def _parse_ids(raw) -> list:
+    """"1,2,3" ili lista iz JSON tela -> sortirani jedinstveni int id-jevi"""
+    if isinstance(raw, str):
+        raw = [value for value in raw.split(",") if value.strip()]
+    if not isinstance(raw, list):
+        raise ValueError("ids must be a list of integers")
+    try:
+        ids = sorted({int(value) for value in raw})
+    except (TypeError, ValueError):
+        raise ValueError("ids must be a list of integers")
+    if len(ids) > FlightService.MAX_BATCH_IDS:
+        raise ValueError(f"At most {FlightService.MAX_BATCH_IDS} ids per request")
+    return ids
+
+def _flights_by_ids(version: int, ids: list, fields: list = None):
+    """Bez fields iz FlightCatalog-a, sa fields jednim IN upitom nad trazenim kolonama"""
+    if fields:
+        return jsonify(FlightService.get_flights_by_ids(ids, fields))
+    return _json_bytes(FlightCatalog.flights_body(version, ids))
+
+def _json_bytes(body: bytes):
+    return current_app.response_class(body, mimetype="application/json")
+
+@flights_bp.route("/catalog/metrics", methods=["GET"])
+def get_catalog_metrics():
+    return jsonify(FlightCatalog.metrics()), 200
+
 @flights_bp.route("", methods=["GET"])
 def get_all_flights():
-    """Javni endpoint - ne zahteva autentifikaciju"""
+    """Javni endpoint - ne zahteva autentifikaciju
+
+    Bez ?limit/?cursor vraca listu (kao ranije), sa njima vraca
+    {"items": [...], "next_cursor": ...} za keyset paginaciju.
+    ?fields=id,name,... vraca samo ta polja (i samo njih cita iz baze).
+    ?ids=1,2,3 vraca {"<id>": let} samo za te letove (ostali filteri se ne primenjuju).
+    """
     try:
-        flights = FlightService.get_all_flights()
-        return jsonify([f.model_dump() for f in flights]), 200
+        filters = _parse_flight_filters(request.args)
+        fields = parse_fields(request.args.get("fields"), FlightService.FIELDS)
+
+        version = CollectionVersions.get("flights")
+        etag = CollectionVersions.etag("flights", request.query_string, version=version)
+        if request.if_none_match.contains_weak(etag):
+            return CollectionVersions.not_modified(etag)
+
+        paged = "limit" in request.args or "cursor" in request.args
+        if "ids" in request.args:
+            response = _flights_by_ids(version, _parse_ids(request.args["ids"]), fields)
+        elif fields:
+            # Katalog drzi ceo oblik leta - za ?fields= ide uzak upit samo nad trazenim kolonama
+            if paged:
+                items, next_cursor = FlightService.get_flights_page(
+                    filters, request.args.get("cursor"), request.args.get("limit", type=int), fields
+                )
+                response = jsonify({"items": items, "next_cursor": next_cursor})
+            else:
+                response = jsonify(FlightService.get_all_flights(filters, fields))
+        # Odgovor su gotovi bajtovi iz FlightCatalog-a - bez upita nad letovima dok se verzija ne promeni
+        elif paged:
+            limit = request.args.get("limit", type=int)
+            cursor = request.args.get("cursor")
+            response = _json_bytes(FlightCatalog.page_body(version, filters, cursor, limit))
+        elif not request.args and "gzip" in request.accept_encodings:
+            response = _json_bytes(FlightCatalog.list_body(version, gzipped=True))
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = _json_bytes(FlightCatalog.list_body(version, filters))
+
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag)
+        return response, 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@flights_bp.route("/batch", methods=["POST"])
+def get_flights_batch():
+    """Interni endpoint za duge liste id-jeva: {"ids": [...], "fields": "id,name"} -> {"<id>": let}"""
+    try:
+        data = request.get_json() or {}
+        ids = _parse_ids(data.get("ids", []))
+        fields = parse_fields(data.get("fields"), FlightService.FIELDS)
+        return _flights_by_ids(CollectionVersions.get("flights"), ids, fields), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
 @flights_bp.route("/<int:flight_id>", methods=["GET"])
 def get_flight(flight_id: int):
     """Javni endpoint - ne zahteva autentifikaciju"""
     try:
-        flight = FlightService.get_flight_by_id(flight_id)
-        return jsonify(flight.model_dump()), 200
+        version = CollectionVersions.get("flights")
+        etag = CollectionVersions.etag("flights", flight_id, version=version)
+        if request.if_none_match.contains_weak(etag):
+            return CollectionVersions.not_modified(etag)
+
+        body = FlightCatalog.flight_body(version, flight_id)
+        if body is None:
+            raise ValueError("Flight not found")
+        response = _json_bytes(body)
+        response.set_etag(etag)
+        return response, 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
 
@@ -93,14 +216,14 @@ def cancel_flight(flight_id: int):
 
         server_base_url = current_app.config.get("SERVER_URL")
 
-        flight = FlightService.cancel_flight(
+        flight, cancelled_purchases = FlightService.cancel_flight(
             flight_id,
             user["email"],
             token,
             server_base_url
         )
 
-        return jsonify(flight.model_dump()), 200
+        return jsonify({**flight.model_dump(), "cancelled_purchases": cancelled_purchases}), 200
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
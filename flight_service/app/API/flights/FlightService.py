@@ -3,38 +3,146 @@ from app.Domain.models.Flight import Flight
 from app.Domain.models.Airline import Airline
 from app.Domain.DTOs.FlightDTO import FlightDTO, CreateFlightDTO
 from app.Domain.enums.FlightStatus import FlightStatus
-from datetime import datetime
+from datetime import datetime, timedelta
+import base64
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import joinedload
 from app.Services.EmailService import EmailService
 from app.Services.FlightMailTemplates import flight_created_body, flight_status_changed_body
 from app.Extensions.socketio import socketio
+from app.Services.FlightStatusWatcher import FlightStatusWatcher
 from app.Domain.models.Purchase import Purchase
 from app.Domain.enums.PurchaseStatus import PurchaseStatus
 
 class FlightService:
-    
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+    MAX_BATCH_IDS = 1000
+
+    # Kolone za listanje - airline_name dolazi iz JOIN-a, bez lazy load-a po letu
+    _ROW_COLUMNS = (
+        Flight.id,
+        Flight.name,
+        Flight.airline_id,
+        Airline.name.label("airline_name"),
+        Flight.distance_km,
+        Flight.duration_minutes,
+        Flight.departure_time,
+        Flight.departure_airport,
+        Flight.arrival_airport,
+        Flight.created_by_user_id,
+        Flight.ticket_price,
+        Flight.status,
+        Flight.rejection_reason,
+    )
+    # Dozvoljena polja za ?fields= (isti nazivi kao u FlightDTO)
+    FIELDS = tuple(column.key for column in _ROW_COLUMNS)
+
+    @staticmethod
+    def get_all_flights(filters: dict = None, fields: list = None):
+        rows = FlightService._filtered_query(filters, fields).all()
+        return [FlightService._row_to_dict(r, fields) for r in rows]
+
+    @staticmethod
+    def get_flights_by_ids(ids: list, fields: list = None) -> dict:
+        """Vise letova jednim IN upitom - {id: let}, nepostojeci id-jevi se izostavljaju"""
+        if not ids:
+            return {}
+        rows = FlightService._filtered_query(None, fields).filter(Flight.id.in_(ids)).all()
+        return {row.id: FlightService._row_to_dict(row, fields) for row in rows}
+
+    @staticmethod
+    def get_flights_page(filters: dict = None, cursor: str = None, limit: int = None, fields: list = None):
+        """Keyset paginacija po (departure_time, id) - vraca (letovi, next_cursor)"""
+        limit = limit or FlightService.DEFAULT_PAGE_SIZE
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        limit = min(limit, FlightService.MAX_PAGE_SIZE)
+
+        query = FlightService._filtered_query(filters, fields)
+        if cursor:
+            last_departure, last_id = FlightService._decode_cursor(cursor)
+            query = query.filter(or_(
+                Flight.departure_time > last_departure,
+                and_(Flight.departure_time == last_departure, Flight.id > last_id)
+            ))
+
+        # Uzimamo jedan vise da znamo da li postoji sledeca strana
+        rows = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = FlightService._encode_cursor(rows[-1])
+
+        return [FlightService._row_to_dict(r, fields) for r in rows], next_cursor
+
+    @staticmethod
+    def _filtered_query(filters: dict = None, fields: list = None):
+        """Sa fields se biraju samo te kolone (+ id i departure_time za redosled i cursor)"""
+        filters = filters or {}
+        columns = FlightService._ROW_COLUMNS
+        if fields:
+            keep = set(fields) | {"id", "departure_time"}
+            columns = [column for column in columns if column.key in keep]
+
+        query = db.session.query(*columns)
+        if fields is None or "airline_name" in fields:
+            query = query.join(Airline, Flight.airline_id == Airline.id)
+
+        if filters.get("status") is not None:
+            query = query.filter(Flight.status == filters["status"])
+        if filters.get("airline_id") is not None:
+            query = query.filter(Flight.airline_id == filters["airline_id"])
+        if filters.get("departure_airport"):
+            query = query.filter(Flight.departure_airport == filters["departure_airport"])
+        if filters.get("arrival_airport"):
+            query = query.filter(Flight.arrival_airport == filters["arrival_airport"])
+        if filters.get("departure_from") is not None:
+            query = query.filter(Flight.departure_time >= filters["departure_from"])
+        if filters.get("departure_to") is not None:
+            query = query.filter(Flight.departure_time <= filters["departure_to"])
+
+        return query.order_by(Flight.departure_time, Flight.id)
+
     @staticmethod
-    def get_all_flights():
-        flights = Flight.query.all()
-        return [FlightService._to_dto(f) for f in flights]
+    def _encode_cursor(flight) -> str:
+        raw = f"{flight.departure_time.isoformat()}|{flight.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            departure, flight_id = raw.split("|")
+            return datetime.fromisoformat(departure), int(flight_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
     
     @staticmethod
     def get_flight_by_id(flight_id: int):
-        flight = Flight.query.get(flight_id)
+        flight = FlightService._load_flight(flight_id)
         if not flight:
             raise ValueError("Flight not found")
         return FlightService._to_dto(flight)
+
+    @staticmethod
+    def _load_flight(flight_id: int):
+        # Airline se ucitava u istom upitu (DTO i mail template citaju flight.airline.name)
+        return Flight.query.options(joinedload(Flight.airline)).get(flight_id)
     
     @staticmethod
     def create_flight(dto: CreateFlightDTO, created_by_user_id: int, user_email: str):
         airline = Airline.query.get(dto.airline_id)
         if not airline:
             raise ValueError("Airline not found")
+        departure_time = datetime.strptime(dto.departure_time, "%Y-%m-%d %H:%M:%S")
         flight = Flight(
             name=dto.name,
             airline_id=dto.airline_id,
             distance_km=dto.distance_km,
             duration_minutes=dto.duration_minutes,
-            departure_time=datetime.strptime(dto.departure_time, "%Y-%m-%d %H:%M:%S"),
+            departure_time=departure_time,
+            landing_time=departure_time + timedelta(minutes=dto.duration_minutes),
             departure_airport=dto.departure_airport,
             arrival_airport=dto.arrival_airport,
             created_by_user_id=created_by_user_id,
@@ -59,7 +167,7 @@ class FlightService:
 
     @staticmethod
     def update_flight(flight_id: int, dto: CreateFlightDTO, user: dict):
-        flight = Flight.query.get(flight_id)
+        flight = FlightService._load_flight(flight_id)
         if not flight:
             raise ValueError("Flight not found")
 
@@ -76,6 +184,7 @@ class FlightService:
         flight.distance_km = dto.distance_km
         flight.duration_minutes = dto.duration_minutes
         flight.departure_time = datetime.strptime(dto.departure_time, "%Y-%m-%d %H:%M:%S")
+        flight.landing_time = flight.departure_time + timedelta(minutes=dto.duration_minutes)
         flight.departure_airport = dto.departure_airport
         flight.arrival_airport = dto.arrival_airport
         flight.ticket_price = dto.ticket_price
@@ -83,11 +192,14 @@ class FlightService:
         flight.rejection_reason = None
         db.session.commit()
 
+        # Izmenjen let ponovo ceka odobrenje
+        FlightStatusWatcher.unschedule(flight.id)
+
         return FlightService._to_dto(flight)
     
     @staticmethod
     def approve_flight(flight_id: int, admin_email: str):
-        flight = Flight.query.get(flight_id)
+        flight = FlightService._load_flight(flight_id)
         if not flight:
             raise ValueError("Flight not found")
         
@@ -95,11 +207,14 @@ class FlightService:
         flight.status = FlightStatus.APPROVED
         db.session.commit()
 
+        FlightStatusWatcher.schedule(flight)
+
         try:
             EmailService.send(
                 to=admin_email,
                 subject="✅ Let odobren",
-                body=flight_status_changed_body(flight, getattr(old_status, "value", old_status), flight.status.value)
+                body=flight_status_changed_body(flight, getattr(old_status, "value", old_status), flight.status.value),
+                digest=True
             )
         except Exception as e:
             print(f"Failed to send email: {e}")
@@ -123,7 +238,7 @@ class FlightService:
     
     @staticmethod
     def reject_flight(flight_id: int, reason: str, admin_email: str):
-        flight = Flight.query.get(flight_id)
+        flight = FlightService._load_flight(flight_id)
         if not flight:
             raise ValueError("Flight not found")
         
@@ -132,6 +247,8 @@ class FlightService:
         flight.rejection_reason = reason
         db.session.commit()
 
+        FlightStatusWatcher.unschedule(flight.id)
+
         try:
             EmailService.send(
                 to=admin_email,
@@ -141,7 +258,8 @@ class FlightService:
                     getattr(old_status, "value", old_status),
                     flight.status.value,
                     reason=reason
-                )
+                ),
+                digest=True
             )
         except Exception as e:
             print(f"Failed to send email: {e}")
@@ -160,17 +278,28 @@ class FlightService:
     
     @staticmethod
     def cancel_flight(flight_id: int, admin_email: str, auth_token: str, server_base_url: str):
-        flight = Flight.query.get(flight_id)
+        flight = FlightService._load_flight(flight_id)
         if not flight:
             raise ValueError("Flight not found")
 
         if flight.status == FlightStatus.COMPLETED:
             raise ValueError("Cannot cancel a completed flight")
 
+        if flight.status == FlightStatus.CANCELLED:
+            # Ponovljeno otkazivanje (retry ili admin) samo vraca otkazane kupovine da se povrat zavrsi
+            cancelled_purchases = FlightService._cancelled_purchases(flight.id, [])
+            db.session.commit()
+            return FlightService._to_dto(flight), cancelled_purchases
+
         old_status = flight.status
         flight.status = FlightStatus.CANCELLED
+        # flush zakljucava red leta - rezervacije u toku (deljeni lock) se zavrse pre otkazivanja kupovina
+        db.session.flush()
+        cancelled_purchases = FlightService._cancel_purchases(flight.id)
         db.session.commit()
 
+        FlightStatusWatcher.unschedule(flight.id)
+
         # ------------------------
         #  Mail adminu
         # ------------------------
@@ -182,25 +311,12 @@ class FlightService:
                     flight,
                     getattr(old_status, "value", old_status),
                     flight.status.value
-                )
+                ),
+                digest=True
             )
         except Exception as e:
             print(f"Failed to send admin email: {e}")
 
-        # ------------------------
-        #  Cancel purchases first
-        # ------------------------
-            # ------------------------
-            #  Cancel all purchases
-            # ------------------------
-            purchases = Purchase.query.filter_by(
-                flight_id=flight.id
-            ).all()
-            for purchase in purchases:
-                if purchase.status != PurchaseStatus.CANCELLED:
-                    purchase.status = PurchaseStatus.CANCELLED
-            db.session.commit()
-
         # ------------------------
         #  WebSocket event
         # ------------------------
@@ -213,23 +329,75 @@ class FlightService:
         except Exception as e:
             print(f"Failed to emit WebSocket event: {e}")
 
-        return FlightService._to_dto(flight)
+        return FlightService._to_dto(flight), cancelled_purchases
+
+    @staticmethod
+    def _cancel_purchases(flight_id: int) -> list:
+        """Jedan skupovni UPDATE za sve aktivne kupovine leta; vraca sve otkazane kupovine leta"""
+        condition = (
+            Purchase.flight_id == flight_id,
+            Purchase.status.in_([PurchaseStatus.IN_PROGRESS, PurchaseStatus.COMPLETED])
+        )
+        returned = (Purchase.id,)
+        values = {"status": PurchaseStatus.CANCELLED}
+
+        if db.engine.dialect.update_returning:
+            stmt = update(Purchase).where(*condition).values(**values).returning(*returned)
+            rows = db.session.execute(stmt, execution_options={"synchronize_session": False}).all()
+        else:
+            # MySQL nema UPDATE ... RETURNING - zakljucaj pogodjene redove pa ih azuriraj po id-u
+            rows = db.session.execute(select(*returned).where(*condition).with_for_update()).all()
+            if rows:
+                stmt = update(Purchase).where(Purchase.id.in_([row.id for row in rows])).values(**values)
+                db.session.execute(stmt, execution_options={"synchronize_session": False})
+
+        return FlightService._cancelled_purchases(flight_id, [row.id for row in rows])
+
+    @staticmethod
+    def _cancelled_purchases(flight_id: int, cancelled_now: list) -> list:
+        """
+        Sve otkazane kupovine leta (id, user_id, ticket_price, idempotency_key), ne samo
+        one iz ovog poziva - server vraca novac samo za zaduzene kljuceve, idempotentno po id-u.
+        Stare kupovine bez kljuca nemaju zaduzenje u ledger-u, pa idu samo kad ih otkaze ovaj poziv.
+        """
+        rows = db.session.execute(
+            select(Purchase.id, Purchase.user_id, Purchase.ticket_price, Purchase.idempotency_key)
+            .where(
+                Purchase.flight_id == flight_id,
+                Purchase.status == PurchaseStatus.CANCELLED,
+                or_(Purchase.idempotency_key.isnot(None), Purchase.id.in_(cancelled_now))
+            )
+            .order_by(Purchase.id)
+        ).all()
+        return [row._asdict() for row in rows]
     
     @staticmethod
     def delete_flight(flight_id: int):
-        flight = Flight.query.get(flight_id)
+        flight = FlightService._load_flight(flight_id)
         if not flight:
             raise ValueError("Flight not found")
         
         db.session.delete(flight)
         db.session.commit()
 
+        FlightStatusWatcher.unschedule(flight_id)
+
         # WebSocket
         socketio.emit("flight_deleted", {
             "id": flight.id,
             "name": flight.name
         })
     
+    @staticmethod
+    def _row_to_dict(row, fields: list = None) -> dict:
+        """Lagana serijalizacija - isti oblik kao FlightDTO.model_dump() (ili samo fields), bez pydantic-a po redu"""
+        data = row._asdict()
+        if "status" in data:
+            data["status"] = row.status.value
+        if fields:
+            data = {name: data[name] for name in fields}
+        return data
+
     @staticmethod
     def _to_dto(flight: Flight) -> FlightDTO:
         return FlightDTO(
@@ -2,6 +2,9 @@ from flask import Blueprint, jsonify, request
 from app.API.purchases.PurchaseService import PurchaseService
 from app.Extensions.db import db
 from app.Domain.models.Purchase import Purchase
+from app.Services.CollectionVersions import CollectionVersions
+from app.Services.PurchaseWorkerPool import PurchaseWorkerPool
+from app.Helpers.fields import parse_fields
 
 purchase_bp = Blueprint("purchase_bp", __name__)
 
@@ -22,18 +25,88 @@ def create_purchase():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+@purchase_bp.route("/purchases/reserve", methods=["POST"])
+def reserve_purchase():
+    data = request.get_json() or {}
+
+    try:
+        purchase, duplicate = PurchaseService.reserve_purchase(
+            data.get("user_id"),
+            data.get("flight_id"),
+            data.get("idempotency_key"),
+            data.get("user_email")
+        )
+        return jsonify({
+            "message": "Kupovina zapoceta.",
+            "purchase_id": purchase.id,
+            "flight_id": purchase.flight_id,
+            "status": purchase.status.name,
+            "ticket_price": purchase.ticket_price,
+            "duplicate": duplicate
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@purchase_bp.route("/purchases/<int:purchase_id>/confirm", methods=["POST"])
+def confirm_purchase(purchase_id):
+    try:
+        purchase = PurchaseService.confirm_purchase(purchase_id)
+        return jsonify({
+            "message": "Kupovina potvrdjena.",
+            "purchase_id": purchase.id,
+            "flight_id": purchase.flight_id,
+            "status": purchase.status.name,
+            "ticket_price": purchase.ticket_price
+        }), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+
+@purchase_bp.route("/purchase-jobs/metrics", methods=["GET"])
+def get_purchase_job_metrics():
+    try:
+        return jsonify(PurchaseWorkerPool.metrics()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @purchase_bp.route("/purchases/<int:user_id>", methods=["GET"])
 def get_user_purchases(user_id):
-    purchases = Purchase.query.filter_by(user_id=user_id).all()
-    return jsonify([
-        {
-            "id": p.id,
-            "flight_id": p.flight_id,
-            "status": p.status.name,
-            "ticket_price": p.ticket_price,
-            "purchase_time": p.purchase_time.isoformat()
-        } for p in purchases
-    ])
+    try:
+        fields = parse_fields(request.args.get("fields"), PurchaseService.FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = CollectionVersions.etag("purchases", user_id, fields)
+    if request.if_none_match.contains_weak(etag):
+        return CollectionVersions.not_modified(etag)
+
+    response = jsonify(PurchaseService.get_user_purchases(user_id, fields))
+    response.set_etag(etag)
+    return response
+
+@purchase_bp.route("/purchases/<int:user_id>/history", methods=["GET"])
+def get_user_purchase_history(user_id):
+    """Istorija kupovina sa podacima leta: ?limit, ?cursor, ?status=COMPLETED,CANCELLED -> {"items", "next_cursor"}"""
+    try:
+        statuses = PurchaseService.parse_statuses(request.args.get("status"))
+
+        # Stavke nose i podatke leta, pa ETag zavisi od obe kolekcije
+        etag = CollectionVersions.etag(
+            "purchases", user_id, request.query_string, CollectionVersions.get("flights")
+        )
+        if request.if_none_match.contains_weak(etag):
+            return CollectionVersions.not_modified(etag)
+
+        items, next_cursor = PurchaseService.get_purchase_history(
+            user_id,
+            statuses,
+            request.args.get("cursor"),
+            request.args.get("limit", type=int)
+        )
+        response = jsonify({"items": items, "next_cursor": next_cursor})
+        response.set_etag(etag)
+        return response
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 @purchase_bp.route("/purchases/by-id/<int:purchase_id>", methods=["GET"])
 def get_purchase_by_id(purchase_id):
@@ -46,22 +119,17 @@ def get_purchase_by_id(purchase_id):
         "flight_id": purchase.flight_id,
         "status": purchase.status.name,
         "ticket_price": purchase.ticket_price,
-        "purchase_time": purchase.purchase_time.isoformat()
+        "purchase_time": purchase.purchase_time.isoformat(),
+        "idempotency_key": purchase.idempotency_key
     })
 
 @purchase_bp.route("/purchases/by-flight/<int:flight_id>", methods=["GET"])
 def get_purchases_by_flight(flight_id):
-    purchases = Purchase.query.filter_by(flight_id=flight_id).all()
-    return jsonify([
-        {
-            "id": p.id,
-            "user_id": p.user_id,
-            "flight_id": p.flight_id,
-            "status": p.status.name,
-            "ticket_price": p.ticket_price,
-            "purchase_time": p.purchase_time.isoformat()
-        } for p in purchases
-    ])
+    try:
+        fields = parse_fields(request.args.get("fields"), PurchaseService.FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(PurchaseService.get_purchases_by_flight(flight_id, fields))
 
 @purchase_bp.route("/purchases/<int:purchase_id>/cancel", methods=["PUT"])
 def cancel_purchase(purchase_id):
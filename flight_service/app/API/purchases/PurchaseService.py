@@ -1,17 +1,141 @@
-import time
-import threading #ovo za asinhronu obranu koristim
-from flask import current_app
+import base64
+from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
 from app.Extensions.db import db
 from app.Domain.enums.PurchaseStatus import PurchaseStatus
 from app.Domain.models.Purchase import Purchase
 from app.Domain.models.Flight import Flight
-from app.Services.EmailService import EmailService
-from app.Services.PassengerMailTemplates import purchase_completed_body
+from app.Domain.models.Airline import Airline
+from app.Services.PurchaseWorkerPool import PurchaseWorkerPool
 
 class PurchaseService:
+    # Kolone za liste kupovina; kljucevi su i dozvoljena polja za ?fields=
+    _LIST_COLUMNS = {
+        "id": Purchase.id,
+        "user_id": Purchase.user_id,
+        "flight_id": Purchase.flight_id,
+        "status": Purchase.status,
+        "ticket_price": Purchase.ticket_price,
+        "purchase_time": Purchase.purchase_time,
+    }
+    FIELDS = tuple(_LIST_COLUMNS)
+    USER_LIST_FIELDS = ("id", "flight_id", "status", "ticket_price", "purchase_time")
+
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
+    # Istorija - kupovina i osnovni podaci leta iz istog upita (JOIN), bez dodatnog poziva po letu
+    _HISTORY_COLUMNS = (
+        Purchase.id,
+        Purchase.flight_id,
+        Purchase.status,
+        Purchase.ticket_price,
+        Purchase.purchase_time,
+        Flight.name.label("flight_name"),
+        Flight.departure_airport,
+        Flight.arrival_airport,
+        Flight.departure_time,
+        Airline.name.label("airline_name"),
+    )
+
+    @staticmethod
+    def get_user_purchases(user_id: int, fields: list = None):
+        return PurchaseService._list(Purchase.user_id == user_id, fields or PurchaseService.USER_LIST_FIELDS)
+
+    @staticmethod
+    def get_purchases_by_flight(flight_id: int, fields: list = None):
+        return PurchaseService._list(Purchase.flight_id == flight_id, fields or PurchaseService.FIELDS)
+
+    @staticmethod
+    def get_purchase_history(user_id: int, statuses: list = None, cursor: str = None, limit: int = None):
+        """
+        Kupovine korisnika od najnovije, keyset paginacija po (purchase_time, id)
+        nad indeksom (user_id, purchase_time, id) - vraca (kupovine, next_cursor).
+        """
+        limit = limit or PurchaseService.DEFAULT_PAGE_SIZE
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        limit = min(limit, PurchaseService.MAX_PAGE_SIZE)
+
+        query = (
+            db.session.query(*PurchaseService._HISTORY_COLUMNS)
+            .join(Flight, Purchase.flight_id == Flight.id)
+            .join(Airline, Flight.airline_id == Airline.id)
+            .filter(Purchase.user_id == user_id)
+        )
+        if statuses:
+            query = query.filter(Purchase.status.in_(statuses))
+        if cursor:
+            last_time, last_id = PurchaseService._decode_cursor(cursor)
+            query = query.filter(or_(
+                Purchase.purchase_time < last_time,
+                and_(Purchase.purchase_time == last_time, Purchase.id < last_id)
+            ))
+
+        # Uzimamo jedan vise da znamo da li postoji sledeca strana
+        rows = query.order_by(Purchase.purchase_time.desc(), Purchase.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = PurchaseService._encode_cursor(rows[-1])
+
+        items = []
+        for row in rows:
+            data = PurchaseService._row_to_dict(row)
+            data["departure_time"] = row.departure_time.isoformat()
+            items.append(data)
+        return items, next_cursor
+
+    @staticmethod
+    def parse_statuses(raw: str) -> list:
+        """?status=COMPLETED,IN_PROGRESS -> lista PurchaseStatus"""
+        statuses = []
+        for value in (raw or "").split(","):
+            value = value.strip()
+            if not value:
+                continue
+            try:
+                statuses.append(PurchaseStatus[value.upper()])
+            except KeyError:
+                raise ValueError(f"Invalid status: {value}")
+        return statuses
+
+    @staticmethod
+    def _encode_cursor(row) -> str:
+        raw = f"{row.purchase_time.isoformat()}|{row.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            purchase_time, purchase_id = raw.split("|")
+            return datetime.fromisoformat(purchase_time), int(purchase_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def _list(condition, fields: list):
+        """Cita samo kolone iz fields - bez ORM objekata po kupovini"""
+        columns = [PurchaseService._LIST_COLUMNS[name] for name in fields]
+        rows = db.session.query(*columns).filter(condition).all()
+        return [PurchaseService._row_to_dict(row) for row in rows]
+
+    @staticmethod
+    def _row_to_dict(row) -> dict:
+        data = row._asdict()
+        if "status" in data:
+            data["status"] = row.status.name
+        if data.get("purchase_time") is not None:
+            data["purchase_time"] = row.purchase_time.isoformat()
+        return data
+
     @staticmethod
-    def start_purchase(user_id: int, flight_id: int, user_email: str = None):
-        flight = Flight.query.get(flight_id)
+    def start_purchase(user_id: int, flight_id: int, user_email: str = None, idempotency_key: str = None,
+                       awaiting_payment: bool = False):
+        # Deljeno zakljucavanje - status leta ne moze da se promeni dok se kupovina upisuje
+        flight = Flight.query.filter_by(id=flight_id).with_for_update(read=True).first()
         if not flight:
             raise ValueError("Let ne postoji.")
         if flight.status.name != "APPROVED":
@@ -21,49 +145,55 @@ class PurchaseService:
             user_id=user_id,
             flight_id=flight_id,
             ticket_price=flight.ticket_price,
-            status=PurchaseStatus.IN_PROGRESS
+            status=PurchaseStatus.IN_PROGRESS,
+            idempotency_key=idempotency_key
         )
         db.session.add(purchase)
-        db.session.commit()
+        db.session.flush()
 
-        app = current_app._get_current_object()
-        thread = threading.Thread(
-            target=PurchaseService.__process_purchase,
-            args=(app, purchase.id, user_email,)
-        )
-        thread.start()
+        # Kupovina i posao u redu nastaju u istoj transakciji - obradu radi PurchaseWorkerPool
+        PurchaseWorkerPool.enqueue(purchase.id, user_email, awaiting_payment)
+        db.session.commit()
+        PurchaseWorkerPool.notify()
 
         return purchase
-    
+
     @staticmethod
-    def __process_purchase(app, purchase_id: int, user_email: str = None):
-        with app.app_context():
+    def reserve_purchase(user_id: int, flight_id: int, idempotency_key: str, user_email: str = None):
+        """
+        Rezervacija kljucem zasticena od duplikata - vraca (kupovina, da li je duplikat).
+        Worker je ne obradjuje dok server ne zaduzi korisnika i pozove confirm_purchase.
+        """
+        if not idempotency_key:
+            raise ValueError("Nedostaje idempotency_key.")
+        if len(idempotency_key) > 64:
+            raise ValueError("idempotency_key moze imati najvise 64 karaktera.")
+
+        existing = Purchase.query.filter_by(idempotency_key=idempotency_key).first()
+        if not existing:
             try:
-                time.sleep(5) #ovo je da simulira duzu obradu 
-
-                purchase = Purchase.query.get(purchase_id)
-                if not purchase:
-                    return
-
-                if purchase.status != PurchaseStatus.IN_PROGRESS:
-                    return
-            
-                purchase.status = PurchaseStatus.COMPLETED
-
-                db.session.commit()
-                if user_email:
-                    EmailService.send(
-                        to=user_email,
-                        subject="Kupovina karte uspesna",
-                        body=purchase_completed_body(purchase.flight, purchase.id, purchase.ticket_price)
-                    )
-                print(f"Kupovina je uspesno zavrsena; ID: {purchase_id}")
-            except Exception as e:
-                purchase = Purchase.query.get(purchase_id)
-                if purchase:
-                    purchase.status = PurchaseStatus.FAILED
-                    db.session.commit()
-                print(f"Greska u obradi kupovine. ID: {purchase_id} ; ERROR: {e}")
+                return PurchaseService.start_purchase(user_id, flight_id, user_email, idempotency_key, True), False
+            except IntegrityError:
+                # Paralelni zahtev sa istim kljucem je upisao kupovinu pre nas
+                db.session.rollback()
+                existing = Purchase.query.filter_by(idempotency_key=idempotency_key).first()
+
+        if int(existing.user_id) != int(user_id) or int(existing.flight_id) != int(flight_id):
+            raise ValueError("idempotency_key je vec iskoriscen za drugu kupovinu.")
+        return existing, True
+
+    @staticmethod
+    def confirm_purchase(purchase_id: int):
+        """Zaduzenje je knjizeno - rezervacija ide u obradu; ponovljena potvrda samo vraca kupovinu"""
+        confirmed = PurchaseWorkerPool.confirm(purchase_id)
+        db.session.commit()
+        if confirmed:
+            PurchaseWorkerPool.notify()
+
+        purchase = Purchase.query.get(purchase_id)
+        if not purchase:
+            raise ValueError("Purchase not found")
+        return purchase
 
     @staticmethod
     def cancel_purchase(purchase_id: int):
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from app.API.ratings.RatingService import RatingService
 from app.Domain.models.Rating import Rating
+from app.Services.CollectionVersions import CollectionVersions
 
 rating_bp = Blueprint("rating_bp", __name__)
 
@@ -20,10 +21,24 @@ def create_rating():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
     
+@rating_bp.route("/ratings/bulk", methods=["POST"])
+def create_ratings_bulk():
+    """Unos ocena prikupljenih van mreze: {"ratings": [{"user_id", "flight_id", "rating"}, ...]}"""
+    data = request.get_json(silent=True) or {}
+    try:
+        result = RatingService.add_ratings(data.get("ratings") if isinstance(data, dict) else data)
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
 @rating_bp.route("/ratings", methods=["GET"])
 def get_all_ratings():
+    etag = CollectionVersions.etag("ratings")
+    if request.if_none_match.contains_weak(etag):
+        return CollectionVersions.not_modified(etag)
+
     ratings = Rating.query.all()
-    return jsonify([
+    response = jsonify([
         {
             "id": r.id,
             "user_id": r.user_id,
@@ -31,4 +46,61 @@ def get_all_ratings():
             "rating": r.rating,
             "created_at": r.created_at.isoformat()
         } for r in ratings
-    ])
\ No newline at end of file
+    ])
+    response.set_etag(etag)
+    return response
+
+@rating_bp.route("/ratings/flights/<int:flight_id>/summary", methods=["GET"])
+def get_flight_rating_summary(flight_id: int):
+    """Prosek i raspodela ocena leta iz flight_rating_stats - jedno citanje po kljucu"""
+    etag = CollectionVersions.etag("ratings", "flight", flight_id)
+    if request.if_none_match.contains_weak(etag):
+        return CollectionVersions.not_modified(etag)
+
+    try:
+        response = jsonify(RatingService.get_flight_summary(flight_id))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    response.set_etag(etag)
+    return response
+
+@rating_bp.route("/ratings/airlines/<int:airline_id>/summary", methods=["GET"])
+def get_airline_rating_summary(airline_id: int):
+    etag = CollectionVersions.etag("ratings", "airline", airline_id)
+    if request.if_none_match.contains_weak(etag):
+        return CollectionVersions.not_modified(etag)
+
+    try:
+        response = jsonify(RatingService.get_airline_summary(airline_id))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    response.set_etag(etag)
+    return response
+
+@rating_bp.route("/ratings/leaderboard/<scope>", methods=["GET"])
+def get_rating_leaderboard(scope: str):
+    """Top-K: /ratings/leaderboard/airlines ili /routes, ?limit=10&min_count=1"""
+    leaderboards = {
+        "airlines": RatingService.get_airline_leaderboard,
+        "routes": RatingService.get_route_leaderboard,
+    }
+    if scope not in leaderboards:
+        return jsonify({"error": f"Unknown leaderboard: {scope}"}), 404
+
+    # Rang lista aviokompanija nosi i naziv, pa ETag zavisi i od verzije aviokompanija
+    etag = CollectionVersions.etag(
+        "ratings", "leaderboard", scope, request.query_string, CollectionVersions.get("airlines")
+    )
+    if request.if_none_match.contains_weak(etag):
+        return CollectionVersions.not_modified(etag)
+
+    try:
+        items = leaderboards[scope](
+            request.args.get("limit", type=int),
+            request.args.get("min_count", 1, type=int)
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = jsonify(items)
+    response.set_etag(etag)
+    return response
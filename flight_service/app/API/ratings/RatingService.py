@@ -1,25 +1,310 @@
+from sqlalchemy import bindparam, case, func, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+
 from app.Extensions.db import db
 from app.Domain.models.Rating import Rating
 from app.Domain.models.Flight import Flight
+from app.Domain.models.Airline import Airline
+from app.Domain.models.RatingStats import FlightRatingStats, AirlineRatingStats, RouteRatingStats
+from app.Domain.enums.FlightStatus import FlightStatus
 from datetime import datetime
 
 class RatingService:
+    DEFAULT_LEADERBOARD_SIZE = 10
+    MAX_LEADERBOARD_SIZE = 100
+    MAX_BULK_RATINGS = 1000
+    STARS = (1, 2, 3, 4, 5)
+
+    # Samo kolone potrebne za proveru statusa i kljuceve agregata
+    _FLIGHT_COLUMNS = (Flight.id, Flight.status, Flight.airline_id, Flight.departure_airport, Flight.arrival_airport)
+
     @staticmethod
     def add_rating(user_id: int, flight_id: int, rating_value: int):
-        flight = Flight.query.get(flight_id)
+        flight = db.session.query(*RatingService._FLIGHT_COLUMNS).filter(Flight.id == flight_id).first()
         if not flight:
             raise ValueError("Let ne postoji.")
-        if flight.status.name != "COMPLETED":
+        if flight.status != FlightStatus.COMPLETED:
             raise ValueError("Let jos nije zavrsen.")
-        
+
         if rating_value < 1 or rating_value > 5:
             raise ValueError("Ocena mora biti u opsegu od 1 do 5.")
-        
-        existing_rating = Rating.query.filter_by(user_id=user_id, flight_id=flight_id).first()
-        if existing_rating:
-            raise ValueError("Korisnik je vec ocenio ovaj let.")
-        
+
+        # Duplikat odbija uq_ratings_user_flight u istom INSERT-u - bez prethodnog SELECT-a i bez trke
         new_rating = Rating(user_id=user_id, flight_id=flight_id, rating=rating_value)
         db.session.add(new_rating)
+        try:
+            db.session.flush()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError("Korisnik je vec ocenio ovaj let.")
+
+        # Agregati se menjaju u istoj transakciji kao i sama ocena
+        for model, key in RatingService._stats_keys(flight):
+            RatingService._increment(model, key, {rating_value: 1})
+
         db.session.commit()
-        return new_rating
\ No newline at end of file
+        return new_rating
+
+    @staticmethod
+    def add_ratings(items: list) -> dict:
+        """
+        Unos vise ocena odjednom (npr. ocene prikupljene van mreze). Letovi cele
+        grupe proveravaju se jednim upitom, postojece ocene drugim, a nove se
+        upisuju jednim executemany INSERT-om. Neispravne stavke se preskacu:
+        {"inserted": n, "rejected": [{"index": i, "error": "..."}]}.
+        """
+        if not isinstance(items, list):
+            raise ValueError("ratings must be a list")
+        if len(items) > RatingService.MAX_BULK_RATINGS:
+            raise ValueError(f"At most {RatingService.MAX_BULK_RATINGS} ratings per request")
+
+        rejected = []
+        candidates = []
+        for index, item in enumerate(items):
+            try:
+                user_id, flight_id, rating_value = int(item["user_id"]), int(item["flight_id"]), item["rating"]
+            except (TypeError, KeyError, ValueError):
+                rejected.append({"index": index, "error": "user_id, flight_id i rating su obavezni."})
+                continue
+            if not isinstance(rating_value, int) or isinstance(rating_value, bool) or not 1 <= rating_value <= 5:
+                rejected.append({"index": index, "error": "Ocena mora biti u opsegu od 1 do 5."})
+                continue
+            candidates.append((index, user_id, flight_id, rating_value))
+
+        flights = {}
+        existing = set()
+        if candidates:
+            flights = {
+                row.id: row for row in db.session.query(*RatingService._FLIGHT_COLUMNS)
+                .filter(Flight.id.in_({flight_id for _, _, flight_id, _ in candidates}))
+            }
+            pairs = {(user_id, flight_id) for _, user_id, flight_id, _ in candidates if flight_id in flights}
+            if pairs:
+                existing = set(
+                    db.session.query(Rating.user_id, Rating.flight_id)
+                    .filter(tuple_(Rating.user_id, Rating.flight_id).in_(pairs))
+                    .all()
+                )
+
+        rows = []
+        deltas = {}  # (model, kljuc) -> {ocena: broj}
+        for index, user_id, flight_id, rating_value in candidates:
+            flight = flights.get(flight_id)
+            if flight is None:
+                rejected.append({"index": index, "error": "Let ne postoji."})
+            elif flight.status != FlightStatus.COMPLETED:
+                rejected.append({"index": index, "error": "Let jos nije zavrsen."})
+            elif (user_id, flight_id) in existing:
+                rejected.append({"index": index, "error": "Korisnik je vec ocenio ovaj let."})
+            else:
+                existing.add((user_id, flight_id))
+                rows.append({"user_id": user_id, "flight_id": flight_id, "rating": rating_value})
+                for model, key in RatingService._stats_keys(flight):
+                    counts = deltas.setdefault((model, tuple(key.items())), {})
+                    counts[rating_value] = counts.get(rating_value, 0) + 1
+
+        if rows:
+            try:
+                db.session.execute(insert(Rating), rows)
+                RatingService._increment_many(deltas)
+                db.session.commit()
+            except IntegrityError:
+                # Paralelan unos istih ocena izmedju provere i INSERT-a - cela grupa se ponavlja
+                db.session.rollback()
+                raise ValueError("Neke ocene su upravo unete, ponovite zahtev.")
+
+        rejected.sort(key=lambda entry: entry["index"])
+        return {"inserted": len(rows), "rejected": rejected}
+
+    @staticmethod
+    def _stats_keys(flight) -> tuple:
+        """Agregati na koje utice ocena leta: (model, kljuc reda)"""
+        return (
+            (FlightRatingStats, {"flight_id": flight.id}),
+            (AirlineRatingStats, {"airline_id": flight.airline_id}),
+            (RouteRatingStats, {
+                "departure_airport": flight.departure_airport,
+                "arrival_airport": flight.arrival_airport
+            }),
+        )
+
+    @staticmethod
+    def _increment_statement(model, key_names: tuple):
+        """
+        Atomski UPDATE count/total/stars_N += delta nad redom agregata. Vrednosti
+        su bind parametri, pa isti izraz sluzi i za jedan red i za executemany.
+        """
+        table = model.__table__
+        values = [
+            # average prvi: MySQL racuna SET s leva na desno nad vec izmenjenim vrednostima
+            (table.c["average"], db.cast(table.c["total"] + bindparam("d_total"), db.Float)
+             / (table.c["count"] + bindparam("d_count"))),
+            (table.c["count"], table.c["count"] + bindparam("d_count")),
+            (table.c["total"], table.c["total"] + bindparam("d_total")),
+        ]
+        values += [
+            (table.c[f"stars_{star}"], table.c[f"stars_{star}"] + bindparam(f"d_{star}"))
+            for star in RatingService.STARS
+        ]
+        return (
+            update(table)
+            .where(*(table.c[name] == bindparam(f"k_{name}") for name in key_names))
+            .ordered_values(*values)
+        )
+
+    @staticmethod
+    def _delta_row(key: dict, counts: dict) -> dict:
+        """Kljuc + {ocena: broj} -> kolone novog reda agregata"""
+        count = sum(counts.values())
+        total = sum(star * n for star, n in counts.items())
+        row = dict(key, count=count, total=total, average=total / count)
+        row.update({f"stars_{star}": counts.get(star, 0) for star in RatingService.STARS})
+        return row
+
+    @staticmethod
+    def _params(row: dict, key_names: tuple) -> dict:
+        params = {f"k_{name}": row[name] for name in key_names}
+        params.update(d_count=row["count"], d_total=row["total"])
+        params.update({f"d_{star}": row[f"stars_{star}"] for star in RatingService.STARS})
+        return params
+
+    @staticmethod
+    def _increment(model, key: dict, counts: dict):
+        """UPDATE reda agregata; ako red jos ne postoji, INSERT u savepoint-u (pa UPDATE ako ga je paralelna transakcija upravo napravila)"""
+        key_names = tuple(key)
+        row = RatingService._delta_row(key, counts)
+        statement = RatingService._increment_statement(model, key_names)
+        if db.session.execute(statement, RatingService._params(row, key_names)).rowcount:
+            return
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(model.__table__), row)
+        except IntegrityError:
+            db.session.execute(statement, RatingService._params(row, key_names))
+
+    @staticmethod
+    def _increment_many(deltas: dict):
+        """Za svaki model: jedan SELECT postojecih kljuceva, executemany UPDATE za njih i executemany INSERT za nove"""
+        by_model = {}
+        for (model, key), counts in deltas.items():
+            by_model.setdefault(model, []).append(RatingService._delta_row(dict(key), counts))
+
+        for model, rows in by_model.items():
+            key_names = tuple(column.key for column in model.__table__.primary_key)
+            keys = [tuple(row[name] for name in key_names) for row in rows]
+            key_columns = [model.__table__.c[name] for name in key_names]
+            present = set(
+                db.session.execute(select(*key_columns).where(tuple_(*key_columns).in_(keys))).all()
+            )
+
+            updates = [RatingService._params(row, key_names) for row, key in zip(rows, keys) if key in present]
+            inserts = [row for row, key in zip(rows, keys) if key not in present]
+            if updates:
+                db.session.execute(RatingService._increment_statement(model, key_names), updates)
+            if inserts:
+                db.session.execute(insert(model.__table__), inserts)
+
+    @staticmethod
+    def rebuild_stats():
+        """Ponovo racuna sve agregate iz tabele ratings (prvo pokretanje ili popravka)"""
+        stars = [func.sum(case((Rating.rating == star, 1), else_=0)) for star in RatingService.STARS]
+        groups = (
+            (FlightRatingStats, (Flight.id,), ("flight_id",)),
+            (AirlineRatingStats, (Flight.airline_id,), ("airline_id",)),
+            (RouteRatingStats, (Flight.departure_airport, Flight.arrival_airport),
+             ("departure_airport", "arrival_airport")),
+        )
+
+        for model, columns, names in groups:
+            db.session.query(model).delete(synchronize_session=False)
+            rows = (
+                db.session.query(*columns, func.count(Rating.id), func.sum(Rating.rating), *stars)
+                .join(Flight, Rating.flight_id == Flight.id)
+                .group_by(*columns)
+                .all()
+            )
+            values = []
+            for row in rows:
+                count, total = row[len(names)], int(row[len(names) + 1])
+                data = dict(zip(names, row[:len(names)]))
+                data.update(count=count, total=total, average=total / count)
+                data.update({f"stars_{star}": int(n) for star, n in zip(RatingService.STARS, row[len(names) + 2:])})
+                values.append(data)
+            if values:
+                db.session.execute(insert(model), values)
+        db.session.commit()
+
+    @staticmethod
+    def ensure_stats():
+        """Na startu: ako postoje ocene a agregati su prazni, popuni ih jednom"""
+        if db.session.query(FlightRatingStats.flight_id).first() is None \
+                and db.session.query(Rating.id).first() is not None:
+            RatingService.rebuild_stats()
+
+    @staticmethod
+    def _summary(stats) -> dict:
+        """Red agregata -> {"count", "average", "distribution": {"1".."5": broj}}"""
+        if stats is None:
+            return {"count": 0, "average": None, "distribution": {str(star): 0 for star in RatingService.STARS}}
+        return {
+            "count": stats.count,
+            "average": round(stats.average, 2) if stats.count else None,
+            "distribution": {str(star): getattr(stats, f"stars_{star}") for star in RatingService.STARS}
+        }
+
+    @staticmethod
+    def get_flight_summary(flight_id: int) -> dict:
+        stats = db.session.get(FlightRatingStats, flight_id)
+        if stats is None and db.session.get(Flight, flight_id) is None:
+            raise ValueError("Flight not found")
+        return {"flight_id": flight_id, **RatingService._summary(stats)}
+
+    @staticmethod
+    def get_airline_summary(airline_id: int) -> dict:
+        stats = db.session.get(AirlineRatingStats, airline_id)
+        if stats is None and db.session.get(Airline, airline_id) is None:
+            raise ValueError("Airline not found")
+        return {"airline_id": airline_id, **RatingService._summary(stats)}
+
+    @staticmethod
+    def _leaderboard_limit(limit: int = None) -> int:
+        limit = limit or RatingService.DEFAULT_LEADERBOARD_SIZE
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        return min(limit, RatingService.MAX_LEADERBOARD_SIZE)
+
+    @staticmethod
+    def get_airline_leaderboard(limit: int = None, min_count: int = 1) -> list:
+        """Top-K aviokompanija po proseku (pa po broju ocena) - citanje K redova indeksa"""
+        rows = (
+            db.session.query(AirlineRatingStats, Airline.name)
+            .outerjoin(Airline, AirlineRatingStats.airline_id == Airline.id)
+            .filter(AirlineRatingStats.count >= max(min_count or 1, 1))
+            .order_by(AirlineRatingStats.average.desc(), AirlineRatingStats.count.desc())
+            .limit(RatingService._leaderboard_limit(limit))
+            .all()
+        )
+        return [
+            {"airline_id": stats.airline_id, "airline_name": name, **RatingService._summary(stats)}
+            for stats, name in rows
+        ]
+
+    @staticmethod
+    def get_route_leaderboard(limit: int = None, min_count: int = 1) -> list:
+        """Top-K relacija (polazni -> dolazni aerodrom) po proseku ocena"""
+        rows = (
+            db.session.query(RouteRatingStats)
+            .filter(RouteRatingStats.count >= max(min_count or 1, 1))
+            .order_by(RouteRatingStats.average.desc(), RouteRatingStats.count.desc())
+            .limit(RatingService._leaderboard_limit(limit))
+            .all()
+        )
+        return [
+            {
+                "departure_airport": stats.departure_airport,
+                "arrival_airport": stats.arrival_airport,
+                **RatingService._summary(stats)
+            }
+            for stats in rows
+        ]
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app
 from flask_mail import Message
 from app.Extensions.mail import mail
+from app.Services.EmailSender import EmailSender
 
 test_mail_bp = Blueprint("test_mail", __name__, url_prefix="/api/v1")
 
@@ -25,4 +26,9 @@ def test_mail():
         mail.send(msg)
         return jsonify({"ok": True, "sent_to": to})
     except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
+@test_mail_bp.get("/mail/metrics")
+def mail_metrics():
+    return jsonify(EmailSender.metrics())
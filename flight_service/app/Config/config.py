@@ -29,8 +29,33 @@ class Config:
     MAIL_ENABLED = os.getenv("MAIL_ENABLED", "true").lower() == "true"
     MAIL_TEST_TO = os.getenv("MAIL_TEST_TO")
     MAIL_FROM_NAME = os.getenv("MAIL_FROM_NAME", "DRS Flight Service")
+    # Outbox - mejlove salje EmailSender u pozadini preko jedne SMTP konekcije
+    MAIL_OUTBOX_BATCH_SIZE = int(os.getenv("MAIL_OUTBOX_BATCH_SIZE", "50"))
+    MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("MAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+    MAIL_SMTP_IDLE_SECONDS = float(os.getenv("MAIL_SMTP_IDLE_SECONDS", "30"))
+    MAIL_SMTP_TIMEOUT = float(os.getenv("MAIL_SMTP_TIMEOUT", "10"))
+    # Digest - obavestenja o statusu letova i ulogama skupljena po primaocu u jedan mejl
+    MAIL_DIGEST_ENABLED = os.getenv("MAIL_DIGEST_ENABLED", "false").lower() == "true"
+    MAIL_DIGEST_WINDOW_SECONDS = int(os.getenv("MAIL_DIGEST_WINDOW_SECONDS", "300"))
 
     # SocketIO
     SOCKETIO_CORS_ALLOWED_ORIGINS = os.getenv("SOCKETIO_CORS_ALLOWED_ORIGINS", "*")
 
-    SERVER_URL = os.getenv("SERVER_URL", "http://server:5000")
\ No newline at end of file
+    SERVER_URL = os.getenv("SERVER_URL", "http://server:5000")
+
+    # FlightStatusWatcher - periodicno ponovno ucitavanje aktivnih letova (0 = iskljuceno)
+    FLIGHT_STATUS_RESYNC_SECONDS = int(os.getenv("FLIGHT_STATUS_RESYNC_SECONDS", "600"))
+    # Lease za izbor lidera - samo jedan proces (worker/replika) izvrsava prelaze statusa
+    FLIGHT_STATUS_LEASE_SECONDS = int(os.getenv("FLIGHT_STATUS_LEASE_SECONDS", "15"))
+
+    # Red kupovina (purchase_jobs) i fiksni pool worker-a
+    PURCHASE_WORKERS = int(os.getenv("PURCHASE_WORKERS", "4"))
+    PURCHASE_BATCH_SIZE = int(os.getenv("PURCHASE_BATCH_SIZE", "50"))
+    PURCHASE_PROCESSING_SECONDS = float(os.getenv("PURCHASE_PROCESSING_SECONDS", "5"))
+    PURCHASE_MAX_ATTEMPTS = int(os.getenv("PURCHASE_MAX_ATTEMPTS", "5"))
+    PURCHASE_RESERVATION_TIMEOUT_SECONDS = int(os.getenv("PURCHASE_RESERVATION_TIMEOUT_SECONDS", "300"))
+
+    # Kompresija odgovora (gzip, brotli ako je instaliran) iznad praga u bajtovima
+    COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
\ No newline at end of file
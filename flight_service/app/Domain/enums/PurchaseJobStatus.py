@@ -0,0 +1,8 @@
+import enum
+
+class PurchaseJobStatus(enum.Enum):
+    AWAITING_PAYMENT = "AWAITING_PAYMENT"   #Rezervacija ceka potvrdu zaduzenja sa servera
+    QUEUED = "QUEUED"           #Ceka da ga preuzme worker
+    PROCESSING = "PROCESSING"   #Worker ga obradjuje
+    DONE = "DONE"               #Obrada zavrsena
+    FAILED = "FAILED"           #Iscrpljeni pokusaji
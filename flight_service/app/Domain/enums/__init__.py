@@ -1,2 +1,4 @@
 from .FlightStatus import FlightStatus
-from .PurchaseStatus import PurchaseStatus
\ No newline at end of file
+from .PurchaseStatus import PurchaseStatus
+from .PurchaseJobStatus import PurchaseJobStatus
+from .EmailStatus import EmailStatus
\ No newline at end of file
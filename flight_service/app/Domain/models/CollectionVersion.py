@@ -0,0 +1,7 @@
+from app.Extensions.db import db
+
+class CollectionVersion(db.Model):
+    __tablename__ = 'collection_versions'
+
+    name = db.Column(db.String(50), primary_key=True)                   # npr. "flights", "purchases"
+    version = db.Column(db.BigInteger, nullable=False, default=0)       # raste na svaki commit koji menja kolekciju
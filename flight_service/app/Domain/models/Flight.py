@@ -11,6 +11,7 @@ class Flight(db.Model):
     distance_km = db.Column(db.Float, nullable=False)
     duration_minutes = db.Column(db.Integer, nullable=False)
     departure_time = db.Column(db.DateTime, nullable=False)
+    landing_time = db.Column(db.DateTime, nullable=False)  # departure_time + duration_minutes
     departure_airport = db.Column(db.String(100), nullable=False)
     arrival_airport = db.Column(db.String(100), nullable=False)
     created_by_user_id = db.Column(db.Integer, nullable=False)  # Manager ID
@@ -25,4 +26,15 @@ class Flight(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship
-    airline = db.relationship('Airline', back_populates='flights')
\ No newline at end of file
+    airline = db.relationship('Airline', back_populates='flights')
+
+    # Indeksi za filtriranje i keyset paginaciju (departure_time, id)
+    __table_args__ = (
+        db.Index('ix_flights_departure_time_id', 'departure_time', 'id'),
+        db.Index('ix_flights_status_departure_time', 'status', 'departure_time', 'id'),
+        db.Index('ix_flights_status_landing_time', 'status', 'landing_time'),
+        db.Index('ix_flights_airline_departure_time', 'airline_id', 'departure_time', 'id'),
+        db.Index('ix_flights_departure_airport_time', 'departure_airport', 'departure_time', 'id'),
+        db.Index('ix_flights_arrival_airport_time', 'arrival_airport', 'departure_time', 'id'),
+        db.Index('ix_flights_updated_at', 'updated_at'),  # inkrementalno osvezavanje FlightCatalog-a
+    )
\ No newline at end of file
@@ -11,5 +11,11 @@ class Purchase(db.Model):
     purchase_time = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.Enum(PurchaseStatus), nullable=False, default='IN_PROGRESS')
     ticket_price = db.Column(db.Float, nullable=False)
+    idempotency_key = db.Column(db.String(64), unique=True, nullable=True)  # kljuc klijenta - ponovljen zahtev vraca istu kupovinu
 
-    flight = db.relationship('Flight', backref='purchases', lazy=True)
\ No newline at end of file
+    flight = db.relationship('Flight', backref='purchases', lazy=True)
+
+    # Istorija kupovina korisnika - keyset paginacija po (purchase_time, id)
+    __table_args__ = (
+        db.Index('ix_purchases_user_purchase_time', 'user_id', 'purchase_time', 'id'),
+    )
\ No newline at end of file
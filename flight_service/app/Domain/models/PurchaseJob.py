@@ -0,0 +1,20 @@
+from app.Extensions.db import db
+from datetime import datetime
+from app.Domain.enums.PurchaseJobStatus import PurchaseJobStatus
+
+class PurchaseJob(db.Model):
+    __tablename__ = 'purchase_jobs'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    purchase_id = db.Column(db.Integer, db.ForeignKey('purchases.id'), unique=True, nullable=False)
+    user_email = db.Column(db.String(120), nullable=True)
+    status = db.Column(db.Enum(PurchaseJobStatus), nullable=False, default=PurchaseJobStatus.QUEUED)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # backoff - ne preuzimati pre ovoga
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_purchase_jobs_status_available', 'status', 'available_at'),
+    )
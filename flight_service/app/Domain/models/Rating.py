@@ -10,4 +10,9 @@ class Rating(db.Model):
     rating = db.Column(db.Integer, nullable=False) #Ocena 1-5
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    flight = db.relationship('Flight', backref='ratings', lazy=True)
\ No newline at end of file
+    flight = db.relationship('Flight', backref='ratings', lazy=True)
+
+    # Jedna ocena po korisniku i letu - duplikat odbija sama baza, bez prethodne provere
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'flight_id', name='uq_ratings_user_flight'),
+    )
\ No newline at end of file
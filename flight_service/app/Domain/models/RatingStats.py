@@ -0,0 +1,37 @@
+from app.Extensions.db import db
+
+class _RatingStatsColumns:
+    """Zajednicke kolone agregata ocena: broj, zbir, prosek i histogram 1-5"""
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    average = db.Column(db.Float, nullable=False, default=0)  # total / count, odrzava se uz count i total (za rang listu)
+    stars_1 = db.Column(db.Integer, nullable=False, default=0)
+    stars_2 = db.Column(db.Integer, nullable=False, default=0)
+    stars_3 = db.Column(db.Integer, nullable=False, default=0)
+    stars_4 = db.Column(db.Integer, nullable=False, default=0)
+    stars_5 = db.Column(db.Integer, nullable=False, default=0)
+
+class FlightRatingStats(_RatingStatsColumns, db.Model):
+    __tablename__ = 'flight_rating_stats'
+
+    flight_id = db.Column(db.Integer, primary_key=True)
+
+class AirlineRatingStats(_RatingStatsColumns, db.Model):
+    __tablename__ = 'airline_rating_stats'
+
+    airline_id = db.Column(db.Integer, primary_key=True)
+
+    # Rang lista: (average, count) opadajuce - top-K cita prvih K redova indeksa
+    __table_args__ = (
+        db.Index('ix_airline_rating_stats_average', 'average', 'count'),
+    )
+
+class RouteRatingStats(_RatingStatsColumns, db.Model):
+    __tablename__ = 'route_rating_stats'
+
+    departure_airport = db.Column(db.String(100), primary_key=True)
+    arrival_airport = db.Column(db.String(100), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_route_rating_stats_average', 'average', 'count'),
+    )
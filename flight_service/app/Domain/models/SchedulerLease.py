@@ -0,0 +1,8 @@
+from app.Extensions.db import db
+
+class SchedulerLease(db.Model):
+    __tablename__ = 'scheduler_leases'
+
+    name = db.Column(db.String(50), primary_key=True)       # npr. "flight_status_watcher"
+    holder = db.Column(db.String(120), nullable=False)       # host:pid:token procesa koji drzi lease
+    expires_at = db.Column(db.DateTime, nullable=False)      # UTC; posle ovoga lease moze preuzeti drugi proces
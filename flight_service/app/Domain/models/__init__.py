@@ -1,4 +1,9 @@
 from .Flight import Flight
 from .Airline import Airline
 from .Purchase import Purchase
-from .Rating import Rating
\ No newline at end of file
+from .PurchaseJob import PurchaseJob
+from .Rating import Rating
+from .SchedulerLease import SchedulerLease
+from .CollectionVersion import CollectionVersion
+from .EmailOutbox import EmailOutbox
+from .RatingStats import FlightRatingStats, AirlineRatingStats, RouteRatingStats
\ No newline at end of file
@@ -3,5 +3,7 @@ from .socketio import socketio
 from .jwt import jwt
 from .cors import cors
 from .mail import mail
+from .compression import compress
+from .json_provider import FastJSONProvider
 
-__all__ = ['db', 'socketio', 'jwt', 'cors', 'mail']
+__all__ = ['db', 'socketio', 'jwt', 'cors', 'mail', 'compress', 'FastJSONProvider']
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .fields import parse_fields
+
+__all__ = ["parse_fields"]
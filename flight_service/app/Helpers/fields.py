@@ -0,0 +1,17 @@
+from typing import Optional, Sequence, Union
+
+def parse_fields(raw: Union[str, list, None], allowed: Sequence[str]) -> Optional[list]:
+    """
+    ?fields=id,name,status (ili lista iz JSON tela) -> lista trazenih polja, redosledom iz allowed.
+    None ako parametar nije zadat (ceo oblik odgovora); nepoznato polje je ValueError.
+    """
+    if isinstance(raw, (list, tuple)):
+        raw = ",".join(str(name) for name in raw)
+    if raw is None or not raw.strip():
+        return None
+
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [name for name in allowed if name in requested]
@@ -0,0 +1,103 @@
+import hashlib
+
+from flask import Response
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.Extensions.db import db
+from app.Domain.models.CollectionVersion import CollectionVersion
+
+class CollectionVersions:
+    """
+    Brojac verzije po kolekciji (letovi, aviokompanije, ocene, kupovine).
+
+    Session event-i belezi koje tabele je transakcija menjala - i kroz ORM
+    objekte i kroz skupovne UPDATE/INSERT/DELETE - pa se pri commit-u, u istoj
+    transakciji, povecaju verzije pogodjenih kolekcija. Read endpoint-i od
+    verzije i parametara prave jak ETag i na If-None-Match odgovaraju sa 304
+    posle jednog citanja po primarnom kljucu, bez upita nad samom tabelom.
+    """
+    # tabela -> kolekcije ciji se odgovori menjaju (letovi nose airline_name)
+    TABLE_COLLECTIONS = {
+        "flights": ("flights",),
+        "airlines": ("airlines", "flights"),
+        "ratings": ("ratings",),
+        "purchases": ("purchases",),
+    }
+    COLLECTIONS = ("flights", "airlines", "ratings", "purchases")
+    _TOUCHED = "touched_collections"
+
+    _registered = False
+
+    @classmethod
+    def init_app(cls, app):
+        if not cls._registered:
+            event.listen(Session, "before_flush", cls._before_flush)
+            event.listen(Session, "do_orm_execute", cls._on_execute)
+            event.listen(Session, "before_commit", cls._before_commit)
+            event.listen(Session, "after_rollback", cls._after_rollback)
+            cls._registered = True
+
+        with app.app_context():
+            existing = {name for (name,) in db.session.query(CollectionVersion.name)}
+            for name in cls.COLLECTIONS:
+                if name not in existing:
+                    db.session.add(CollectionVersion(name=name, version=0))
+            db.session.commit()
+
+    @staticmethod
+    def get(name: str) -> int:
+        return db.session.query(CollectionVersion.version).filter_by(name=name).scalar() or 0
+
+    @staticmethod
+    def etag(name: str, *parts, version: int = None) -> str:
+        """Verzija kolekcije (procitana ako nije data) + otisak parametara zahteva (filteri, user_id...)"""
+        if version is None:
+            version = CollectionVersions.get(name)
+        digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:12]
+        return f"{name}-{version}-{digest}"
+
+    @staticmethod
+    def not_modified(etag: str) -> Response:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    @classmethod
+    def _touch(cls, session, table_name: str):
+        collections = cls.TABLE_COLLECTIONS.get(table_name)
+        if collections:
+            session.info.setdefault(cls._TOUCHED, set()).update(collections)
+
+    @classmethod
+    def _before_flush(cls, session, flush_context, instances):
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(obj, "__table__", None)
+            if table is not None:
+                cls._touch(session, table.name)
+
+    @classmethod
+    def _on_execute(cls, orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, "table", None)
+            if table is not None:
+                cls._touch(orm_execute_state.session, table.name)
+
+    @classmethod
+    def _before_commit(cls, session):
+        # Flush ovde da bi izmene iz sesije bile zabelezene pre povecanja verzija
+        if session.new or session.dirty or session.deleted:
+            session.flush()
+
+        touched = session.info.pop(cls._TOUCHED, None)
+        if touched:
+            session.execute(
+                update(CollectionVersion)
+                .where(CollectionVersion.name.in_(sorted(touched)))
+                .values(version=CollectionVersion.version + 1),
+                execution_options={"synchronize_session": False}
+            )
+
+    @classmethod
+    def _after_rollback(cls, session):
+        session.info.pop(cls._TOUCHED, None)
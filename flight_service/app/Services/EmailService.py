@@ -1,17 +1,37 @@
+from datetime import datetime, timedelta
 from flask import current_app
-from flask_mail import Message
-from app.Extensions.mail import mail
+from app.Extensions.db import db
+from app.Domain.enums.EmailStatus import EmailStatus
+from app.Domain.models.EmailOutbox import EmailOutbox
+from app.Services.EmailSender import EmailSender
 
 class EmailService:
+    """
+    Mejlovi se ne salju u zahtevu: upisuju se u email_outbox (posebnim commit-om,
+    posle izmene zbog koje se salju), a salje ih EmailSender u pozadini.
+    Sa digest=True i ukljucenim MAIL_DIGEST_ENABLED obavestenje ceka
+    MAIL_DIGEST_WINDOW_SECONDS i salje se u pregledu sa ostalima za istog primaoca.
+    """
+
     @staticmethod
-    def send(subject: str, body: str, to: str = None):
+    def _enabled() -> bool:
         enabled = current_app.config.get("MAIL_ENABLED", True)
 
         # podrži i bool i "true"/"false"
         if isinstance(enabled, str):
             enabled = enabled.strip().lower() == "true"
+        return enabled
+
+    @staticmethod
+    def _digest_enabled() -> bool:
+        enabled = current_app.config.get("MAIL_DIGEST_ENABLED", False)
+        if isinstance(enabled, str):
+            enabled = enabled.strip().lower() == "true"
+        return enabled
 
-        if not enabled:
+    @staticmethod
+    def send(subject: str, body: str, to: str = None, digest: bool = False):
+        if not EmailService._enabled():
             return False
 
         default_to = current_app.config.get("MAIL_TEST_TO")
@@ -19,6 +39,31 @@ class EmailService:
         if not recipient:
             raise ValueError("Missing recipient (pass 'to' or set MAIL_TEST_TO)")
 
-        msg = Message(subject=subject, recipients=[recipient], body=body)
-        mail.send(msg)
-        return True
\ No newline at end of file
+        EmailService.send_many([(recipient, subject, body)], digest)
+        return True
+
+    @staticmethod
+    def send_many(messages, digest: bool = False):
+        """Upisuje (to, subject, body) poruke u outbox jednim commit-om"""
+        if not messages or not EmailService._enabled():
+            return
+
+        digest = digest and EmailService._digest_enabled()
+        available_at = datetime.utcnow()
+        if digest:
+            available_at += timedelta(seconds=current_app.config.get("MAIL_DIGEST_WINDOW_SECONDS", 300))
+
+        db.session.add_all([
+            EmailOutbox(
+                recipient=to,
+                subject=subject,
+                body=body,
+                status=EmailStatus.QUEUED,
+                attempts=0,
+                digest=digest,
+                available_at=available_at
+            )
+            for to, subject, body in messages
+        ])
+        db.session.commit()
+        EmailSender.notify()
@@ -0,0 +1,285 @@
+import bisect
+import gzip
+import threading
+import time
+from datetime import timedelta
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import func
+
+from app.Extensions.db import db
+from app.Domain.models.Flight import Flight
+from app.API.flights.FlightService import FlightService
+
+class _Entry(NamedTuple):
+    sort_key: tuple         # (departure_time, id) - isti redosled kao _filtered_query
+    updated_at: object
+    status: object
+    airline_id: int
+    departure_airport: str
+    arrival_airport: str
+    body: bytes             # serijalizovan FlightDTO oblik leta
+
+class _CursorRow(NamedTuple):
+    departure_time: object
+    id: int
+
+class _Snapshot(NamedTuple):
+    version: int
+    entries: dict           # id -> _Entry
+    order: list             # _Entry sortirani po sort_key
+    keys: list              # sort_key-evi iz order (za bisect kod cursor-a i umetanje)
+    watermark: object       # najveci updated_at u katalogu
+    bodies: dict            # "plain"/"gzip" -> cela lista, gradi se pri prvom citanju
+
+class FlightCatalog:
+    """
+    Materijalizovan, unapred serijalizovan katalog letova.
+
+    Drzi JSON bajtove svakog leta i gotovu (i gzip-ovanu) celu listu, pa su
+    javna citanja memorijski lookup-ovi bez ORM-a, pydantic-a i jsonify-a.
+    Katalog prati verziju kolekcije "flights" (CollectionVersions): kad se
+    promeni - upis kroz FlightService, prelaz statusa u watcher-u, u bilo
+    kom procesu - osvezava se inkrementalno: ucitavaju se samo redovi sa
+    updated_at >= watermark - UPDATED_AT_SLACK (indeks ix_flights_updated_at)
+    i umecu u sortiranu listu, a obrisani se traze samo kad COUNT(*) ne odgovara
+    katalogu. Cela lista (i gzip) se spaja tek pri prvom citanju, van _lock-a.
+
+    updated_at u MySQL-u ima rezoluciju sekunde, pa se redovi izmenjeni u
+    poslednjih UPDATED_AT_SLACK sekundi uvek ponovo ucitaju; povremeni pun
+    rebuild je dodatna zastita.
+    """
+    UPDATED_AT_SLACK_SECONDS = 5
+    FULL_REBUILD_SECONDS = 300
+    SPLICE_RATIO = 8            # umetanje samo dok je izmenjeno najvise 1/8 kataloga
+
+    _snapshot = None
+    _lock = threading.Lock()
+    _last_full_rebuild = 0
+
+    _metrics_lock = threading.Lock()
+    _hits = 0
+    _misses = 0
+    _rows_loaded = 0
+    _incremental_syncs = 0
+    _full_rebuilds = 0
+
+    @classmethod
+    def flight_body(cls, version: int, flight_id: int):
+        """JSON bajtovi leta ili None ako let ne postoji"""
+        entry = cls._current(version).entries.get(flight_id)
+        return entry.body if entry is not None else None
+
+    @classmethod
+    def flights_body(cls, version: int, ids) -> bytes:
+        """{"<id>": let, ...} za letove iz ids koji postoje - nepostojeci se izostavljaju"""
+        entries = cls._current(version).entries
+        return b"{" + b",".join(
+            b'"%d":' % flight_id + entries[flight_id].body for flight_id in ids if flight_id in entries
+        ) + b"}"
+
+    @classmethod
+    def list_body(cls, version: int, filters: dict = None, gzipped: bool = False) -> bytes:
+        snapshot = cls._current(version)
+        if not cls._has_filters(filters):
+            return cls._full_list(snapshot, gzipped)
+
+        entries = [entry for entry in snapshot.order if cls._matches(entry, filters)]
+        return cls._join(entries)
+
+    @classmethod
+    def page_body(cls, version: int, filters: dict = None, cursor: str = None, limit: int = None) -> bytes:
+        """Keyset strana {"items", "next_cursor"} - ista semantika kao FlightService.get_flights_page"""
+        limit = limit or FlightService.DEFAULT_PAGE_SIZE
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        limit = min(limit, FlightService.MAX_PAGE_SIZE)
+
+        snapshot = cls._current(version)
+        start = 0
+        if cursor:
+            start = bisect.bisect_right(snapshot.keys, FlightService._decode_cursor(cursor))
+
+        items = []
+        next_cursor = None
+        for entry in snapshot.order[start:]:
+            if not cls._matches(entry, filters):
+                continue
+            if len(items) == limit:
+                departure_time, flight_id = items[-1].sort_key
+                next_cursor = FlightService._encode_cursor(_CursorRow(departure_time, flight_id))
+                break
+            items.append(entry)
+
+        return (
+            b'{"items":' + cls._join(items)
+            + b',"next_cursor":' + current_app.json.dumps(next_cursor).encode("utf-8") + b"}"
+        )
+
+    @classmethod
+    def metrics(cls) -> dict:
+        snapshot = cls._snapshot
+        with cls._metrics_lock:
+            lookups = cls._hits + cls._misses
+            return {
+                "version": snapshot.version if snapshot else None,
+                "flights": len(snapshot.entries) if snapshot else 0,
+                "list_bytes": len(snapshot.bodies.get("plain", b"")) if snapshot else 0,
+                "list_gzip_bytes": len(snapshot.bodies.get("gzip", b"")) if snapshot else 0,
+                "hits": cls._hits,
+                "misses": cls._misses,
+                "hit_ratio": round(cls._hits / lookups, 3) if lookups else 0,
+                "rows_loaded": cls._rows_loaded,
+                "incremental_syncs": cls._incremental_syncs,
+                "full_rebuilds": cls._full_rebuilds,
+            }
+
+    @classmethod
+    def _current(cls, version: int) -> _Snapshot:
+        # Verzije samo rastu - snapshot noviji od procitane verzije je i dalje ispravan
+        snapshot = cls._snapshot
+        if snapshot is not None and snapshot.version >= version and not cls._full_rebuild_due():
+            with cls._metrics_lock:
+                cls._hits += 1
+            return snapshot
+
+        with cls._lock:
+            snapshot = cls._snapshot
+            if snapshot is None or snapshot.version < version or cls._full_rebuild_due():
+                cls._snapshot = snapshot = cls._sync(snapshot, version)
+        with cls._metrics_lock:
+            cls._misses += 1
+        return snapshot
+
+    @classmethod
+    def _full_rebuild_due(cls) -> bool:
+        return time.monotonic() - cls._last_full_rebuild >= cls.FULL_REBUILD_SECONDS
+
+    @classmethod
+    def _sync(cls, snapshot, version: int) -> _Snapshot:
+        full = snapshot is None or snapshot.watermark is None or cls._full_rebuild_due()
+        if full:
+            entries, order, keys, watermark = {}, [], [], None
+            rows = cls._load()
+        else:
+            entries, order, keys = dict(snapshot.entries), list(snapshot.order), list(snapshot.keys)
+            watermark = snapshot.watermark
+            rows = cls._load(Flight.updated_at >= watermark - timedelta(seconds=cls.UPDATED_AT_SLACK_SECONDS))
+
+        # Nekoliko izmena se umece u postojeci redosled; za veliki deo kataloga sort je jeftiniji
+        splice = not full and len(rows) * cls.SPLICE_RATIO <= len(entries)
+        for row in rows:
+            entry = cls._entry(row)
+            if splice:
+                # Izmenjen let se vadi sa starog mesta i umece po novom sort_key-u
+                cls._remove(entries, order, keys, row.id)
+                index = bisect.bisect_left(keys, entry.sort_key)
+                order.insert(index, entry)
+                keys.insert(index, entry.sort_key)
+            entries[row.id] = entry
+            if watermark is None or row.updated_at > watermark:
+                watermark = row.updated_at
+
+        # Obrisani letovi nemaju updated_at - pun spisak id-jeva samo kad se broj ne slaze
+        if not full and db.session.query(func.count(Flight.id)).scalar() != len(entries):
+            existing = {flight_id for (flight_id,) in db.session.query(Flight.id)}
+            for flight_id in set(entries) - existing:
+                if splice:
+                    cls._remove(entries, order, keys, flight_id)
+                else:
+                    del entries[flight_id]
+        db.session.rollback()
+
+        if not splice:
+            order = sorted(entries.values(), key=lambda entry: entry.sort_key)
+            keys = [entry.sort_key for entry in order]
+
+        with cls._metrics_lock:
+            cls._rows_loaded += len(rows)
+            if full:
+                cls._full_rebuilds += 1
+            else:
+                cls._incremental_syncs += 1
+        if full:
+            cls._last_full_rebuild = time.monotonic()
+
+        return _Snapshot(
+            version=version,
+            entries=entries,
+            order=order,
+            keys=keys,
+            watermark=watermark,
+            bodies={},
+        )
+
+    @staticmethod
+    def _load(*conditions) -> list:
+        return (
+            FlightService._filtered_query()
+            .add_columns(Flight.updated_at)
+            .filter(*conditions)
+            .all()
+        )
+
+    @staticmethod
+    def _remove(entries: dict, order: list, keys: list, flight_id: int):
+        entry = entries.pop(flight_id, None)
+        if entry is None:
+            return
+        index = bisect.bisect_left(keys, entry.sort_key)
+        del order[index]
+        del keys[index]
+
+    @classmethod
+    def _full_list(cls, snapshot: _Snapshot, gzipped: bool) -> bytes:
+        """Cela lista snapshot-a se spaja (i gzip-uje) jednom, pri prvom citanju - dupli rad u trci je bezopasan"""
+        bodies = snapshot.bodies
+        if "plain" not in bodies:
+            bodies["plain"] = cls._join(snapshot.order)
+        if not gzipped:
+            return bodies["plain"]
+        if "gzip" not in bodies:
+            bodies["gzip"] = gzip.compress(bodies["plain"], compresslevel=6)
+        return bodies["gzip"]
+
+    @staticmethod
+    def _entry(row) -> _Entry:
+        data = FlightService._row_to_dict(row)
+        data.pop("updated_at", None)
+        return _Entry(
+            sort_key=(row.departure_time, row.id),
+            updated_at=row.updated_at,
+            status=row.status,
+            airline_id=row.airline_id,
+            departure_airport=row.departure_airport,
+            arrival_airport=row.arrival_airport,
+            body=current_app.json.dumps(data, separators=(",", ":")).encode("utf-8"),
+        )
+
+    @staticmethod
+    def _has_filters(filters: dict) -> bool:
+        return bool(filters) and any(value is not None and value != "" for value in filters.values())
+
+    @staticmethod
+    def _matches(entry: _Entry, filters: dict) -> bool:
+        """Isti filteri kao FlightService._filtered_query, nad podacima iz kataloga"""
+        if not filters:
+            return True
+        if filters.get("status") is not None and entry.status != filters["status"]:
+            return False
+        if filters.get("airline_id") is not None and entry.airline_id != filters["airline_id"]:
+            return False
+        if filters.get("departure_airport") and entry.departure_airport != filters["departure_airport"]:
+            return False
+        if filters.get("arrival_airport") and entry.arrival_airport != filters["arrival_airport"]:
+            return False
+        if filters.get("departure_from") is not None and entry.sort_key[0] < filters["departure_from"]:
+            return False
+        if filters.get("departure_to") is not None and entry.sort_key[0] > filters["departure_to"]:
+            return False
+        return True
+
+    @staticmethod
+    def _join(entries) -> bytes:
+        return b"[" + b",".join(entry.body for entry in entries) + b"]"
@@ -24,4 +24,11 @@ def flight_status_changed_body(f: Flight, old_status, new_status, reason: Option
     )
     if reason:
         text += f"\nRazlog: {reason}\n"
+    return text
+
+def notification_digest_body(items) -> str:
+    """Vise obavestenja (subject, body) za istog primaoca u jednom mejlu"""
+    text = f"🔔 Pregled obavestenja ({len(items)})\n"
+    for subject, body in items:
+        text += f"\n{'-' * 40}\n{subject}\n\n{body}"
     return text
\ No newline at end of file
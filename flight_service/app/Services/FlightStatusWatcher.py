@@ -1,61 +1,263 @@
+import heapq
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from sqlalchemy import func, select, update
 
 from app.Extensions.db import db
 from app.Extensions.socketio import socketio
 from app.Domain.enums.FlightStatus import FlightStatus
 from app.Domain.models.Flight import Flight
+from app.Services.LeaderLease import LeaderLease
 
 class FlightStatusWatcher:
+    """
+    Rasporedjivac promena statusa letova.
+
+    Drzi min-heap (vreme, flight_id, novi_status) sa sledecim prelazom svakog
+    aktivnog leta (polazak -> IN_PROGRESS, sletanje -> COMPLETED) i spava do
+    najranijeg. FlightService javlja izmene preko schedule()/unschedule(),
+    pa nema periodicnog skeniranja svih letova.
+
+    Sami prelazi se izvrsavaju kao dva skupovna UPDATE-a nad indeksima
+    (status, landing_time) i (status, departure_time), bez ucitavanja ORM objekata.
+
+    Prelaze izvrsava samo proces koji drzi LeaderLease; ostali worker-i i
+    replike samo obnavljaju pokusaj preuzimanja na svaki heartbeat i ne drze
+    heap (schedule() je kod njih bez efekta). Izmene napravljene u drugim
+    procesima lider vidi preko _db_next_due, koji se osvezava na svaki
+    heartbeat sa dva MIN upita nad istim indeksima.
+    """
+    LEASE_NAME = "flight_status_watcher"
+
     _thread = None
     _running = False
+    _resync_seconds = None
+    _lease = None
+    _is_leader = False
+    _db_next_due = None
+
+    _heap = []      # (vreme, flight_id, status.name)
+    _pending = {}   # flight_id -> (vreme, status.name); unosi u heap-u koji se ne poklapaju su zastareli
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
 
     @classmethod
-    def start(cls, app, interval_seconds: int = 5):
+    def start(cls, app, resync_seconds: int = None, lease_seconds: int = 15):
         if cls._thread and cls._thread.is_alive():
             return
 
+        cls._resync_seconds = resync_seconds
+        cls._lease = LeaderLease(cls.LEASE_NAME, lease_seconds)
         cls._running = True
-        cls._thread = threading.Thread(target=cls._run, args=(app, interval_seconds,), daemon=True)
+        cls._thread = threading.Thread(target=cls._run, args=(app,), daemon=True)
         cls._thread.start()
 
     @classmethod
     def stop(cls):
         cls._running = False
+        cls._wakeup.set()
+
+    @classmethod
+    def schedule(cls, flight: Flight):
+        """(Re)planira sledeci prelaz leta nakon izmene; uklanja ga ako let vise nije aktivan"""
+        transition = cls._next_transition(flight.status, flight.departure_time, flight.landing_time)
+        if transition is None:
+            cls.unschedule(flight.id)
+            return
+
+        with cls._lock:
+            # Heap drzi samo lider; novi lider ga gradi iz baze (_resync)
+            if not cls._is_leader:
+                return
+            cls._push(flight.id, transition)
+        cls._wakeup.set()
+
+    @classmethod
+    def unschedule(cls, flight_id: int):
+        # Unos ostaje u heap-u, ali se preskace jer vise nije u _pending
+        with cls._lock:
+            cls._pending.pop(flight_id, None)
+
+    @staticmethod
+    def _next_transition(status, departure: datetime, landing: datetime):
+        if status == FlightStatus.APPROVED:
+            return departure, FlightStatus.IN_PROGRESS.name
+        if status == FlightStatus.IN_PROGRESS:
+            return landing, FlightStatus.COMPLETED.name
+        return None
+
+    @classmethod
+    def _push(cls, flight_id: int, transition):
+        cls._pending[flight_id] = transition
+        heapq.heappush(cls._heap, (transition[0], flight_id, transition[1]))
+
+        # Sabijanje heap-a kad se nakupi previse zastarelih unosa
+        if len(cls._heap) > 2 * len(cls._pending) + 64:
+            cls._heap = [(when, fid, status) for fid, (when, status) in cls._pending.items()]
+            heapq.heapify(cls._heap)
 
     @classmethod
-    def _run(cls, app, interval_seconds: int):
+    def _run(cls, app):
+        last_sync = None
+        next_heartbeat = 0
         while cls._running:
             try:
                 with app.app_context():
-                    cls._check_flights()
+                    if time.monotonic() >= next_heartbeat:
+                        next_heartbeat = time.monotonic() + cls._lease.heartbeat_seconds
+                        if cls._heartbeat():
+                            # Novi lider uvek krece od svezeg stanja iz baze
+                            last_sync = None
+
+                    if cls._is_leader:
+                        if last_sync is None or cls._resync_due(last_sync):
+                            cls._resync()
+                            last_sync = time.monotonic()
+                        cls._process_due()
             except Exception as e:
                 print(f"FlightStatusWatcher error: {e}")
-            time.sleep(interval_seconds)
+
+            cls._wakeup.wait(cls._sleep_seconds(last_sync, next_heartbeat))
+            cls._wakeup.clear()
+
+        if cls._is_leader:
+            with app.app_context():
+                cls._lease.release()
+            cls._is_leader = False
+
+    @classmethod
+    def _heartbeat(cls) -> bool:
+        """Obnavlja/preuzima lease; vraca True ako je proces upravo postao lider"""
+        was_leader = cls._is_leader
+        try:
+            cls._is_leader = cls._lease.try_acquire()
+        except Exception:
+            cls._is_leader = False
+            raise
+
+        if cls._is_leader:
+            cls._refresh_db_next_due()
+        else:
+            # Bivsi lider (ili zakasneli schedule) - stanje bi samo raslo bez obrade
+            with cls._lock:
+                cls._heap = []
+                cls._pending = {}
+        if cls._is_leader and not was_leader:
+            print(f"FlightStatusWatcher: {cls._lease.holder} je preuzeo izvrsavanje prelaza")
+        return cls._is_leader and not was_leader
 
     @classmethod
-    def _check_flights(cls):
+    def _resync_due(cls, last_sync: float) -> bool:
+        return bool(cls._resync_seconds) and time.monotonic() - last_sync >= cls._resync_seconds
+
+    @classmethod
+    def _sleep_seconds(cls, last_sync, next_heartbeat: float) -> float:
+        """Vreme do sledeceg heartbeat-a, a za lidera i do najranijeg prelaza ili resync-a"""
+        timeout = max(next_heartbeat - time.monotonic(), 0)
+        if not cls._is_leader or last_sync is None:
+            return timeout
+
+        now = datetime.now()
+        with cls._lock:
+            if cls._heap:
+                timeout = min(timeout, max((cls._heap[0][0] - now).total_seconds(), 0))
+        if cls._db_next_due is not None:
+            timeout = min(timeout, max((cls._db_next_due - now).total_seconds(), 0))
+
+        if cls._resync_seconds:
+            timeout = min(timeout, max(cls._resync_seconds - (time.monotonic() - last_sync), 0))
+
+        return timeout
+
+    @classmethod
+    def _refresh_db_next_due(cls):
+        """Najraniji sledeci prelaz po bazi - pokriva letove izmenjene u drugim procesima"""
+        departure = db.session.query(func.min(Flight.departure_time)).filter(
+            Flight.status == FlightStatus.APPROVED
+        ).scalar()
+        landing = db.session.query(func.min(Flight.landing_time)).filter(
+            Flight.status == FlightStatus.IN_PROGRESS
+        ).scalar()
+        db.session.rollback()
+
+        candidates = [t for t in (departure, landing) if t is not None]
+        cls._db_next_due = min(candidates) if candidates else None
+
+    @classmethod
+    def _resync(cls):
+        """Ucitava sve aktivne letove iz baze i iznova gradi heap (start i opcioni resync)"""
+        rows = db.session.query(
+            Flight.id, Flight.status, Flight.departure_time, Flight.landing_time
+        ).filter(Flight.status.in_([FlightStatus.APPROVED, FlightStatus.IN_PROGRESS])).all()
+        db.session.rollback()
+
+        with cls._lock:
+            cls._heap = []
+            cls._pending = {}
+            for flight_id, status, departure, landing in rows:
+                cls._push(flight_id, cls._next_transition(status, departure, landing))
+
+    @classmethod
+    def _process_due(cls):
         now = datetime.now()
-        flights = Flight.query.filter(Flight.status.in_(["APPROVED", "IN_PROGRESS"])).all()
-        updated = False
-        for flight in flights:
-            departure = flight.departure_time
-            landing = departure + timedelta(minutes=flight.duration_minutes)
-
-            if flight.status.name == "APPROVED" and now >= departure and now < landing:
-                flight.status = FlightStatus.IN_PROGRESS
-                updated = True
-            elif flight.status.name in ("APPROVED", "IN_PROGRESS") and now >= landing:
-                flight.status = FlightStatus.COMPLETED
-                updated = True
-
-        if updated:
-            db.session.commit()
-
-        payload = {
+        due = cls._db_next_due is not None and cls._db_next_due <= now
+        with cls._lock:
+            while cls._heap and cls._heap[0][0] <= now:
+                when, flight_id, status = heapq.heappop(cls._heap)
+                if cls._pending.get(flight_id) == (when, status):
+                    del cls._pending[flight_id]
+                    due = True
+
+        if not due:
+            return
+
+        # Prvo sletanja (ukljucuje i odobrene letove koji su vec sleteli), pa polasci
+        completed = cls._bulk_transition(
+            [FlightStatus.APPROVED, FlightStatus.IN_PROGRESS],
+            Flight.landing_time,
+            FlightStatus.COMPLETED,
+            now
+        )
+        in_progress = cls._bulk_transition(
+            [FlightStatus.APPROVED],
+            Flight.departure_time,
+            FlightStatus.IN_PROGRESS,
+            now
+        )
+        db.session.commit()
+        cls._refresh_db_next_due()
+
+        with cls._lock:
+            for row in completed:
+                cls._pending.pop(row.id, None)
+            for row in in_progress:
+                cls._push(row.id, (row.landing_time, FlightStatus.COMPLETED.name))
+
+        for rows, status in ((completed, FlightStatus.COMPLETED), (in_progress, FlightStatus.IN_PROGRESS)):
+            for row in rows:
+                socketio.emit("flight_status_changed", {"id": row.id, "name": row.name, "status": status.value})
+
+        socketio.emit("flight_status_tick", {
             "timestamp": now.isoformat(),
-            "count": len(flights),
-        }
+            "count": len(completed) + len(in_progress),
+        })
+
+    @staticmethod
+    def _bulk_transition(from_statuses, time_column, new_status, now: datetime):
+        """UPDATE flights SET status = :new WHERE status IN (...) AND time_column <= :now; vraca izmenjene redove"""
+        condition = (Flight.status.in_(from_statuses), time_column <= now)
+        returned = (Flight.id, Flight.name, Flight.landing_time)
+        values = {"status": new_status, "updated_at": datetime.utcnow()}
+
+        if db.engine.dialect.update_returning:
+            stmt = update(Flight).where(*condition).values(**values).returning(*returned)
+            return db.session.execute(stmt, execution_options={"synchronize_session": False}).all()
 
-        socketio.emit("flight_status_tick", payload)
\ No newline at end of file
+        # MySQL nema UPDATE ... RETURNING - zakljucaj pogodjene redove pa ih azuriraj po id-u
+        rows = db.session.execute(select(*returned).where(*condition).with_for_update()).all()
+        if rows:
+            stmt = update(Flight).where(Flight.id.in_([row.id for row in rows])).values(**values)
+            db.session.execute(stmt, execution_options={"synchronize_session": False})
+        return rows
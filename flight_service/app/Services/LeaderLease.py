@@ -0,0 +1,61 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.Extensions.db import db
+from app.Domain.models.SchedulerLease import SchedulerLease
+
+class LeaderLease:
+    """
+    Izbor lidera preko reda u tabeli scheduler_leases.
+
+    Proces koji drzi lease ga obnavlja svakih ttl/3 sekundi (heartbeat).
+    Ako lider umre, lease istekne i sledeci proces koji pozove try_acquire()
+    ga preuzima - radi za vise gunicorn worker-a i vise replika.
+    """
+
+    def __init__(self, name: str, ttl_seconds: int = 15):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.heartbeat_seconds = max(ttl_seconds / 3, 1)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def try_acquire(self) -> bool:
+        """Preuzima ili obnavlja lease; vraca True ako je ovaj proces lider"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+
+        result = db.session.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == self.name,
+                or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+            )
+            .values(holder=self.holder, expires_at=expires_at),
+            execution_options={"synchronize_session": False}
+        )
+        if result.rowcount == 1:
+            db.session.commit()
+            return True
+
+        # Red ne postoji (prvo pokretanje) ili ga drzi drugi ziv proces
+        try:
+            db.session.add(SchedulerLease(name=self.name, holder=self.holder, expires_at=expires_at))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+            return False
+
+    def release(self):
+        db.session.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+            .values(expires_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False}
+        )
+        db.session.commit()
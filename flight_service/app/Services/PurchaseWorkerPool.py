@@ -0,0 +1,338 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, update
+
+from app.Extensions.db import db
+from app.Domain.enums.PurchaseJobStatus import PurchaseJobStatus
+from app.Domain.enums.PurchaseStatus import PurchaseStatus
+from app.Domain.models.Flight import Flight
+from app.Domain.models.Purchase import Purchase
+from app.Domain.models.PurchaseJob import PurchaseJob
+from app.Services.EmailService import EmailService
+from app.Services.PassengerMailTemplates import purchase_completed_body
+
+class PurchaseWorkerPool:
+    """
+    Fiksni broj worker niti koje obradjuju kupovine iz tabele purchase_jobs.
+
+    Worker preuzima do batch_size poslova sa SELECT ... FOR UPDATE SKIP LOCKED,
+    pa vise worker-a (i vise procesa) nikad ne uzme isti posao. Neuspeli
+    poslovi se vracaju u red sa eksponencijalnim backoff-om, a posle
+    max_attempts pokusaja kupovina prelazi u FAILED.
+
+    Rezervacija sa servera ceka u AWAITING_PAYMENT dok server ne potvrdi
+    zaduzenje (confirm); nepotvrdjena posle reservation_timeout se otkazuje.
+    """
+    THROUGHPUT_WINDOW_SECONDS = 60
+    MAX_BACKOFF_SECONDS = 300
+
+    _threads = []
+    _running = False
+    _wakeup = threading.Event()
+
+    _workers = 4
+    _batch_size = 50
+    _processing_seconds = 5
+    _max_attempts = 5
+    _poll_seconds = 1
+    _visibility_timeout = 120
+    _reservation_timeout = 300
+    _last_requeue = 0
+
+    _metrics_lock = threading.Lock()
+    _processed_total = 0
+    _failed_total = 0
+    _retried_total = 0
+    _batches_total = 0
+    _recent = deque()   # (monotonic, broj zavrsenih) za throughput
+
+    @classmethod
+    def start(cls, app, workers: int = 4, batch_size: int = 50, processing_seconds: float = 5,
+              max_attempts: int = 5, poll_seconds: float = 1, visibility_timeout: int = 120,
+              reservation_timeout: int = 300):
+        if any(t.is_alive() for t in cls._threads):
+            return
+
+        cls._workers = workers
+        cls._batch_size = batch_size
+        cls._processing_seconds = processing_seconds
+        cls._max_attempts = max_attempts
+        cls._poll_seconds = poll_seconds
+        cls._visibility_timeout = visibility_timeout
+        cls._reservation_timeout = reservation_timeout
+
+        try:
+            with app.app_context():
+                cls._recover()
+        except Exception as e:
+            print(f"PurchaseWorkerPool recovery error: {e}")
+
+        cls._running = True
+        cls._threads = [
+            threading.Thread(target=cls._run, args=(app,), daemon=True)
+            for _ in range(workers)
+        ]
+        for thread in cls._threads:
+            thread.start()
+
+    @classmethod
+    def stop(cls):
+        cls._running = False
+        cls._wakeup.set()
+
+    @classmethod
+    def enqueue(cls, purchase_id: int, user_email: str = None, awaiting_payment: bool = False) -> PurchaseJob:
+        """Dodaje posao u sesiju; poziva se pre commit-a kupovine da bi oba reda nastala atomicno"""
+        job = PurchaseJob(
+            purchase_id=purchase_id,
+            user_email=user_email,
+            status=PurchaseJobStatus.AWAITING_PAYMENT if awaiting_payment else PurchaseJobStatus.QUEUED,
+            attempts=0,
+            available_at=datetime.utcnow()
+        )
+        db.session.add(job)
+        return job
+
+    @classmethod
+    def confirm(cls, purchase_id: int) -> bool:
+        """Placena rezervacija ide u red; False ako posao vise ne ceka (vec potvrdjen ili istekao)"""
+        result = db.session.execute(
+            update(PurchaseJob)
+            .where(PurchaseJob.purchase_id == purchase_id, PurchaseJob.status == PurchaseJobStatus.AWAITING_PAYMENT)
+            .values(status=PurchaseJobStatus.QUEUED, available_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False}
+        )
+        return result.rowcount == 1
+
+    @classmethod
+    def notify(cls):
+        cls._wakeup.set()
+
+    @classmethod
+    def metrics(cls) -> dict:
+        counts = dict(
+            db.session.query(PurchaseJob.status, func.count(PurchaseJob.id))
+            .filter(PurchaseJob.status.in_([PurchaseJobStatus.QUEUED, PurchaseJobStatus.PROCESSING]))
+            .group_by(PurchaseJob.status)
+            .all()
+        )
+
+        with cls._metrics_lock:
+            cls._trim_recent()
+            recent = sum(count for _, count in cls._recent)
+            return {
+                "workers": cls._workers,
+                "batch_size": cls._batch_size,
+                "queue_depth": counts.get(PurchaseJobStatus.QUEUED, 0),
+                "processing": counts.get(PurchaseJobStatus.PROCESSING, 0),
+                "processed_total": cls._processed_total,
+                "failed_total": cls._failed_total,
+                "retried_total": cls._retried_total,
+                "batches_total": cls._batches_total,
+                "throughput_per_second": round(recent / cls.THROUGHPUT_WINDOW_SECONDS, 3),
+            }
+
+    @classmethod
+    def _run(cls, app):
+        while cls._running:
+            try:
+                with app.app_context():
+                    jobs = cls._claim_batch()
+                    if jobs:
+                        cls._process_batch(jobs)
+                        continue
+
+                    if time.monotonic() - cls._last_requeue >= cls._visibility_timeout:
+                        cls._last_requeue = time.monotonic()
+                        cls._requeue_stale()
+                        cls._expire_reservations()
+            except Exception as e:
+                print(f"PurchaseWorkerPool error: {e}")
+
+            cls._wakeup.wait(cls._poll_seconds)
+            cls._wakeup.clear()
+
+    @classmethod
+    def _claim_batch(cls):
+        now = datetime.utcnow()
+        jobs = (
+            PurchaseJob.query
+            .filter(PurchaseJob.status == PurchaseJobStatus.QUEUED, PurchaseJob.available_at <= now)
+            .order_by(PurchaseJob.id)
+            .limit(cls._batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not jobs:
+            db.session.rollback()
+            return []
+
+        claimed = []
+        for job in jobs:
+            job.status = PurchaseJobStatus.PROCESSING
+            job.locked_at = now
+            job.attempts += 1
+            claimed.append((job.id, job.purchase_id, job.user_email, job.attempts))
+        db.session.commit()
+        return claimed
+
+    @classmethod
+    def _process_batch(cls, jobs):
+        job_ids = [job[0] for job in jobs]
+        purchase_ids = [job[1] for job in jobs]
+        emails = {job[1]: job[2] for job in jobs}
+
+        try:
+            time.sleep(cls._processing_seconds)  # simulacija duze obrade (placanje)
+
+            db.session.execute(
+                update(Purchase)
+                .where(Purchase.id.in_(purchase_ids), Purchase.status == PurchaseStatus.IN_PROGRESS)
+                .values(status=PurchaseStatus.COMPLETED),
+                execution_options={"synchronize_session": False}
+            )
+            db.session.execute(
+                update(PurchaseJob)
+                .where(PurchaseJob.id.in_(job_ids))
+                .values(status=PurchaseJobStatus.DONE, locked_at=None, last_error=None),
+                execution_options={"synchronize_session": False}
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            cls._retry_or_fail(jobs, str(e))
+            return
+
+        # Otkazane u medjuvremenu ostaju CANCELLED - mejl samo za zavrsene
+        completed = (
+            db.session.query(Purchase.id, Purchase.ticket_price, Flight)
+            .join(Flight, Purchase.flight_id == Flight.id)
+            .filter(Purchase.id.in_(purchase_ids), Purchase.status == PurchaseStatus.COMPLETED)
+            .all()
+        )
+        try:
+            EmailService.send_many([
+                (emails[purchase_id], "Kupovina karte uspesna", purchase_completed_body(flight, purchase_id, ticket_price))
+                for purchase_id, ticket_price, flight in completed
+                if emails.get(purchase_id)
+            ])
+        except Exception as e:
+            print(f"Failed to queue emails for purchases {purchase_ids}: {e}")
+
+        with cls._metrics_lock:
+            cls._processed_total += len(jobs)
+            cls._batches_total += 1
+            cls._recent.append((time.monotonic(), len(jobs)))
+            cls._trim_recent()
+        print(f"Obradjeno {len(jobs)} kupovina; ID-jevi: {purchase_ids}")
+
+    @classmethod
+    def _retry_or_fail(cls, jobs, error: str):
+        now = datetime.utcnow()
+        failed = [job for job in jobs if job[3] >= cls._max_attempts]
+        retried = [job for job in jobs if job[3] < cls._max_attempts]
+
+        for job_id, _, _, attempts in retried:
+            backoff = min(2 ** attempts, cls.MAX_BACKOFF_SECONDS)
+            db.session.execute(
+                update(PurchaseJob)
+                .where(PurchaseJob.id == job_id)
+                .values(
+                    status=PurchaseJobStatus.QUEUED,
+                    locked_at=None,
+                    available_at=now + timedelta(seconds=backoff),
+                    last_error=error
+                ),
+                execution_options={"synchronize_session": False}
+            )
+
+        if failed:
+            db.session.execute(
+                update(PurchaseJob)
+                .where(PurchaseJob.id.in_([job[0] for job in failed]))
+                .values(status=PurchaseJobStatus.FAILED, locked_at=None, last_error=error),
+                execution_options={"synchronize_session": False}
+            )
+            db.session.execute(
+                update(Purchase)
+                .where(Purchase.id.in_([job[1] for job in failed]), Purchase.status == PurchaseStatus.IN_PROGRESS)
+                .values(status=PurchaseStatus.FAILED),
+                execution_options={"synchronize_session": False}
+            )
+        db.session.commit()
+
+        with cls._metrics_lock:
+            cls._retried_total += len(retried)
+            cls._failed_total += len(failed)
+        print(f"Greska u obradi kupovina {[job[1] for job in jobs]}: {error}")
+
+    @classmethod
+    def _requeue_stale(cls):
+        """Vraca u red poslove ciji je worker (ili proces) nestao usred obrade"""
+        cutoff = datetime.utcnow() - timedelta(seconds=cls._visibility_timeout)
+        result = db.session.execute(
+            update(PurchaseJob)
+            .where(PurchaseJob.status == PurchaseJobStatus.PROCESSING, PurchaseJob.locked_at < cutoff)
+            .values(status=PurchaseJobStatus.QUEUED, locked_at=None),
+            execution_options={"synchronize_session": False}
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @classmethod
+    def _expire_reservations(cls):
+        """Rezervacije bez potvrde zaduzenja posle reservation_timeout - kupovina CANCELLED, posao FAILED"""
+        cutoff = datetime.utcnow() - timedelta(seconds=cls._reservation_timeout)
+        expired = (
+            db.session.query(PurchaseJob.id, PurchaseJob.purchase_id)
+            .filter(PurchaseJob.status == PurchaseJobStatus.AWAITING_PAYMENT, PurchaseJob.created_at < cutoff)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not expired:
+            db.session.rollback()
+            return 0
+
+        db.session.execute(
+            update(PurchaseJob)
+            .where(PurchaseJob.id.in_([row.id for row in expired]))
+            .values(status=PurchaseJobStatus.FAILED, last_error="Reservation expired"),
+            execution_options={"synchronize_session": False}
+        )
+        db.session.execute(
+            update(Purchase)
+            .where(Purchase.id.in_([row.purchase_id for row in expired]), Purchase.status == PurchaseStatus.IN_PROGRESS)
+            .values(status=PurchaseStatus.CANCELLED),
+            execution_options={"synchronize_session": False}
+        )
+        db.session.commit()
+        print(f"PurchaseWorkerPool: isteklo {len(expired)} nepotvrdjenih rezervacija")
+        return len(expired)
+
+    @classmethod
+    def _recover(cls):
+        """Na startu: zaglavljeni poslovi nazad u red, IN_PROGRESS kupovine bez posla dobijaju posao"""
+        requeued = cls._requeue_stale()
+
+        orphan_ids = [
+            row.id for row in
+            db.session.query(Purchase.id)
+            .outerjoin(PurchaseJob, PurchaseJob.purchase_id == Purchase.id)
+            .filter(Purchase.status == PurchaseStatus.IN_PROGRESS, PurchaseJob.id.is_(None))
+            .all()
+        ]
+        for purchase_id in orphan_ids:
+            cls.enqueue(purchase_id)
+        db.session.commit()
+
+        if requeued or orphan_ids:
+            print(f"PurchaseWorkerPool: vraceno {requeued} poslova, oporavljeno {len(orphan_ids)} kupovina")
+
+    @classmethod
+    def _trim_recent(cls):
+        cutoff = time.monotonic() - cls.THROUGHPUT_WINDOW_SECONDS
+        while cls._recent and cls._recent[0][0] < cutoff:
+            cls._recent.popleft()
@@ -3,7 +3,12 @@ from app.Extensions.db import db
 from app.Extensions.socketio import socketio
 from app.Extensions.mail import mail
 from app.Extensions.jwt import jwt
+from app.Extensions.compression import compress
+from app.Extensions.json_provider import FastJSONProvider
 from app.Services.FlightStatusWatcher import FlightStatusWatcher
+from app.Services.PurchaseWorkerPool import PurchaseWorkerPool
+from app.Services.CollectionVersions import CollectionVersions
+from app.Services.EmailSender import EmailSender
 from app.Extensions.cors import cors
 from app.API.flights import flights_bp
 from app.API.airlines import airlines_bp
@@ -11,15 +16,18 @@ from app.Config.config import Config
 from app.API.test_mail import test_mail_bp
 from app.API.purchases import purchase_bp
 from app.API.ratings import rating_bp
+from app.API.ratings.RatingService import RatingService
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
     
     db.init_app(app)
     mail.init_app(app)
     jwt.init_app(app)
     cors.init_app(app)
+    compress.init_app(app)
     socketio.init_app(app, cors_allowed_origins="*", async_mode='eventlet')
     
     app.register_blueprint(flights_bp)
@@ -33,6 +41,29 @@ def create_app():
     with app.app_context():
         db.create_all()
 
-    FlightStatusWatcher.start(app, interval_seconds=2)
+    CollectionVersions.init_app(app)
+
+    with app.app_context():
+        RatingService.ensure_stats()
+
+    FlightStatusWatcher.start(
+        app,
+        resync_seconds=app.config.get("FLIGHT_STATUS_RESYNC_SECONDS"),
+        lease_seconds=app.config.get("FLIGHT_STATUS_LEASE_SECONDS", 15)
+    )
+    PurchaseWorkerPool.start(
+        app,
+        workers=app.config.get("PURCHASE_WORKERS", 4),
+        batch_size=app.config.get("PURCHASE_BATCH_SIZE", 50),
+        processing_seconds=app.config.get("PURCHASE_PROCESSING_SECONDS", 5),
+        max_attempts=app.config.get("PURCHASE_MAX_ATTEMPTS", 5),
+        reservation_timeout=app.config.get("PURCHASE_RESERVATION_TIMEOUT_SECONDS", 300)
+    )
+    EmailSender.start(
+        app,
+        batch_size=app.config.get("MAIL_OUTBOX_BATCH_SIZE", 50),
+        max_attempts=app.config.get("MAIL_OUTBOX_MAX_ATTEMPTS", 5),
+        idle_seconds=app.config.get("MAIL_SMTP_IDLE_SECONDS", 30)
+    )
     
     return app
\ No newline at end of file
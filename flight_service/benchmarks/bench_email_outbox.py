@@ -0,0 +1,153 @@
+"""
+Benchmark za slanje mejlova: stari put (nova SMTP konekcija po poruci, u zahtevu)
+naspram outbox-a (upis u email_outbox u zahtevu + EmailSender preko jedne konekcije).
+
+Pokretanje (iz flight_service/):
+    python -m benchmarks.bench_email_outbox
+    python -m benchmarks.bench_email_outbox 500 0.005
+
+Umesto pravog SMTP servera podize se lokalni SMTP stand-in koji svaki odgovor
+kasni za zadatu latenciju (podrazumevano 5 ms), pa razlika odgovara broju
+SMTP round-trip-ova. Baza je in-memory SQLite. Naslov i telo su ne-ASCII (emoji i
+dijakritici, kao u mejlovima o letovima), a na kraju se proverava koliko je poruka
+stand-in zaista primio i da su naslov i telo stigli ispravno kodirani.
+"""
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+from email import message_from_bytes
+from email.header import decode_header, make_header
+
+from flask import Flask
+
+from app.Extensions.db import db
+from app.Extensions.mail import mail
+from app.Domain.models import EmailOutbox
+from app.Services.EmailSender import EmailSender
+from app.Services.EmailService import EmailService
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimalan SMTP dijalog: EHLO/HELO, MAIL, RCPT, DATA, NOOP, RSET, QUIT"""
+
+    def _reply(self, line: str):
+        time.sleep(self.server.latency)
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self._reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250 stand-in")
+            elif command == "DATA":
+                self._reply("354 end with <CRLF>.<CRLF>")
+                data = b""
+                line = self.rfile.readline()
+                while line not in (b".\r\n", b""):
+                    data += line
+                    line = self.rfile.readline()
+                self.server.messages += 1
+                self.server.last_message = data
+                self._reply("250 OK")
+            elif command.startswith("QUIT"):
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.latency = latency
+        self.connections = 0
+        self.messages = 0
+        self.last_message = None
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+SUBJECT = "✈️ Novi let kreiran"
+BODY = "🔔 Promena statusa leta\nStatus: PENDING ➜ APPROVED\nPolazak: Niš"
+DRAIN_TIMEOUT_SECONDS = 60
+
+
+def _create_app(port: int):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"check_same_thread": False}}
+    app.config["MAIL_SERVER"] = "127.0.0.1"
+    app.config["MAIL_PORT"] = port
+    app.config["MAIL_USE_TLS"] = False
+    app.config["MAIL_DEFAULT_SENDER"] = "bench@example.com"
+    db.init_app(app)
+    mail.init_app(app)  # kao u create_app - Flask-Mail menja utf-8 charset (8bit), sto je rusilo as_string()
+    return app
+
+
+def _inline(port: int, count: int) -> float:
+    """Stari put: connect + sendmail + quit za svaku poruku"""
+    start = time.perf_counter()
+    for i in range(count):
+        server = smtplib.SMTP("127.0.0.1", port)
+        server.sendmail("bench@example.com", [f"user{i}@example.com"], "Subject: test\r\n\r\nbody")
+        server.quit()
+    return time.perf_counter() - start
+
+
+def main(count: int, latency: float):
+    smtp = SMTPStandIn(latency)
+    port = smtp.server_address[1]
+
+    inline_seconds = _inline(port, count)
+    inline_connections = smtp.connections
+
+    app = _create_app(port)
+    with app.app_context():
+        db.create_all()
+
+        start = time.perf_counter()
+        for i in range(count):
+            EmailService.send(subject=SUBJECT, body=BODY, to=f"user{i}@example.com")
+        enqueue_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        EmailSender.start(app, batch_size=50, poll_seconds=0.05)
+        deadline = start + DRAIN_TIMEOUT_SECONDS
+        while smtp.messages < inline_connections + count and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        # Stand-in je primio poruke - sacekaj i da EmailSender upise SENT
+        while EmailSender.metrics()["sent_total"] < count and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        drain_seconds = time.perf_counter() - start
+        EmailSender.stop()
+
+        metrics = EmailSender.metrics()
+        # Isporuka, ne samo upis u outbox: stand-in je primio svaku poruku, sa ispravnim naslovom
+        delivered = smtp.messages - inline_connections
+        assert delivered == count, f"stand-in received {delivered} of {count} messages: {metrics}"
+        assert metrics["sent_total"] == count and metrics["retried_total"] == 0 and metrics["failed_total"] == 0, metrics
+        received = message_from_bytes(smtp.last_message.replace(b"\r\n", b"\n"))
+        assert str(make_header(decode_header(received["Subject"]))) == SUBJECT, received["Subject"]
+        assert received.get_payload(decode=True).decode("utf-8").rstrip("\n") == BODY
+
+    print(f"messages: {count}, SMTP latency: {latency * 1000:.1f} ms")
+    print(f"{'path':>8} | {'request time (ms/msg)':>21} | {'delivery (s)':>12} | {'connections':>11}")
+    print(f"{'inline':>8} | {inline_seconds / count * 1000:>21.2f} | {inline_seconds:>12.2f} | {inline_connections:>11}")
+    print(f"{'outbox':>8} | {enqueue_seconds / count * 1000:>21.2f} | {drain_seconds:>12.2f} | "
+          f"{smtp.connections - inline_connections:>11}")
+    print(f"EmailSender: {metrics}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 200, float(args[1]) if len(args) > 1 else 0.005)
@@ -0,0 +1,106 @@
+"""
+Benchmark za listanje letova: stari put (ORM objekti + lazy airline + FlightDTO po redu)
+naspram novog (JOIN nad kolonama + _row_to_dict).
+
+Pokretanje (iz flight_service/):
+    python -m benchmarks.bench_flight_listing
+    python -m benchmarks.bench_flight_listing 10000 100000
+
+Koristi in-memory SQLite, pa su apsolutni brojevi manji nego na MySQL-u,
+ali broj upita i odnos vremena su reprezentativni.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import event
+
+from app.Extensions.db import db
+from app.Domain.models import Flight, Airline
+from app.Domain.enums.FlightStatus import FlightStatus
+from app.API.flights.FlightService import FlightService
+
+AIRLINES = 200
+
+
+def _create_app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    return app
+
+
+def _seed(flight_count: int):
+    db.drop_all()
+    db.create_all()
+
+    db.session.execute(Airline.__table__.insert(), [
+        {"name": f"Airline {i}", "code": f"AL{i}", "country": "Serbia"}
+        for i in range(1, AIRLINES + 1)
+    ])
+
+    base = datetime(2030, 1, 1)
+    statuses = list(FlightStatus)
+    db.session.execute(Flight.__table__.insert(), [
+        {
+            "name": f"Flight {i}",
+            "airline_id": i % AIRLINES + 1,
+            "distance_km": 1000.0,
+            "duration_minutes": 120,
+            "departure_time": base + timedelta(minutes=i),
+            "landing_time": base + timedelta(minutes=i + 120),
+            "departure_airport": "BEG",
+            "arrival_airport": "JFK",
+            "created_by_user_id": 1,
+            "ticket_price": 199.0,
+            "status": statuses[i % len(statuses)].name,
+            "created_at": base,
+            "updated_at": base,
+        }
+        for i in range(flight_count)
+    ])
+    db.session.commit()
+
+
+def _old_listing():
+    flights = Flight.query.all()
+    return [FlightService._to_dto(f).model_dump() for f in flights]
+
+
+def _new_listing():
+    return FlightService.get_all_flights()
+
+
+def _measure(fn):
+    queries = [0]
+
+    def _count(*args, **kwargs):
+        queries[0] += 1
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _count)
+    db.session.expunge_all()
+    start = time.perf_counter()
+    try:
+        rows = fn()
+    finally:
+        elapsed = time.perf_counter() - start
+        event.remove(engine, "before_cursor_execute", _count)
+    return len(rows), queries[0], elapsed
+
+
+def main(sizes):
+    app = _create_app()
+    with app.app_context():
+        print(f"{'flights':>8} | {'path':>4} | {'rows':>8} | {'queries':>7} | {'time (s)':>8}")
+        for size in sizes:
+            _seed(size)
+            for label, fn in (("old", _old_listing), ("new", _new_listing)):
+                rows, queries, elapsed = _measure(fn)
+                print(f"{size:>8} | {label:>4} | {rows:>8} | {queries:>7} | {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,111 @@
+"""
+Benchmark za serijalizaciju odgovora: podrazumevani Flask JSON provider (stdlib json)
+naspram FastJSONProvider-a (orjson), plus velicina gzip/brotli kompresovanog tela.
+
+Pokretanje (iz flight_service/):
+    python -m benchmarks.bench_json_encoder
+    python -m benchmarks.bench_json_encoder 1000 10000
+
+Payload-i su istog oblika kao lista letova, istorija kupovina i lista korisnika,
+pa nije potrebna baza. Meri se app.json.response(...), tj. isti put kao jsonify.
+"""
+import gzip
+import sys
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.Extensions.json_provider import FastJSONProvider
+from app.Extensions.compression import brotli
+
+ROUNDS = 20
+
+
+def _flights(count: int):
+    base = datetime(2030, 1, 1)
+    return [
+        {
+            "id": i,
+            "name": f"Flight {i}",
+            "airline_id": i % 200 + 1,
+            "airline_name": f"Airline {i % 200 + 1}",
+            "distance_km": 1000.0 + i % 50,
+            "duration_minutes": 120,
+            "departure_time": base + timedelta(minutes=i),
+            "landing_time": base + timedelta(minutes=i + 120),
+            "departure_airport": "BEG",
+            "arrival_airport": "JFK",
+            "created_by_user_id": 1,
+            "ticket_price": 199.0,
+            "status": "APPROVED",
+            "created_at": base,
+        }
+        for i in range(count)
+    ]
+
+
+def _purchases(count: int):
+    base = datetime(2030, 1, 1)
+    return [
+        {
+            "id": i,
+            "user_id": i % 500 + 1,
+            "flight_id": i % 1000 + 1,
+            "ticket_price": 199.0,
+            "status": "COMPLETED",
+            "purchase_time": base + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def _users(count: int):
+    return [
+        {
+            "id": i,
+            "firstName": f"Ime{i}",
+            "lastName": f"Prezime{i}",
+            "email": f"user{i}@example.com",
+            "role": "USER",
+            "accountBalance": 1500.0,
+            "dateOfBirth": "1990-01-01",
+            "country": "Serbia",
+        }
+        for i in range(count)
+    ]
+
+
+def _measure(app, payload):
+    with app.app_context():
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            body = app.json.response(payload).get_data()
+        elapsed = (time.perf_counter() - start) / ROUNDS
+    return body, elapsed
+
+
+def main(sizes):
+    stdlib_app = Flask(__name__)
+    stdlib_app.json = DefaultJSONProvider(stdlib_app)
+    fast_app = Flask(__name__)
+    fast_app.json = FastJSONProvider(fast_app)
+
+    print(f"{'payload':>10} | {'rows':>7} | {'stdlib (ms)':>11} | {'orjson (ms)':>11} | "
+          f"{'bytes':>9} | {'gzip':>8} | {'brotli':>8}")
+    for size in sizes:
+        for label, build in (("flights", _flights), ("purchases", _purchases), ("users", _users)):
+            payload = build(size)
+            stdlib_body, stdlib_time = _measure(stdlib_app, payload)
+            fast_body, fast_time = _measure(fast_app, payload)
+            assert stdlib_app.json.loads(stdlib_body) == fast_app.json.loads(fast_body)
+
+            gzip_size = len(gzip.compress(fast_body, compresslevel=6))
+            brotli_size = len(brotli.compress(fast_body, quality=5)) if brotli is not None else "-"
+            print(f"{label:>10} | {size:>7} | {stdlib_time * 1000:>11.2f} | {fast_time * 1000:>11.2f} | "
+                  f"{len(fast_body):>9} | {gzip_size:>8} | {brotli_size:>8}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000])
@@ -30,6 +30,22 @@ CREATE TABLE IF NOT EXISTS users (
     profileImage LONGTEXT NULL
 );
 
+CREATE TABLE IF NOT EXISTS balance_ledger (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    amount DECIMAL(12, 2) NOT NULL,
+    reason VARCHAR(30) NOT NULL,
+    reference VARCHAR(64) NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX ix_balance_ledger_user_id (user_id),
+    CONSTRAINT uq_balance_ledger_reason_reference UNIQUE (reason, reference),
+    CONSTRAINT fk_balance_ledger_user
+        FOREIGN KEY (user_id)
+        REFERENCES users(id)
+        ON DELETE CASCADE
+);
+
 CREATE DATABASE IF NOT EXISTS drs_flights_db;
 
 USE drs_flights_db;
@@ -58,6 +74,7 @@ CREATE TABLE IF NOT EXISTS flights (
     duration_minutes INT NOT NULL,
 
     departure_time DATETIME NOT NULL,
+    landing_time DATETIME NOT NULL,
     departure_airport VARCHAR(100) NOT NULL,
     arrival_airport VARCHAR(100) NOT NULL,
 
@@ -75,4 +92,45 @@ CREATE TABLE IF NOT EXISTS flights (
         FOREIGN KEY (airline_id)
         REFERENCES airlines(id)
         ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+CREATE INDEX ix_flights_departure_time_id ON flights (departure_time, id);
+CREATE INDEX ix_flights_status_departure_time ON flights (status, departure_time, id);
+CREATE INDEX ix_flights_status_landing_time ON flights (status, landing_time);
+CREATE INDEX ix_flights_airline_departure_time ON flights (airline_id, departure_time, id);
+CREATE INDEX ix_flights_departure_airport_time ON flights (departure_airport, departure_time, id);
+CREATE INDEX ix_flights_arrival_airport_time ON flights (arrival_airport, departure_time, id);
+CREATE INDEX ix_flights_updated_at ON flights (updated_at);
+
+-- Postojeca baza bez landing_time kolone:
+-- ALTER TABLE flights ADD COLUMN landing_time DATETIME NULL AFTER departure_time;
+-- UPDATE flights SET landing_time = DATE_ADD(departure_time, INTERVAL duration_minutes MINUTE);
+-- ALTER TABLE flights MODIFY landing_time DATETIME NOT NULL;
+
+CREATE TABLE IF NOT EXISTS scheduler_leases (
+    name VARCHAR(50) PRIMARY KEY,
+    holder VARCHAR(120) NOT NULL,
+    expires_at DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS collection_versions (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO collection_versions (name, version) VALUES
+('flights', 0), ('airlines', 0), ('ratings', 0), ('purchases', 0);
+
+-- Tabela purchases nastaje kroz db.create_all(); postojeca baza dobija indeks za istoriju kupovina:
+-- CREATE INDEX ix_purchases_user_purchase_time ON purchases (user_id, purchase_time, id);
+
+-- Tabela ratings nastaje kroz db.create_all(); postojeca baza dobija jedinstvenu ocenu po korisniku i letu
+-- (eventualne duplikate prethodno ukloniti):
+-- ALTER TABLE ratings ADD CONSTRAINT uq_ratings_user_flight UNIQUE (user_id, flight_id);
+
+-- Tabela purchase_jobs nastaje kroz db.create_all(); postojeca baza dobija stanje rezervacije koja ceka zaduzenje:
+-- ALTER TABLE purchase_jobs MODIFY status ENUM('AWAITING_PAYMENT', 'QUEUED', 'PROCESSING', 'DONE', 'FAILED') NOT NULL;
+
+-- Tabela blocked_ip_mac nastaje kroz db.create_all(); postojeca baza dobija jedan red po IP-u (LoginThrottle):
+-- DROP INDEX ix_blocked_ip_mac_ip_address ON blocked_ip_mac;
+-- CREATE UNIQUE INDEX ix_blocked_ip_mac_ip_address ON blocked_ip_mac (ip_address);
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required
 
 from app.API.airlines.AirlineService import AirlineService
 from app.Helpers.authorization import require_admin
+from app.Helpers.conditional import conditional_json
 
 airlines_bp = Blueprint("airlines", __name__, url_prefix="/api/v1/airlines")
 
@@ -11,8 +12,7 @@ airlines_bp = Blueprint("airlines", __name__, url_prefix="/api/v1/airlines")
 def get_all_airlines():
     """Get all airlines - public endpoint"""
     try:
-        airlines = AirlineService.get_all_airlines()
-        return jsonify(airlines), 200
+        return conditional_json(AirlineService.get_all_airlines())
     except ValueError as e:
         return jsonify({"error": str(e)}), 500
     except Exception as e:
@@ -23,8 +23,7 @@ def get_all_airlines():
 def get_airline(airline_id: int):
     """Get airline by ID - public endpoint"""
     try:
-        airline = AirlineService.get_airline_by_id(airline_id)
-        return jsonify(airline), 200
+        return conditional_json(AirlineService.get_airline_by_id(airline_id))
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -1,39 +1,50 @@
 import requests
-from flask import current_app
+
+from app.API.flights.FlightService import FlightService
+from app.Services.ResponseCache import ResponseCache
+from app.Services.UpstreamClient import UpstreamClient, UpstreamResult
 
 
 class AirlineService:
+    _cache = ResponseCache("airlines")
+
+    @staticmethod
+    def invalidate_cache():
+        AirlineService._cache.invalidate()
+        # letovi nose airline_name, a brisanje kompanije brise i njene letove
+        FlightService.invalidate_cache()
 
     @staticmethod
-    def _get_base_url():
-        return current_app.config.get("FLIGHT_SERVICE_URL", "http://localhost:5051")
+    def get_all_airlines() -> UpstreamResult:
+        return AirlineService._cache.get_or_load(("list",), AirlineService._fetch_all_airlines)
 
     @staticmethod
-    def get_all_airlines():
+    def _fetch_all_airlines(etag: str = None) -> UpstreamResult:
         try:
-            response = requests.get(f"{AirlineService._get_base_url()}/api/v1/airlines")
-            response.raise_for_status()
-            return response.json()
+            return UpstreamClient.get_json("/api/v1/airlines", etag=etag)
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to fetch airlines: {str(e)}")
 
     @staticmethod
-    def get_airline_by_id(airline_id: int):
+    def get_airline_by_id(airline_id: int) -> UpstreamResult:
+        return AirlineService._cache.get_or_load(("airline", airline_id), lambda etag: AirlineService._fetch_airline(airline_id, etag))
+
+    @staticmethod
+    def _fetch_airline(airline_id: int, etag: str = None) -> UpstreamResult:
         try:
-            response = requests.get(f"{AirlineService._get_base_url()}/api/v1/airlines/{airline_id}")
-            response.raise_for_status()
-            return response.json()
+            return UpstreamClient.get_json(f"/api/v1/airlines/{airline_id}", etag=etag)
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to fetch airline: {str(e)}")
 
     @staticmethod
     def create_airline(data: dict):
         try:
-            response = requests.post(
-                f"{AirlineService._get_base_url()}/api/v1/airlines",
+            response = UpstreamClient.post(
+                "/api/v1/airlines",
                 json=data
             )
             response.raise_for_status()
+            AirlineService.invalidate_cache()
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to create airline: {str(e)}")
@@ -41,10 +52,11 @@ class AirlineService:
     @staticmethod
     def delete_airline(airline_id: int):
         try:
-            response = requests.delete(
-                f"{AirlineService._get_base_url()}/api/v1/airlines/{airline_id}"
+            response = UpstreamClient.delete(
+                f"/api/v1/airlines/{airline_id}"
             )
             response.raise_for_status()
+            AirlineService.invalidate_cache()
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to delete airline: {str(e)}")
@@ -3,6 +3,7 @@ from pydantic import ValidationError
 
 from app.Domain.DTOs import LoginUserDTO, RegistrationUserDTO
 from app.API.auth.AuthService import AuthService
+from app.Services.PasswordHasher import PasswordHasherBusy
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/v1")
 
@@ -16,6 +17,9 @@ def login():
     except ValidationError as e:
         return jsonify({"error": e.errors()}), 400
 
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503
+
     except ValueError as e:
         return jsonify({"error": str(e)}), 401
 
@@ -30,5 +34,8 @@ def register():
     except ValidationError as e:
         return jsonify({"error": e.errors()}), 400
 
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503
+
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
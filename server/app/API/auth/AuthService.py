@@ -1,27 +1,19 @@
-import os
 from app.Extensions import db
 from app.Domain.models.User import User
-from app.Helpers.hasher import hash_password, verify_password
+from app.Helpers.hasher import hash_password, verify_password, needs_rehash
 from app.Helpers.jwt_utils import create_user_token
 from app.Domain.enums.UserRole import UserRole
 from datetime import datetime, timedelta
-from flask import json, request
-
-failed_attempts = {}  # {ip: attempts}
-blocked_ips = {}  # {ip: locked_until_datetime}
+from app.Services.AdminRegistry import AdminRegistry
+from app.Services.LoginThrottle import LoginThrottle
+from app.Services.PasswordHasher import PasswordHasher
+from flask import request
 
 class AuthService:
-    MAX_LOGIN_ATTEMPTS = 3
-    LOCK_DURATION = 60
 
     @staticmethod
     def load_admins():
-        admins_path = os.path.join(os.getcwd(), "app", "Config", "admins.json")
-        if not os.path.exists(admins_path):
-            return []
-
-        with open(admins_path, "r") as f:
-            return json.load(f)
+        return AdminRegistry.all()
 
     @staticmethod
     def _get_client_ip():
@@ -47,46 +39,38 @@ class AuthService:
 
     @staticmethod
     def login(dto):
-        global failed_attempts, blocked_ips
-
         client_ip = AuthService._get_client_ip()
 
-        # Provera blokiranih IP-ova
-        if client_ip in blocked_ips:
-            if blocked_ips[client_ip] > datetime.utcnow():
-                remaining = (blocked_ips[client_ip] - datetime.utcnow()).total_seconds()
-                raise ValueError(f"IP address is temporarily blocked. Try again in {int(remaining)} seconds.")
-            else:
-                del blocked_ips[client_ip]
-                failed_attempts[client_ip] = 0
-
-        # Proveri admin login prvo
-        admins = AuthService.load_admins()
-        for admin in admins:
-            if admin["email"] == dto.email:
-                if not verify_password(admin["password"], dto.password):
-                    break  # Pogrešna lozinka, nastavi sa normalnim korisnicima
-
-                # Admin login uspešan
-                failed_attempts[client_ip] = 0
-                print(f"Admin {admin['email']} logged in successfully.")
-                return AuthService._create_admin_token(admin)
+        # Provera blokiranih IP-ova (blocked_ip_mac, zajednicko za sve worker-e)
+        locked_until = LoginThrottle.locked_until(client_ip)
+        if locked_until:
+            remaining = (locked_until - datetime.utcnow()).total_seconds()
+            raise ValueError(f"IP address is temporarily blocked. Try again in {int(remaining)} seconds.")
+
+        # Proveri admin login prvo (AdminRegistry - bez citanja fajla po prijavi)
+        admin = AdminRegistry.by_email(dto.email)
+        if admin and verify_password(admin["password"], dto.password):
+            # Admin login uspešan; pogrešna lozinka nastavlja sa normalnim korisnicima
+            LoginThrottle.register_success(client_ip)
+            print(f"Admin {admin['email']} logged in successfully.")
+            return AuthService._create_admin_token(admin)
 
         # Proveri normalnog korisnika
         user = User.query.filter_by(email=dto.email).first()
 
         if not user or not verify_password(user.password, dto.password):
-            failed_attempts[client_ip] = failed_attempts.get(client_ip, 0) + 1
-
-            if failed_attempts[client_ip] >= AuthService.MAX_LOGIN_ATTEMPTS:
-                blocked_ips[client_ip] = datetime.utcnow() + timedelta(seconds=AuthService.LOCK_DURATION)
-                raise ValueError(f"Too many failed login attempts from this IP. Blocked for {AuthService.LOCK_DURATION} seconds.")
+            if LoginThrottle.register_failure(client_ip):
+                raise ValueError(f"Too many failed login attempts from this IP. Blocked for {LoginThrottle.lock_seconds} seconds.")
 
             raise ValueError("Invalid email or password")
 
-        # Login uspešan
-        failed_attempts[client_ip] = 0
-        blocked_ips.pop(client_ip, None)
+        # Login uspešan - hes sa starim parametrima zamenjuje se novim dok je lozinka poznata
+        if needs_rehash(user.password):
+            user.password = hash_password(dto.password)
+            db.session.commit()
+            PasswordHasher.rehashed()
+
+        LoginThrottle.register_success(client_ip)
 
         return create_user_token(user)
 
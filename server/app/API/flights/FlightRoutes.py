@@ -2,10 +2,11 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt
 
 from app.API.flights.FlightService import FlightService
-from app.API.purchases.PurchaseService import PurchaseService
 from app.Domain.models.User import User
 from app.Extensions import db
 from app.Helpers.authorization import require_admin, require_manager
+from app.Helpers.conditional import conditional_json
+from app.Services.BalanceService import BalanceService
 from app.Services.EmailService import EmailService
 from app.Services.PassengerMailTemplates import flight_cancelled_for_passenger_body
 
@@ -14,10 +15,9 @@ flights_bp = Blueprint("flights", __name__, url_prefix="/api/v1/flights")
 
 @flights_bp.route("", methods=["GET"])
 def get_all_flights():
-    """Get all flights - public endpoint"""
+    """Get all flights - public endpoint (filters, limit/cursor, fields and ids are passed through)"""
     try:
-        flights = FlightService.get_all_flights()
-        return jsonify(flights), 200
+        return conditional_json(FlightService.get_all_flights(request.args.to_dict()))
     except ValueError as e:
         return jsonify({"error": str(e)}), 500
     except Exception as e:
@@ -28,8 +28,7 @@ def get_all_flights():
 def get_flight(flight_id: int):
     """Get flight by ID - public endpoint"""
     try:
-        flight = FlightService.get_flight_by_id(flight_id)
-        return jsonify(flight), 200
+        return conditional_json(FlightService.get_flight_by_id(flight_id))
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -117,41 +116,29 @@ def cancel_flight(flight_id: int):
         require_admin()
         token = request.headers.get("Authorization", "").replace("Bearer ", "")
 
-        purchases = PurchaseService.get_purchases_by_flight(flight_id)
+        # flight servis otkazuje let i sve aktivne kupovine u jednoj transakciji
         flight = FlightService.cancel_flight(flight_id, token)
+        cancelled_purchases = flight.pop("cancelled_purchases", [])
+
+        # Stizu sve otkazane kupovine leta - povrat samo za zaduzene (PURCHASE pod idempotency_key),
+        # a credit_many preskace vec vracene, pa ponovljeno otkazivanje zavrsava prekinut povrat
+        debited = BalanceService.booked_references(
+            "PURCHASE", [p.get("idempotency_key") for p in cancelled_purchases]
+        )
+        refunded = BalanceService.credit_many(
+            [
+                (p["id"], p["user_id"], p["ticket_price"]) for p in cancelled_purchases
+                if p.get("idempotency_key") is None or p["idempotency_key"] in debited
+            ],
+            "PURCHASE_REFUND"
+        )
+
+        user_ids = {user_id for _, user_id, _ in refunded}
+        if user_ids:
+            emails = db.session.query(User.email).filter(User.id.in_(user_ids), User.email.isnot(None)).all()
+            body = flight_cancelled_for_passenger_body(flight)
+            EmailService.send_many([(email, "Flight cancelled", body) for (email,) in emails])
 
-        for purchase in purchases:
-            status = purchase.get("status")
-            if status not in ("COMPLETED", "IN_PROGRESS"):
-                continue
-
-            user_id = purchase.get("user_id")
-            ticket_price = purchase.get("ticket_price")
-            if user_id is None or ticket_price is None:
-                continue
-
-            user = User.query.get(user_id)
-            if not user:
-                continue
-
-            user.accountBalance += float(ticket_price)
-
-            try:
-                PurchaseService.cancel_purchase(purchase.get("id"))
-            except Exception as e:
-                print(f"Failed to cancel purchase {purchase.get('id')}: {e}")
-
-            if user.email:
-                try:
-                    EmailService.send(
-                        to=user.email,
-                        subject="Flight cancelled",
-                        body=flight_cancelled_for_passenger_body(flight)
-                    )
-                except Exception as e:
-                    print(f"Failed to send cancellation email to user {user_id}: {e}")
-
-        db.session.commit()
         return jsonify(flight), 200
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
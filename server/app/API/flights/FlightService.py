@@ -1,30 +1,39 @@
 import requests
-from flask import current_app
 
 from app.Extensions import socketio
+from app.Services.ResponseCache import ResponseCache
+from app.Services.UpstreamClient import UpstreamClient, UpstreamResult
 
 
 class FlightService:
+    # Liste i pojedinacni letovi; brise se na svaki upis kroz gateway i na dogadjaje flight servisa
+    _cache = ResponseCache("flights")
 
     @staticmethod
-    def _get_base_url():
-        return current_app.config.get("FLIGHT_SERVICE_URL", "http://localhost:5051")
+    def invalidate_cache():
+        FlightService._cache.invalidate()
 
     @staticmethod
-    def get_all_flights():
+    def get_all_flights(params: dict = None) -> UpstreamResult:
+        """Prosledjuje filtere i keyset paginaciju (limit, cursor) flight servisu; vraca telo i ETag"""
+        key = ("list", tuple(sorted((params or {}).items())))
+        return FlightService._cache.get_or_load(key, lambda etag: FlightService._fetch_all_flights(params, etag))
+
+    @staticmethod
+    def _fetch_all_flights(params: dict = None, etag: str = None) -> UpstreamResult:
         try:
-            response = requests.get(f"{FlightService._get_base_url()}/api/v1/flights")
-            response.raise_for_status()
-            return response.json()
+            return UpstreamClient.get_json("/api/v1/flights", etag=etag, params=params)
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to fetch flights: {str(e)}")
 
     @staticmethod
-    def get_flight_by_id(flight_id: int):
+    def get_flight_by_id(flight_id: int) -> UpstreamResult:
+        return FlightService._cache.get_or_load(("flight", flight_id), lambda etag: FlightService._fetch_flight(flight_id, etag))
+
+    @staticmethod
+    def _fetch_flight(flight_id: int, etag: str = None) -> UpstreamResult:
         try:
-            response = requests.get(f"{FlightService._get_base_url()}/api/v1/flights/{flight_id}")
-            response.raise_for_status()
-            return response.json()
+            return UpstreamClient.get_json(f"/api/v1/flights/{flight_id}", etag=etag)
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to fetch flight: {str(e)}")
 
@@ -33,13 +42,14 @@ class FlightService:
         try:
             print(f"Creating flight with data: {data} and token: {token}")
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.post(
-                f"{FlightService._get_base_url()}/api/v1/flights",
+            response = UpstreamClient.post(
+                "/api/v1/flights",
                 json=data,
                 headers=headers
             )
             print(f"Flight creation response status: {response.status_code}")
             response.raise_for_status()
+            FlightService.invalidate_cache()
             try:
                 flight_response = response.json()
                 socketio.emit("flight_pending_approval", {
@@ -63,12 +73,13 @@ class FlightService:
     def update_flight(flight_id: int, data: dict, token: str):
         try:
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.put(
-                f"{FlightService._get_base_url()}/api/v1/flights/{flight_id}",
+            response = UpstreamClient.put(
+                f"/api/v1/flights/{flight_id}",
                 json=data,
                 headers=headers
             )
             response.raise_for_status()
+            FlightService.invalidate_cache()
             try:
                 flight_response = response.json()
                 socketio.emit("flight_pending_approval", {
@@ -92,11 +103,12 @@ class FlightService:
         try:
             print(f"Approving flight {flight_id} with token: {token}")
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.put(
-                f"{FlightService._get_base_url()}/api/v1/flights/{flight_id}/approve",
+            response = UpstreamClient.put(
+                f"/api/v1/flights/{flight_id}/approve",
                 headers=headers
             )
             response.raise_for_status()
+            FlightService.invalidate_cache()
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to approve flight: {str(e)}")
@@ -105,12 +117,13 @@ class FlightService:
     def reject_flight(flight_id: int, data: dict, token: str):
         try:
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.put(
-                f"{FlightService._get_base_url()}/api/v1/flights/{flight_id}/reject",
+            response = UpstreamClient.put(
+                f"/api/v1/flights/{flight_id}/reject",
                 json=data,
                 headers=headers
             )
             response.raise_for_status()
+            FlightService.invalidate_cache()
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to reject flight: {str(e)}")
@@ -119,11 +132,14 @@ class FlightService:
     def cancel_flight(flight_id: int, token: str):
         try:
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.put(
-                f"{FlightService._get_base_url()}/api/v1/flights/{flight_id}/cancel",
-                headers=headers
+            # otkazivanje obuhvata i sve kupovine leta - duzi read timeout
+            response = UpstreamClient.put(
+                f"/api/v1/flights/{flight_id}/cancel",
+                headers=headers,
+                timeout=(2, 30)
             )
             response.raise_for_status()
+            FlightService.invalidate_cache()
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to cancel flight: {str(e)}")
@@ -132,11 +148,12 @@ class FlightService:
     def delete_flight(flight_id: int, token: str):
         try:
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.delete(
-                f"{FlightService._get_base_url()}/api/v1/flights/{flight_id}",
+            response = UpstreamClient.delete(
+                f"/api/v1/flights/{flight_id}",
                 headers=headers
             )
             response.raise_for_status()
+            FlightService.invalidate_cache()
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to delete flight: {str(e)}")
@@ -2,8 +2,8 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 
 from app.API.purchases.PurchaseService import PurchaseService
-from app.Domain.models.User import User
-from app.Extensions import db
+from app.Helpers.conditional import conditional_json
+from app.Services.BalanceService import BalanceService
 
 purchase_bp = Blueprint("purchase_bp", __name__, url_prefix="/api/v1")
 
@@ -11,6 +11,8 @@ purchase_bp = Blueprint("purchase_bp", __name__, url_prefix="/api/v1")
 @purchase_bp.route("/purchase", methods=["POST"])
 def create_purchase():
     data = request.get_json() or {}
+    if request.headers.get("Idempotency-Key"):
+        data["idempotency_key"] = request.headers.get("Idempotency-Key")
 
     try:
         result = PurchaseService.create_purchase(data)
@@ -24,8 +26,25 @@ def create_purchase():
 @purchase_bp.route("/purchases/<int:user_id>", methods=["GET"])
 def get_user_purchases(user_id: int):
     try:
-        purchases = PurchaseService.get_user_purchases(user_id)
-        return jsonify(purchases), 200
+        return conditional_json(PurchaseService.get_user_purchases(
+            user_id,
+            request.headers.get("If-None-Match"),
+            request.args.get("fields")
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@purchase_bp.route("/purchases/<int:user_id>/history", methods=["GET"])
+def get_user_purchase_history(user_id: int):
+    try:
+        return conditional_json(PurchaseService.get_user_purchase_history(
+            user_id,
+            request.args.to_dict(),
+            request.headers.get("If-None-Match")
+        ))
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -49,26 +68,21 @@ def cancel_purchase(purchase_id: int):
         if claims.get("role") != "ADMIN" and current_user_id != int(purchase_user_id):
             return jsonify({"error": "Access denied"}), 403
 
-        if status == "CANCELLED":
-            return jsonify(purchase), 200
-
         if status == "FAILED":
             return jsonify({"error": "Cannot cancel a failed purchase"}), 400
 
-        user = User.query.get(purchase_user_id)
-        if not user:
-            return jsonify({"error": "User not found"}), 404
-
-        user.accountBalance += float(ticket_price)
-        db.session.commit()
-
-        try:
-            updated_purchase = PurchaseService.cancel_purchase(purchase_id)
-            return jsonify(updated_purchase), 200
-        except ValueError as e:
-            user.accountBalance -= float(ticket_price)
-            db.session.commit()
-            return jsonify({"error": str(e)}), 400
+        # Prvo otkazivanje u flight servisu, pa povrat. Povrat ide i za vec otkazanu kupovinu,
+        # pa ponovljen zahtev zavrsava povrat koji nije uspeo; knjizi se jednom po kupovini
+        idempotency_key = purchase.pop("idempotency_key", None)
+        if status != "CANCELLED":
+            purchase = PurchaseService.cancel_purchase(purchase_id)
+
+        if idempotency_key:
+            PurchaseService.refund(purchase_id, purchase_user_id, ticket_price, idempotency_key)
+        elif status != "CANCELLED":
+            # Stare kupovine bez kljuca nemaju zaduzenje u ledger-u - povrat samo pri otkazivanju
+            BalanceService.credit(purchase_user_id, ticket_price, "PURCHASE_REFUND", reference=purchase_id)
+        return jsonify(purchase), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -1,67 +1,115 @@
+import uuid
+
 import requests
-from flask import current_app
 
-from app.API.flights.FlightService import FlightService
-from app.Domain.models.User import User
 from app.Extensions import db
+from app.Services.BalanceService import BalanceService
+from app.Services.UpstreamClient import UpstreamClient, UpstreamResult
 
 
 class PurchaseService:
 
-    @staticmethod
-    def _get_base_url():
-        return current_app.config.get("FLIGHT_SERVICE_URL", "http://localhost:5050")
-
     @staticmethod
     def create_purchase(data: dict):
+        """
+        Rezervacija u flight servisu (/purchases/reserve) vraca zakljucanu cenu, pa
+        zaduzenje sa istim idempotency kljucem i potvrda (/confirm) posle koje worker
+        obradjuje kupovinu. Nepotvrdjena rezervacija se ne obradjuje, pa kupovina ne
+        moze da se zavrsi bez zaduzenja. Ponovljen zahtev sa istim kljucem vraca istu
+        kupovinu, ne zaduzuje ponovo i zavrsava prekinutu potvrdu.
+        """
         user_id = data.get("user_id")
         flight_id = data.get("flight_id")
         if not user_id or not flight_id:
             raise ValueError("Missing user_id or flight_id")
 
-        flight = FlightService.get_flight_by_id(flight_id)
-        ticket_price = flight.get("ticket_price")
-        if ticket_price is None:
-            raise ValueError("Flight price not available")
+        idempotency_key = data.get("idempotency_key") or uuid.uuid4().hex
+        payload = {**data, "idempotency_key": idempotency_key}
 
-        user = User.query.get(user_id)
-        if not user:
-            raise ValueError("User not found")
+        try:
+            response = UpstreamClient.post(
+                "/purchases/reserve",
+                json=payload
+            )
+        except requests.exceptions.RequestException as e:
+            raise ValueError(f"Failed to create purchase: {str(e)}")
 
-        if user.accountBalance < ticket_price:
-            raise ValueError("Insufficient funds")
+        if response.status_code >= 400:
+            try:
+                error_message = response.json().get("error") or response.text
+            except ValueError:
+                error_message = response.text
+            raise ValueError(f"Failed to create purchase: {error_message}")
 
-        user.accountBalance -= float(ticket_price)
-        db.session.commit()
+        reservation = response.json()
+        if reservation.get("status") in ("CANCELLED", "FAILED"):
+            # Ponovljen zahtev za otkazanu rezervaciju - vraca se eventualno zaduzenje
+            PurchaseService.refund(reservation["purchase_id"], user_id, reservation["ticket_price"], idempotency_key)
+            raise ValueError(f"Purchase {reservation.get('purchase_id')} is {reservation.get('status')}")
 
         try:
-            response = requests.post(
-                f"{PurchaseService._get_base_url()}/purchase",
-                json=data
-            )
+            BalanceService.debit(user_id, reservation["ticket_price"], "PURCHASE", reference=idempotency_key)
+        except Exception:
+            # Bilo koja greska (i nedostatak sredstava) oslobadja rezervaciju
+            db.session.rollback()
+            PurchaseService._release(reservation, user_id, idempotency_key)
+            raise
+
+        try:
+            response = UpstreamClient.post(f"/purchases/{reservation['purchase_id']}/confirm")
             response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            user.accountBalance += float(ticket_price)
-            db.session.commit()
-            raise ValueError(f"Failed to create purchase: {str(e)}")
+            PurchaseService._release(reservation, user_id, idempotency_key)
+            raise ValueError(f"Failed to confirm purchase: {str(e)}")
+
+        confirmed = response.json()
+        if confirmed.get("status") in ("CANCELLED", "FAILED"):
+            # Rezervacija je istekla ili otkazana pre potvrde
+            PurchaseService.refund(reservation["purchase_id"], user_id, reservation["ticket_price"], idempotency_key)
+            raise ValueError(f"Purchase {reservation.get('purchase_id')} is {confirmed.get('status')}")
+
+        return {**reservation, "status": confirmed.get("status", reservation.get("status"))}
+
+    @staticmethod
+    def refund(purchase_id: int, user_id: int, ticket_price, idempotency_key) -> bool:
+        """Povrat za otkazanu kupovinu samo ako je zaduzena pod idempotency_key; najvise jednom po kupovini"""
+        if not idempotency_key or not BalanceService.booked_references("PURCHASE", [idempotency_key]):
+            return False
+        return BalanceService.credit(user_id, ticket_price, "PURCHASE_REFUND", reference=purchase_id)
 
     @staticmethod
-    def get_user_purchases(user_id: int):
+    def _release(reservation: dict, user_id: int, idempotency_key: str):
+        """Otkazuje rezervaciju i vraca zaduzenje ako je ipak knjizeno - greske se samo loguju"""
         try:
-            response = requests.get(
-                f"{PurchaseService._get_base_url()}/purchases/{user_id}"
-            )
-            response.raise_for_status()
-            return response.json()
+            purchase = PurchaseService.cancel_purchase(reservation["purchase_id"])
+            if purchase.get("status") == "CANCELLED":
+                PurchaseService.refund(reservation["purchase_id"], user_id, reservation["ticket_price"], idempotency_key)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Failed to release purchase {reservation['purchase_id']}: {e}")
+
+    @staticmethod
+    def get_user_purchases(user_id: int, etag: str = None, fields: str = None) -> UpstreamResult:
+        """fields (?fields=) se prosledjuje flight servisu koji cita samo te kolone"""
+        params = {"fields": fields} if fields else None
+        try:
+            return UpstreamClient.get_json(f"/purchases/{user_id}", etag=etag, params=params)
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to fetch purchases: {str(e)}")
 
+    @staticmethod
+    def get_user_purchase_history(user_id: int, params: dict = None, etag: str = None) -> UpstreamResult:
+        """Strana istorije sa podacima leta; limit, cursor i status se prosledjuju flight servisu"""
+        try:
+            return UpstreamClient.get_json(f"/purchases/{user_id}/history", etag=etag, params=params)
+        except requests.exceptions.RequestException as e:
+            raise ValueError(f"Failed to fetch purchase history: {str(e)}")
+
     @staticmethod
     def get_purchases_by_flight(flight_id: int):
         try:
-            response = requests.get(
-                f"{PurchaseService._get_base_url()}/purchases/by-flight/{flight_id}"
+            response = UpstreamClient.get(
+                f"/purchases/by-flight/{flight_id}"
             )
             response.raise_for_status()
             return response.json()
@@ -71,8 +119,8 @@ class PurchaseService:
     @staticmethod
     def get_purchase_by_id(purchase_id: int):
         try:
-            response = requests.get(
-                f"{PurchaseService._get_base_url()}/purchases/by-id/{purchase_id}"
+            response = UpstreamClient.get(
+                f"/purchases/by-id/{purchase_id}"
             )
             response.raise_for_status()
             return response.json()
@@ -82,8 +130,8 @@ class PurchaseService:
     @staticmethod
     def cancel_purchase(purchase_id: int):
         try:
-            response = requests.put(
-                f"{PurchaseService._get_base_url()}/purchases/{purchase_id}/cancel"
+            response = UpstreamClient.put(
+                f"/purchases/{purchase_id}/cancel"
             )
             response.raise_for_status()
             return response.json()
@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt
 
 from app.API.ratings.RatingService import RatingService
+from app.Helpers.conditional import conditional_json
 
 rating_bp = Blueprint("rating_bp", __name__, url_prefix="/api/v1")
 
@@ -18,11 +20,66 @@ def create_rating():
         return jsonify({"error": str(e)}), 500
 
 
+@rating_bp.route("/ratings/bulk", methods=["POST"])
+@jwt_required()
+def create_ratings_bulk():
+    """Naknadni unos ocena prikupljenih van mreze - samo ADMIN"""
+    if get_jwt().get("role") != "ADMIN":
+        return jsonify({"error": "Access denied"}), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        return jsonify(RatingService.create_ratings_bulk(data.get("ratings"))), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @rating_bp.route("/ratings", methods=["GET"])
 def get_all_ratings():
     try:
-        ratings = RatingService.get_all_ratings()
-        return jsonify(ratings), 200
+        return conditional_json(RatingService.get_all_ratings(request.headers.get("If-None-Match")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@rating_bp.route("/ratings/flights/<int:flight_id>/summary", methods=["GET"])
+def get_flight_rating_summary(flight_id: int):
+    try:
+        return conditional_json(RatingService.get_flight_rating_summary(
+            flight_id,
+            request.headers.get("If-None-Match")
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@rating_bp.route("/ratings/airlines/<int:airline_id>/summary", methods=["GET"])
+def get_airline_rating_summary(airline_id: int):
+    try:
+        return conditional_json(RatingService.get_airline_rating_summary(
+            airline_id,
+            request.headers.get("If-None-Match")
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@rating_bp.route("/ratings/leaderboard/<scope>", methods=["GET"])
+def get_rating_leaderboard(scope: str):
+    try:
+        return conditional_json(RatingService.get_rating_leaderboard(
+            scope,
+            request.args.to_dict(),
+            request.headers.get("If-None-Match")
+        ))
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
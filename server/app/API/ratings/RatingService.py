@@ -1,18 +1,15 @@
 import requests
-from flask import current_app
 
+from app.Services.UpstreamClient import UpstreamClient, UpstreamResult
 
-class RatingService:
 
-    @staticmethod
-    def _get_base_url():
-        return current_app.config.get("FLIGHT_SERVICE_URL", "http://localhost:5051")
+class RatingService:
 
     @staticmethod
     def create_rating(data: dict):
         try:
-            response = requests.post(
-                f"{RatingService._get_base_url()}/rating",
+            response = UpstreamClient.post(
+                "/rating",
                 json=data
             )
             if response.status_code >= 400:
@@ -27,12 +24,50 @@ class RatingService:
             raise ValueError(f"Failed to create rating: {str(e)}")
 
     @staticmethod
-    def get_all_ratings():
+    def create_ratings_bulk(ratings: list) -> dict:
+        """Ocene prikupljene van mreze - flight servis ih proverava i upisuje u jednoj grupi"""
         try:
-            response = requests.get(
-                f"{RatingService._get_base_url()}/ratings"
+            response = UpstreamClient.post(
+                "/ratings/bulk",
+                json={"ratings": ratings}
             )
-            response.raise_for_status()
+            if response.status_code >= 400:
+                try:
+                    error_message = response.json().get("error") or response.text
+                except ValueError:
+                    error_message = response.text
+                raise ValueError(f"Failed to create ratings: {error_message}")
             return response.json()
+        except requests.exceptions.RequestException as e:
+            raise ValueError(f"Failed to create ratings: {str(e)}")
+
+    @staticmethod
+    def get_all_ratings(etag: str = None) -> UpstreamResult:
+        """etag je If-None-Match klijenta - prosledjuje se, pa flight servis moze da vrati 304"""
+        try:
+            return UpstreamClient.get_json("/ratings", etag=etag)
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Failed to fetch ratings: {str(e)}")
+
+    @staticmethod
+    def get_flight_rating_summary(flight_id: int, etag: str = None) -> UpstreamResult:
+        """Prosek i raspodela ocena leta iz agregata flight servisa"""
+        try:
+            return UpstreamClient.get_json(f"/ratings/flights/{flight_id}/summary", etag=etag)
+        except requests.exceptions.RequestException as e:
+            raise ValueError(f"Failed to fetch rating summary: {str(e)}")
+
+    @staticmethod
+    def get_airline_rating_summary(airline_id: int, etag: str = None) -> UpstreamResult:
+        try:
+            return UpstreamClient.get_json(f"/ratings/airlines/{airline_id}/summary", etag=etag)
+        except requests.exceptions.RequestException as e:
+            raise ValueError(f"Failed to fetch rating summary: {str(e)}")
+
+    @staticmethod
+    def get_rating_leaderboard(scope: str, params: dict = None, etag: str = None) -> UpstreamResult:
+        """Top-K aviokompanija ili relacija (scope "airlines" / "routes"); limit i min_count se prosledjuju"""
+        try:
+            return UpstreamClient.get_json(f"/ratings/leaderboard/{scope}", etag=etag, params=params)
+        except requests.exceptions.RequestException as e:
+            raise ValueError(f"Failed to fetch rating leaderboard: {str(e)}")
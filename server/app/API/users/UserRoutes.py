@@ -7,6 +7,7 @@ from werkzeug.utils import secure_filename
 
 from app.API.users.UserService import UserService
 from app.Helpers.authorization import require_self_or_admin, require_admin
+from app.Helpers.fields import parse_fields
 
 users_bp = Blueprint("users", __name__, url_prefix="/api/v1/users")
 
@@ -15,8 +16,13 @@ users_bp = Blueprint("users", __name__, url_prefix="/api/v1/users")
 def get_all_users():
     try:
         require_admin()
+        fields = parse_fields(request.args.get("fields"), UserService.FIELDS)
+        if fields:
+            return jsonify(UserService.get_all_users_fields(fields)), 200
         users = UserService.get_all_users()
         return jsonify([user.model_dump() for user in users]), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
 
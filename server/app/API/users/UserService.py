@@ -1,21 +1,37 @@
-import json
-import os
 from typing import Optional
 
 from app.Extensions import db
 from app.Domain.models.User import User
 from app.Domain.DTOs import UserDTO
 from app.Domain.enums.UserRole import UserRole
+from app.Services.AdminRegistry import AdminRegistry
+from app.Services.BalanceService import BalanceService
 from app.Services.EmailService import EmailService
 from app.Services.UserMailTemplates import role_changed_body
 
 class UserService:
+    # Dozvoljena polja za ?fields= - isti nazivi kao u UserDTO (i kolone User modela)
+    FIELDS = tuple(UserDTO.model_fields)
 
     @staticmethod
     def get_all_users():
         users = User.query.all()
         return [UserService._to_dto(user) for user in users]
 
+    @staticmethod
+    def get_all_users_fields(fields: list) -> list:
+        """Samo trazene kolone, bez ORM objekata i DTO-a po korisniku"""
+        rows = db.session.query(*[getattr(User, name) for name in fields]).all()
+        users = []
+        for row in rows:
+            data = row._asdict()
+            if "role" in data:
+                data["role"] = row.role.value
+            if data.get("dateOfBirth") is not None:
+                data["dateOfBirth"] = row.dateOfBirth.isoformat()
+            users.append(data)
+        return users
+
     @staticmethod
     def get_user_by_id(user_id: int):
         user = User.query.get(user_id)
@@ -51,7 +67,8 @@ class UserService:
                 EmailService.send(
                     to=user.email,
                     subject="🔔 Promenjena uloga na nalogu",
-                    body=role_changed_body(user.name, old_role, user.role.value)
+                    body=role_changed_body(user.name, old_role, user.role.value),
+                    digest=True
                 )
             except Exception as e:
                 print(f"Failed to send role change email: {e}")
@@ -68,7 +85,7 @@ class UserService:
             raise ValueError("User not found")
         
         # Update allowed fields
-        allowed_fields = ['name', 'lastName', 'dateOfBirth', 'gender', 'state', 'street', 'number', 'profileImage', 'accountBalance']
+        allowed_fields = ['name', 'lastName', 'dateOfBirth', 'gender', 'state', 'street', 'number', 'profileImage']
         for field in allowed_fields:
             if field in data:
                 # Convert empty strings to None for optional fields
@@ -78,6 +95,16 @@ class UserService:
                 setattr(user, field, value)
         
         db.session.commit()
+
+        # Stanje se menja samo kroz BalanceService (atomicno + stavka u balance_ledger)
+        if data.get("accountBalance") is not None:
+            delta = BalanceService.to_amount(data["accountBalance"]) - BalanceService.to_amount(user.accountBalance)
+            if delta > 0:
+                BalanceService.credit(user.id, delta, "BALANCE_ADJUSTMENT")
+            elif delta < 0:
+                BalanceService.debit(user.id, -delta, "BALANCE_ADJUSTMENT")
+            db.session.refresh(user)
+
         return UserService._to_dto(user)
 
     @staticmethod
@@ -99,14 +126,7 @@ class UserService:
 
     @staticmethod
     def _get_admin_by_id(user_id: int) -> Optional[UserDTO]:
-        admins_path = os.path.join(os.getcwd(), "app", "Config", "admins.json")
-        if not os.path.exists(admins_path):
-            return None
-
-        with open(admins_path, "r") as file:
-            admins = json.load(file)
-
-        admin = next((item for item in admins if item.get("id") == user_id), None)
+        admin = AdminRegistry.by_id(user_id)
         if not admin:
             return None
 
@@ -24,7 +24,22 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(5 * 1024 * 1024)))
     ALLOWED_IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
     FLIGHT_SERVICE_URL = os.getenv("FLIGHT_SERVICE_URL", "http://localhost:5051")
+    # UpstreamClient - pool keep-alive konekcija ka flight servisu, timeout-i (sekunde) i ponavljanja
+    UPSTREAM_POOL_CONNECTIONS = int(os.getenv("UPSTREAM_POOL_CONNECTIONS", "4"))
+    UPSTREAM_POOL_MAXSIZE = int(os.getenv("UPSTREAM_POOL_MAXSIZE", "32"))
+    UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "2"))
+    UPSTREAM_READ_TIMEOUT = float(os.getenv("UPSTREAM_READ_TIMEOUT", "10"))
+    UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", "2"))
+    UPSTREAM_RETRY_BACKOFF = float(os.getenv("UPSTREAM_RETRY_BACKOFF", "0.1"))
+    # Kes odgovora za letove i aviokompanije (0 = iskljucen) i pracenje dogadjaja flight servisa
+    GATEWAY_CACHE_TTL_SECONDS = float(os.getenv("GATEWAY_CACHE_TTL_SECONDS", "30"))
+    GATEWAY_CACHE_MAX_ENTRIES = int(os.getenv("GATEWAY_CACHE_MAX_ENTRIES", "512"))
+    FLIGHT_EVENTS_ENABLED = os.getenv("FLIGHT_EVENTS_ENABLED", "true").lower() == "true"
     SOCKETIO_CORS_ALLOWED_ORIGINS = os.getenv("SOCKETIO_CORS_ALLOWED_ORIGINS", "*")
+    # Kompresija odgovora (gzip, brotli ako je instaliran) iznad praga u bajtovima
+    COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
 
     MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
     MAIL_PORT = int(os.getenv("MAIL_PORT", "587"))
@@ -32,4 +47,28 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", MAIL_USERNAME)
-    MAIL_ENABLED = os.getenv("MAIL_ENABLED", "true")
\ No newline at end of file
+    MAIL_ENABLED = os.getenv("MAIL_ENABLED", "true")
+    # Outbox - mejlove salje EmailSender u pozadini preko jedne SMTP konekcije
+    MAIL_OUTBOX_BATCH_SIZE = int(os.getenv("MAIL_OUTBOX_BATCH_SIZE", "50"))
+    MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("MAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+    MAIL_SMTP_IDLE_SECONDS = float(os.getenv("MAIL_SMTP_IDLE_SECONDS", "30"))
+    MAIL_SMTP_TIMEOUT = float(os.getenv("MAIL_SMTP_TIMEOUT", "10"))
+    # Digest - obavestenja o statusu letova i ulogama skupljena po primaocu u jedan mejl
+    MAIL_DIGEST_ENABLED = os.getenv("MAIL_DIGEST_ENABLED", "false").lower() == "true"
+    MAIL_DIGEST_WINDOW_SECONDS = int(os.getenv("MAIL_DIGEST_WINDOW_SECONDS", "300"))
+    # Blokada prijava po IP-u (tabela blocked_ip_mac) i in-process kes ispred nje
+    LOGIN_MAX_ATTEMPTS = int(os.getenv("LOGIN_MAX_ATTEMPTS", "3"))
+    LOGIN_LOCK_SECONDS = int(os.getenv("LOGIN_LOCK_SECONDS", "60"))
+    LOGIN_ATTEMPT_WINDOW_SECONDS = int(os.getenv("LOGIN_ATTEMPT_WINDOW_SECONDS", "900"))
+    LOGIN_THROTTLE_CACHE_SECONDS = float(os.getenv("LOGIN_THROTTLE_CACHE_SECONDS", "2"))
+    LOGIN_THROTTLE_CACHE_MAX_ENTRIES = int(os.getenv("LOGIN_THROTTLE_CACHE_MAX_ENTRIES", "10000"))
+    LOGIN_THROTTLE_SWEEP_SECONDS = int(os.getenv("LOGIN_THROTTLE_SWEEP_SECONDS", "60"))
+    # Admini iz admins.json - fajl se ponovo cita samo kad mu se promeni mtime (provera najvise jednom u N sekundi)
+    ADMINS_FILE = os.getenv("ADMINS_FILE", os.path.join(BASE_DIR, "app", "Config", "admins.json"))
+    ADMINS_RELOAD_CHECK_SECONDS = float(os.getenv("ADMINS_RELOAD_CHECK_SECONDS", "2"))
+    # Hesiranje lozinki (werkzeug metod i duzina soli) van eventlet petlje, najvise N istovremeno
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_WAITING = int(os.getenv("PASSWORD_HASH_MAX_WAITING", "64"))
+    PASSWORD_HASH_POOL_ENABLED = os.getenv("PASSWORD_HASH_POOL_ENABLED", "true").lower() == "true"
\ No newline at end of file
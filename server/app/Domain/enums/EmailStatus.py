@@ -0,0 +1,7 @@
+import enum
+
+class EmailStatus(enum.Enum):
+    QUEUED = "QUEUED"       #Ceka slanje
+    SENDING = "SENDING"     #EmailSender ga salje
+    SENT = "SENT"           #Poslat
+    FAILED = "FAILED"       #Iscrpljeni pokusaji
@@ -1,3 +1,4 @@
 from .UserRole import UserRole
+from .EmailStatus import EmailStatus
 
-__all__ = ['UserRole']
\ No newline at end of file
+__all__ = ['UserRole', 'EmailStatus']
\ No newline at end of file
@@ -0,0 +1,17 @@
+from app.Extensions import db
+from datetime import datetime
+
+class BalanceLedger(db.Model):
+    __tablename__ = 'balance_ledger'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    amount = db.Column(db.Numeric(12, 2), nullable=False)  # negativno = zaduzenje, pozitivno = uplata
+    reason = db.Column(db.String(30), nullable=False)      # PURCHASE, PURCHASE_REFUND, FLIGHT_CANCEL_REFUND...
+    reference = db.Column(db.String(64), nullable=True)    # id kupovine/leta na koji se stavka odnosi
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Isti povrat za istu kupovinu ne moze da se upise dva puta
+    __table_args__ = (
+        db.UniqueConstraint('reason', 'reference', name='uq_balance_ledger_reason_reference'),
+    )
@@ -0,0 +1,23 @@
+from app.Extensions import db
+from datetime import datetime
+from app.Domain.enums.EmailStatus import EmailStatus
+
+class EmailOutbox(db.Model):
+    __tablename__ = 'email_outbox'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.Enum(EmailStatus), nullable=False, default=EmailStatus.QUEUED)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # backoff - ne slati pre ovoga
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    digest = db.Column(db.Boolean, nullable=False, default=False)  # spaja se sa ostalim obavestenjima primaoca
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_available', 'status', 'available_at'),
+    )
@@ -1,4 +1,6 @@
 from .User import User
 from .BlockedIPMac import BlockedIPMac
+from .BalanceLedger import BalanceLedger
+from .EmailOutbox import EmailOutbox
 
-__all__ = ['User', 'BlockedIPMac', 'Flight', 'Airline']
\ No newline at end of file
+__all__ = ['User', 'BlockedIPMac', 'BalanceLedger', 'EmailOutbox', 'Flight', 'Airline']
\ No newline at end of file
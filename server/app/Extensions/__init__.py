@@ -2,5 +2,7 @@ from .db import db
 from .jwt import jwt
 from .cors import cors
 from .socketio import socketio
+from .compression import compress
+from .json_provider import FastJSONProvider
 
-__all__ = ['db', 'jwt', 'cors', 'socketio']
\ No newline at end of file
+__all__ = ['db', 'jwt', 'cors', 'socketio', 'compress', 'FastJSONProvider']
\ No newline at end of file
@@ -0,0 +1,87 @@
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # opciona zavisnost - bez nje samo gzip
+    brotli = None
+
+class Compress:
+    """
+    Pregovarana gzip/brotli kompresija odgovora iznad COMPRESS_MIN_BYTES.
+
+    Kompresuju se samo tekstualni/JSON odgovori; vec kodirani odgovori
+    (npr. unapred gzip-ovani) se ne diraju. Jak ETag kompresovanog
+    odgovora postaje slab, jer bajtovi vise nisu isti kao u identity
+    varijanti - If-None-Match se poredi slabo, pa 304 i dalje radi.
+    """
+    COMPRESSIBLE_MIMETYPES = frozenset({
+        "application/json",
+        "application/javascript",
+        "text/html",
+        "text/plain",
+        "text/css",
+        "text/javascript",
+    })
+
+    def __init__(self):
+        self.min_bytes = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 5
+
+    def init_app(self, app):
+        self.min_bytes = app.config.get("COMPRESS_MIN_BYTES", self.min_bytes)
+        self.gzip_level = app.config.get("COMPRESS_GZIP_LEVEL", self.gzip_level)
+        self.brotli_quality = app.config.get("COMPRESS_BROTLI_QUALITY", self.brotli_quality)
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        if response.headers.get("Content-Encoding"):
+            self._weaken_etag(response)
+            return response
+
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.mimetype not in self.COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = self._choose_encoding()
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_bytes:
+            return response
+
+        if encoding == "br":
+            data = brotli.compress(data, quality=self.brotli_quality)
+        else:
+            data = gzip.compress(data, compresslevel=self.gzip_level)
+
+        response.set_data(data)
+        response.headers["Content-Encoding"] = encoding
+        self._weaken_etag(response)
+        return response
+
+    @staticmethod
+    def _choose_encoding():
+        accepted = request.accept_encodings
+        if brotli is not None and accepted.quality("br") > 0:
+            return "br"
+        if accepted.quality("gzip") > 0:
+            return "gzip"
+        return None
+
+    @staticmethod
+    def _weaken_etag(response):
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+compress = Compress()
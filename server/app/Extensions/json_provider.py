@@ -0,0 +1,55 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # opciona zavisnost - bez nje ostaje standardni json
+    orjson = None
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider na orjson-u, sa istim izlazom kao podrazumevani Flask provider:
+    sortirani kljucevi, datetime kao HTTP datum (kroz DefaultJSONProvider.default),
+    Decimal/UUID kao string. Enum se serijalizuje nativno po vrednosti.
+    Ako orjson nije instaliran ili poziv trazi opcije koje orjson nema, radi
+    standardni json.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        data = self._orjson_dumps(obj, kwargs)
+        if data is None:
+            return super().dumps(obj, **kwargs)
+        return data.decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        data = self._orjson_dumps(obj, {"indent": 2} if pretty else {})
+        if data is None:
+            return super().response(obj)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+
+    def _orjson_dumps(self, obj, kwargs: dict):
+        """bytes ili None kad treba pasti na standardni json"""
+        if orjson is None:
+            return None
+
+        kwargs = dict(kwargs)
+        kwargs.pop("separators", None)   # orjson je uvek kompaktan
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.pop("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.pop("indent", None):
+            option |= orjson.OPT_INDENT_2
+        if kwargs:
+            return None
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            # npr. int veci od 64 bita - standardni json ga podrzava
+            return None
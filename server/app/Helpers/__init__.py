@@ -1,5 +1,6 @@
-from .hasher import hash_password, verify_password
+from .hasher import hash_password, verify_password, needs_rehash
 from .jwt_utils import create_access_token, get_current_user_id, get_current_user_role
 from .authorization import require_admin, require_self_or_admin, require_manager
+from .fields import parse_fields
 
-__all__ = [ "hash_password", "verify_password", "create_access_token", "get_current_user_id", "get_current_user_role" ]
\ No newline at end of file
+__all__ = [ "hash_password", "verify_password", "needs_rehash", "create_access_token", "get_current_user_id", "get_current_user_role", "parse_fields" ]
\ No newline at end of file
@@ -0,0 +1,20 @@
+from flask import Response, jsonify, request
+from werkzeug.http import unquote_etag
+
+from app.Services.UpstreamClient import UpstreamResult
+
+def conditional_json(result: UpstreamResult):
+    """
+    JSON odgovor sa ETag-om flight servisa; 304 ako klijent vec ima tu verziju.
+    Cache-Control: no-cache tera browser da uvek revalidira, pa sam salje If-None-Match.
+    Poredjenje je slabo - kompresovani odgovori nose W/ varijantu istog ETag-a.
+    """
+    if result.etag and (result.not_modified or request.if_none_match.contains_weak(unquote_etag(result.etag)[0])):
+        response = Response(status=304)
+    else:
+        response = jsonify(result.body)
+
+    if result.etag:
+        response.headers["ETag"] = result.etag
+        response.headers["Cache-Control"] = "no-cache"
+    return response
@@ -1,7 +1,11 @@
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.Services.PasswordHasher import PasswordHasher
 
+# Hesiranje ide kroz PasswordHasher - van eventlet petlje, sa ogranicenim brojem istovremenih
 def hash_password(password: str) -> str:
-    return generate_password_hash(password)
+    return PasswordHasher.hash(password)
 
 def verify_password(hashed_password: str, password: str) -> bool:
-    return check_password_hash(hashed_password, password)
\ No newline at end of file
+    return PasswordHasher.verify(hashed_password, password)
+
+def needs_rehash(hashed_password: str) -> bool:
+    return PasswordHasher.needs_rehash(hashed_password)
\ No newline at end of file
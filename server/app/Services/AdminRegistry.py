@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+import time
+
+class AdminRegistry:
+    """
+    Admini iz app/Config/admins.json, ucitani jednom i indeksirani po email-u i id-u.
+
+    Fajl se ponovo cita samo kad mu se promene mtime ili velicina, a i to se
+    proverava najvise jednom u check_seconds - prijava i citanje profila admina
+    na vrucem putu ne rade nikakav I/O nad fajlom. Indeksi se zamenjuju celi,
+    pa citaoci ne zakljucavaju nista.
+    """
+    path = os.path.join(os.getcwd(), "app", "Config", "admins.json")
+    check_seconds = 2.0
+
+    _state = (None, {}, {}, [])     # (otisak fajla, po email-u, po id-u, lista)
+    _next_check = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls.path = app.config.get("ADMINS_FILE", cls.path)
+        cls.check_seconds = app.config.get("ADMINS_RELOAD_CHECK_SECONDS", cls.check_seconds)
+        with cls._lock:
+            cls._state = (None, {}, {}, [])
+            cls._next_check = 0.0
+
+    @classmethod
+    def all(cls) -> list:
+        cls._refresh()
+        return cls._state[3]
+
+    @classmethod
+    def by_email(cls, email: str):
+        cls._refresh()
+        return cls._state[1].get(email)
+
+    @classmethod
+    def by_id(cls, admin_id: int):
+        cls._refresh()
+        return cls._state[2].get(admin_id)
+
+    @classmethod
+    def _refresh(cls):
+        if time.monotonic() < cls._next_check:
+            return
+
+        with cls._lock:
+            if time.monotonic() < cls._next_check:
+                return
+            cls._next_check = time.monotonic() + cls.check_seconds
+
+            try:
+                stat = os.stat(cls.path)
+                fingerprint = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                fingerprint = None
+            if fingerprint == cls._state[0] and fingerprint is not None:
+                return
+
+            admins = []
+            if fingerprint is not None:
+                try:
+                    with open(cls.path, "r") as f:
+                        admins = json.load(f)
+                except (OSError, ValueError) as e:
+                    # Fajl se upravo prepisuje - zadrzi stare admine, pokusaj ponovo sledeci put
+                    print(f"Failed to load admins from {cls.path}: {e}")
+                    return
+
+            by_email = {}
+            by_id = {}
+            for admin in admins:
+                # Prvi unos pobedjuje - isto kao ranije linearno trazenje
+                if admin.get("email") is not None:
+                    by_email.setdefault(admin["email"], admin)
+                if admin.get("id") is not None:
+                    by_id.setdefault(admin["id"], admin)
+            cls._state = (fingerprint, by_email, by_id, admins)
@@ -0,0 +1,158 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import case, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from app.Extensions import db
+from app.Domain.models.User import User
+from app.Domain.models.BalanceLedger import BalanceLedger
+
+CENT = Decimal("0.01")
+
+class BalanceService:
+    """
+    Sve promene accountBalance idu kroz ovaj servis.
+
+    Zaduzenje je jedan uslovni UPDATE (accountBalance >= iznos), pa konkurentne
+    kupovine istog korisnika ne mogu da izgube izmenu niti odu u minus.
+    Svaka promena se upisuje u balance_ledger sa tacnim decimalnim iznosom.
+    """
+
+    @staticmethod
+    def to_amount(value) -> Decimal:
+        return Decimal(str(value)).quantize(CENT)
+
+    @staticmethod
+    def debit(user_id: int, amount, reason: str, reference=None) -> bool:
+        """Vraca False ako je zaduzenje sa istim (reason, reference) vec knjizeno"""
+        amount = BalanceService.to_amount(amount)
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+
+        if not BalanceService._add_entry(user_id, -amount, reason, reference):
+            return False
+
+        result = db.session.execute(
+            update(User)
+            .where(User.id == user_id, User.accountBalance >= float(amount))
+            .values(accountBalance=User.accountBalance - float(amount)),
+            execution_options={"synchronize_session": False}
+        )
+        if result.rowcount != 1:
+            db.session.rollback()
+            if not db.session.query(User.id).filter_by(id=user_id).first():
+                raise ValueError("User not found")
+            raise ValueError("Insufficient funds")
+
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def credit(user_id: int, amount, reason: str, reference=None) -> bool:
+        """Vraca False ako je uplata sa istim (reason, reference) vec knjizena"""
+        amount = BalanceService.to_amount(amount)
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+
+        if not BalanceService._add_entry(user_id, amount, reason, reference):
+            return False
+
+        result = db.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(accountBalance=User.accountBalance + float(amount)),
+            execution_options={"synchronize_session": False}
+        )
+        if result.rowcount != 1:
+            db.session.rollback()
+            raise ValueError("User not found")
+
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def credit_many(entries, reason: str) -> list:
+        """
+        Paketna uplata: entries su (reference, user_id, iznos). Sve stavke idu jednim
+        INSERT-om u ledger, a sva stanja jednim UPDATE ... CASE nad users.
+        Vec knjizene reference i nepostojeci korisnici se preskacu; vraca knjizene stavke.
+        """
+        entries = [
+            (str(reference), user_id, BalanceService.to_amount(amount))
+            for reference, user_id, amount in entries
+        ]
+        entries = [entry for entry in entries if entry[2] > 0]
+        if not entries:
+            return []
+
+        already = {
+            reference for (reference,) in db.session.query(BalanceLedger.reference).filter(
+                BalanceLedger.reason == reason,
+                BalanceLedger.reference.in_([entry[0] for entry in entries])
+            )
+        }
+        existing_users = {
+            user_id for (user_id,) in db.session.query(User.id).filter(
+                User.id.in_({entry[1] for entry in entries})
+            )
+        }
+        entries = [entry for entry in entries if entry[0] not in already and entry[1] in existing_users]
+        if not entries:
+            db.session.rollback()
+            return []
+
+        totals = defaultdict(Decimal)
+        for _, user_id, amount in entries:
+            totals[user_id] += amount
+
+        try:
+            db.session.execute(insert(BalanceLedger), [
+                {"user_id": user_id, "amount": amount, "reason": reason, "reference": reference}
+                for reference, user_id, amount in entries
+            ])
+            db.session.execute(
+                update(User)
+                .where(User.id.in_(list(totals)))
+                .values(accountBalance=User.accountBalance + case(
+                    {user_id: float(total) for user_id, total in totals.items()},
+                    value=User.id
+                )),
+                execution_options={"synchronize_session": False}
+            )
+            db.session.commit()
+        except IntegrityError:
+            # Paralelno knjizenje istih referenci - ponovi nad onim sto je preostalo
+            db.session.rollback()
+            return BalanceService.credit_many(entries, reason)
+
+        return entries
+
+    @staticmethod
+    def booked_references(reason: str, references) -> set:
+        """Reference iz references za koje postoji stavka sa datim reason"""
+        references = {str(reference) for reference in references if reference is not None}
+        if not references:
+            return set()
+        return {
+            reference for (reference,) in db.session.query(BalanceLedger.reference).filter(
+                BalanceLedger.reason == reason,
+                BalanceLedger.reference.in_(references)
+            )
+        }
+
+    @staticmethod
+    def _add_entry(user_id: int, amount: Decimal, reason: str, reference) -> bool:
+        # Stavka ide pre UPDATE-a - jedinstveni (reason, reference) cini knjizenje idempotentnim
+        reference = str(reference) if reference is not None else None
+        try:
+            db.session.add(BalanceLedger(user_id=user_id, amount=amount, reason=reason, reference=reference))
+            db.session.flush()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+
+        # Moze biti i povreda FK (nepostojeci korisnik) - duplikat je samo ako stavka zaista postoji
+        if reference is None or not BalanceLedger.query.filter_by(reason=reason, reference=reference).first():
+            raise ValueError("User not found")
+        return False
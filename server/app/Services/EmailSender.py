@@ -0,0 +1,365 @@
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.header import Header
+from email.mime.text import MIMEText
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import delete, func, or_, update
+
+from app.Extensions import db
+from app.Domain.enums.EmailStatus import EmailStatus
+from app.Domain.models.EmailOutbox import EmailOutbox
+from app.Services.UserMailTemplates import notification_digest_body
+
+class _Email(NamedTuple):
+    id: int
+    recipient: str
+    subject: str
+    body: str
+    attempts: int
+    created_at: datetime
+    digest: bool
+
+class EmailSender:
+    """
+    Pozadinska nit koja prazni tabelu email_outbox.
+
+    Preuzima do batch_size mejlova sa SELECT ... FOR UPDATE SKIP LOCKED (vise
+    procesa ne uzima iste redove) i salje ih preko jedne SMTP konekcije koja
+    ostaje otvorena i prijavljena izmedju batch-eva - STARTTLS i login se
+    placaju jednom, a ne po poruci. Konekcija se zatvara posle idle_seconds
+    bez posla ili kad je server prekine. Neuspela slanja se vracaju u red sa
+    eksponencijalnim backoff-om, a posle max_attempts mejl prelazi u FAILED.
+    Isporuka je "bar jednom": mejl preuzet od procesa koji je pao salje se ponovo.
+
+    Digest mejlovi (EmailService.send(..., digest=True) uz MAIL_DIGEST_ENABLED)
+    cekaju u redu do kraja prozora; kad prvi od njih dospe, preuzimaju se i svi
+    ostali digest mejlovi istog primaoca i salju kao jedan pregled.
+    """
+    BODY_SUBTYPE = "html"
+    MAX_BACKOFF_SECONDS = 600
+    NOOP_AFTER_SECONDS = 5      # konekcija koja je toliko mirovala proverava se pre upotrebe
+    RETENTION_DAYS = 7
+    DIGEST_SUBJECT = "🔔 Pregled obavestenja ({count})"
+
+    _thread = None
+    _running = False
+    _wakeup = threading.Event()
+
+    _batch_size = 50
+    _max_attempts = 5
+    _poll_seconds = 2
+    _idle_seconds = 30
+    _visibility_timeout = 300
+    _last_maintenance = 0
+
+    _smtp = None
+    _smtp_used_at = 0
+
+    _metrics_lock = threading.Lock()
+    _sent_total = 0
+    _failed_total = 0
+    _retried_total = 0
+    _batches_total = 0
+    _connections_opened = 0
+    _queue_seconds_total = 0.0
+    _digests_sent = 0
+    _digested_total = 0
+
+    @classmethod
+    def start(cls, app, batch_size: int = 50, max_attempts: int = 5, poll_seconds: float = 2,
+              idle_seconds: float = 30, visibility_timeout: int = 300):
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+
+        cls._batch_size = batch_size
+        cls._max_attempts = max_attempts
+        cls._poll_seconds = poll_seconds
+        cls._idle_seconds = idle_seconds
+        cls._visibility_timeout = visibility_timeout
+
+        cls._running = True
+        cls._thread = threading.Thread(target=cls._run, args=(app,), daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def stop(cls):
+        cls._running = False
+        cls._wakeup.set()
+
+    @classmethod
+    def notify(cls):
+        cls._wakeup.set()
+
+    @classmethod
+    def metrics(cls) -> dict:
+        counts = dict(
+            db.session.query(EmailOutbox.status, func.count(EmailOutbox.id))
+            .filter(EmailOutbox.status.in_([EmailStatus.QUEUED, EmailStatus.SENDING, EmailStatus.FAILED]))
+            .group_by(EmailOutbox.status)
+            .all()
+        )
+
+        with cls._metrics_lock:
+            return {
+                "batch_size": cls._batch_size,
+                "queue_depth": counts.get(EmailStatus.QUEUED, 0),
+                "sending": counts.get(EmailStatus.SENDING, 0),
+                "failed": counts.get(EmailStatus.FAILED, 0),
+                "sent_total": cls._sent_total,
+                "failed_total": cls._failed_total,
+                "retried_total": cls._retried_total,
+                "batches_total": cls._batches_total,
+                "connections_opened": cls._connections_opened,
+                "messages_per_connection": round(cls._sent_total / cls._connections_opened, 2) if cls._connections_opened else 0,
+                "avg_queue_seconds": round(cls._queue_seconds_total / cls._sent_total, 3) if cls._sent_total else 0,
+                "digests_sent": cls._digests_sent,
+                "digested_total": cls._digested_total,
+            }
+
+    @classmethod
+    def _run(cls, app):
+        while cls._running:
+            try:
+                with app.app_context():
+                    emails = cls._claim_batch()
+                    if emails:
+                        cls._deliver(emails)
+                        continue
+
+                    if cls._smtp is not None and time.monotonic() - cls._smtp_used_at >= cls._idle_seconds:
+                        cls._close()
+                    if time.monotonic() - cls._last_maintenance >= cls._visibility_timeout:
+                        cls._last_maintenance = time.monotonic()
+                        cls._maintenance()
+            except Exception as e:
+                print(f"EmailSender error: {e}")
+
+            cls._wakeup.wait(cls._poll_seconds)
+            cls._wakeup.clear()
+
+    @classmethod
+    def _claim_batch(cls):
+        now = datetime.utcnow()
+        emails = (
+            EmailOutbox.query
+            .filter(EmailOutbox.status == EmailStatus.QUEUED, EmailOutbox.available_at <= now)
+            .order_by(EmailOutbox.id)
+            .limit(cls._batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not emails:
+            db.session.rollback()
+            return []
+
+        # Ostatak digest-a istih primalaca ide u isti pregled, i pre kraja svog prozora -
+        # osim mejlova koji cekaju backoff posle neuspelog slanja
+        digest_recipients = {email.recipient for email in emails if email.digest}
+        if digest_recipients:
+            claimed_ids = [email.id for email in emails]
+            emails += (
+                EmailOutbox.query
+                .filter(
+                    EmailOutbox.status == EmailStatus.QUEUED,
+                    EmailOutbox.digest.is_(True),
+                    EmailOutbox.recipient.in_(digest_recipients),
+                    EmailOutbox.id.notin_(claimed_ids),
+                    or_(EmailOutbox.attempts == 0, EmailOutbox.available_at <= now)
+                )
+                .order_by(EmailOutbox.id)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+
+        claimed = []
+        for email in emails:
+            email.status = EmailStatus.SENDING
+            email.locked_at = now
+            email.attempts += 1
+            claimed.append(_Email(
+                email.id, email.recipient, email.subject, email.body, email.attempts, email.created_at, email.digest
+            ))
+        db.session.commit()
+        return claimed
+
+    @classmethod
+    def _deliveries(cls, emails):
+        """(mejlovi, primalac, subject, body) po poruci - digest mejlovi istog primaoca postaju jedna"""
+        deliveries = []
+        digests = {}
+        for email in emails:
+            if email.digest:
+                digests.setdefault(email.recipient, []).append(email)
+            else:
+                deliveries.append(([email], email.recipient, email.subject, email.body))
+
+        for recipient, group in digests.items():
+            if len(group) == 1:
+                deliveries.append((group, recipient, group[0].subject, group[0].body))
+                continue
+            deliveries.append((
+                group,
+                recipient,
+                cls.DIGEST_SUBJECT.format(count=len(group)),
+                notification_digest_body([(email.subject, email.body) for email in group])
+            ))
+        return deliveries
+
+    @classmethod
+    def _deliver(cls, emails):
+        sent = []
+        errors = {}
+        for group, recipient, subject, body in cls._deliveries(emails):
+            try:
+                message = cls._message(recipient, subject, body)
+                cls._connection().sendmail(message["From"], [recipient], message.as_bytes())
+                cls._smtp_used_at = time.monotonic()
+                sent += [email.id for email in group]
+                if len(group) > 1:
+                    with cls._metrics_lock:
+                        cls._digests_sent += 1
+                        cls._digested_total += len(group)
+            except Exception as e:
+                # I neispravna poruka ide u retry/FAILED - ne sme da ostane u SENDING
+                errors.update({email.id: str(e) for email in group})
+                # Prekinuta konekcija (ili greska mreze) se otvara iznova za sledecu poruku
+                if isinstance(e, smtplib.SMTPServerDisconnected) or (
+                    isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+                ):
+                    cls._close()
+
+        now = datetime.utcnow()
+        if sent:
+            db.session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(sent))
+                .values(status=EmailStatus.SENT, locked_at=None, sent_at=now, last_error=None),
+                execution_options={"synchronize_session": False}
+            )
+            db.session.commit()
+
+        if errors:
+            cls._retry_or_fail([email for email in emails if email.id in errors], errors)
+
+        sent_ids = set(sent)
+        with cls._metrics_lock:
+            cls._sent_total += len(sent)
+            cls._batches_total += 1
+            cls._queue_seconds_total += sum(
+                (now - email.created_at).total_seconds() for email in emails if email.id in sent_ids
+            )
+
+    @classmethod
+    def _retry_or_fail(cls, emails, errors: dict):
+        now = datetime.utcnow()
+        failed = [email for email in emails if email.attempts >= cls._max_attempts]
+        retried = [email for email in emails if email.attempts < cls._max_attempts]
+
+        for email in retried:
+            backoff = min(2 ** email.attempts, cls.MAX_BACKOFF_SECONDS)
+            db.session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == email.id)
+                .values(
+                    status=EmailStatus.QUEUED,
+                    locked_at=None,
+                    available_at=now + timedelta(seconds=backoff),
+                    last_error=errors[email.id]
+                ),
+                execution_options={"synchronize_session": False}
+            )
+
+        for email in failed:
+            db.session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == email.id)
+                .values(status=EmailStatus.FAILED, locked_at=None, last_error=errors[email.id]),
+                execution_options={"synchronize_session": False}
+            )
+            print(f"Failed to send email to {email.recipient}: {errors[email.id]}")
+        db.session.commit()
+
+        with cls._metrics_lock:
+            cls._retried_total += len(retried)
+            cls._failed_total += len(failed)
+
+    @classmethod
+    def _maintenance(cls):
+        """Vraca u red mejlove ciji je proces nestao usred slanja i brise stare poslate"""
+        now = datetime.utcnow()
+        db.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.status == EmailStatus.SENDING,
+                   EmailOutbox.locked_at < now - timedelta(seconds=cls._visibility_timeout))
+            .values(status=EmailStatus.QUEUED, locked_at=None),
+            execution_options={"synchronize_session": False}
+        )
+        db.session.execute(
+            delete(EmailOutbox)
+            .where(EmailOutbox.status == EmailStatus.SENT,
+                   EmailOutbox.sent_at < now - timedelta(days=cls.RETENTION_DAYS)),
+            execution_options={"synchronize_session": False}
+        )
+        db.session.commit()
+
+    @classmethod
+    def _connection(cls) -> smtplib.SMTP:
+        """Otvorena i prijavljena konekcija; postojeca koja je mirovala proverava se NOOP-om"""
+        if cls._smtp is not None:
+            if time.monotonic() - cls._smtp_used_at < cls.NOOP_AFTER_SECONDS:
+                return cls._smtp
+            try:
+                if cls._smtp.noop()[0] == 250:
+                    return cls._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            cls._close()
+
+        config = current_app.config
+        host = config.get("MAIL_SERVER")
+        port = int(config.get("MAIL_PORT", 587))
+        timeout = config.get("MAIL_SMTP_TIMEOUT", 10)
+
+        if cls._flag(config.get("MAIL_USE_SSL", False)):
+            smtp = smtplib.SMTP_SSL(host, port, timeout=timeout)
+        else:
+            smtp = smtplib.SMTP(host, port, timeout=timeout)
+            if cls._flag(config.get("MAIL_USE_TLS", True)):
+                smtp.starttls()
+        if config.get("MAIL_USERNAME"):
+            smtp.login(config.get("MAIL_USERNAME"), config.get("MAIL_PASSWORD"))
+
+        cls._smtp = smtp
+        cls._smtp_used_at = time.monotonic()
+        with cls._metrics_lock:
+            cls._connections_opened += 1
+        return smtp
+
+    @classmethod
+    def _close(cls):
+        smtp, cls._smtp = cls._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    @classmethod
+    def _message(cls, to: str, subject: str, body: str) -> MIMEText:
+        msg = MIMEText(body, cls.BODY_SUBTYPE, "utf-8")
+        msg["Subject"] = Header(subject, "utf-8")   # emoji/dijakritici u naslovu
+        msg["From"] = current_app.config.get("MAIL_DEFAULT_SENDER")
+        msg["To"] = to
+        return msg
+
+    @staticmethod
+    def _flag(value) -> bool:
+        # podrži i bool i "true"/"false"
+        if isinstance(value, str):
+            return value.strip().lower() == "true"
+        return bool(value)
@@ -1,26 +1,59 @@
-import smtplib
-from email.mime.text import MIMEText
+from datetime import datetime, timedelta
 from flask import current_app
+from app.Extensions import db
+from app.Domain.enums.EmailStatus import EmailStatus
+from app.Domain.models.EmailOutbox import EmailOutbox
+from app.Services.EmailSender import EmailSender
 
 class EmailService:
+    """
+    Mejlovi se ne salju u zahtevu: upisuju se u email_outbox (posebnim commit-om,
+    posle izmene zbog koje se salju), a salje ih EmailSender u pozadini.
+    Sa digest=True i ukljucenim MAIL_DIGEST_ENABLED obavestenje ceka
+    MAIL_DIGEST_WINDOW_SECONDS i salje se u pregledu sa ostalima za istog primaoca.
+    """
+
     @staticmethod
-    def send(to: str, subject: str, body: str):
+    def _enabled() -> bool:
         # ako u config staviš bool, ovo radi i za bool i za string
         enabled = current_app.config.get("MAIL_ENABLED", True)
         if isinstance(enabled, str):
             enabled = enabled.lower() == "true"
-        if not enabled:
-            return
+        return enabled
+
+    @staticmethod
+    def _digest_enabled() -> bool:
+        enabled = current_app.config.get("MAIL_DIGEST_ENABLED", False)
+        if isinstance(enabled, str):
+            enabled = enabled.lower() == "true"
+        return enabled
+
+    @staticmethod
+    def send(to: str, subject: str, body: str, digest: bool = False):
+        EmailService.send_many([(to, subject, body)], digest)
 
-        msg = MIMEText(body, "html", "utf-8")
-        msg["Subject"] = subject
-        msg["From"] = current_app.config.get("MAIL_DEFAULT_SENDER")
-        msg["To"] = to
+    @staticmethod
+    def send_many(messages, digest: bool = False):
+        """Upisuje (to, subject, body) poruke u outbox jednim commit-om"""
+        if not messages or not EmailService._enabled():
+            return
 
-        server = smtplib.SMTP(current_app.config.get("MAIL_SERVER"), int(current_app.config.get("MAIL_PORT", 587)))
-        if str(current_app.config.get("MAIL_USE_TLS", "true")).lower() == "true":
-            server.starttls()
+        digest = digest and EmailService._digest_enabled()
+        available_at = datetime.utcnow()
+        if digest:
+            available_at += timedelta(seconds=current_app.config.get("MAIL_DIGEST_WINDOW_SECONDS", 300))
 
-        server.login(current_app.config.get("MAIL_USERNAME"), current_app.config.get("MAIL_PASSWORD"))
-        server.sendmail(msg["From"], [to], msg.as_string())
-        server.quit()
\ No newline at end of file
+        db.session.add_all([
+            EmailOutbox(
+                recipient=to,
+                subject=subject,
+                body=body,
+                status=EmailStatus.QUEUED,
+                attempts=0,
+                digest=digest,
+                available_at=available_at
+            )
+            for to, subject, body in messages
+        ])
+        db.session.commit()
+        EmailSender.notify()
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import socketio
+
+from app.API.flights.FlightService import FlightService
+from app.Services.ResponseCache import ResponseCache
+
+class FlightEventListener:
+    """
+    Socket.IO klijent ka flight servisu koji brise gateway kes na promene letova.
+
+    Prelazi statusa (FlightStatusWatcher) i admin akcije se desavaju u flight
+    servisu i ne prolaze kroz upise gateway-a, pa se kes ovde cisti na njegove
+    dogadjaje. Dok veza ne postoji ceo kes se brise na (re)konekciji, a
+    zastarelost u medjuvremenu ogranicava TTL.
+    """
+    INVALIDATING_EVENTS = (
+        "flight_status_changed",
+        "flight_approved",
+        "flight_rejected",
+        "flight_cancelled",
+        "flight_deleted",
+    )
+    RECONNECT_SECONDS = 5
+
+    _thread = None
+    _client = None
+    _running = False
+
+    @classmethod
+    def start(cls, url: str):
+        if cls._thread and cls._thread.is_alive():
+            return
+
+        client = socketio.Client(reconnection=True, reconnection_delay_max=30)
+        client.on("connect", cls._on_connect)
+        for event in cls.INVALIDATING_EVENTS:
+            client.on(event, cls._on_flight_event)
+
+        cls._client = client
+        cls._running = True
+        cls._thread = threading.Thread(target=cls._run, args=(url,), daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def stop(cls):
+        cls._running = False
+        if cls._client is not None:
+            cls._client.disconnect()
+
+    @classmethod
+    def _run(cls, url: str):
+        # Klijent se sam rekonektuje posle prve uspesne veze; ovde se ponavlja samo prvi connect
+        while cls._running:
+            try:
+                cls._client.connect(url)
+                cls._client.wait()
+            except Exception as e:
+                print(f"FlightEventListener error: {e}")
+            time.sleep(cls.RECONNECT_SECONDS)
+
+    @staticmethod
+    def _on_connect():
+        # Dogadjaji propusteni dok veza nije postojala - kes krece od nule
+        ResponseCache.invalidate_all()
+
+    @staticmethod
+    def _on_flight_event(data=None):
+        FlightService.invalidate_cache()
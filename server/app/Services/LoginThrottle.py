@@ -0,0 +1,219 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.Extensions import db
+from app.Domain.models.BlockedIPMac import BlockedIPMac
+
+class LoginThrottle:
+    """
+    Brojanje neuspelih prijava i blokada po IP adresi u tabeli blocked_ip_mac.
+
+    Stanje je u bazi, pa je blokada ista za sve gunicorn worker-e i prezivljava
+    restart. Neuspeh se broji atomskim UPDATE-om (red se pravi pri prvom
+    neuspehu), a posle max_attempts neuspeha u prozoru IP se blokira na
+    lock_seconds. Ispred baze je ogranicen in-process kes: blokiran IP se do
+    isteka blokade odbija bez upita, a "nije blokiran" se pamti cache_seconds.
+    Istekli redovi i unosi kesa brisu se usput, najvise jednom u sweep_seconds.
+    """
+    max_attempts = 3
+    lock_seconds = 60
+    window_seconds = 900
+    cache_seconds = 2.0
+    cache_max_entries = 10000
+    sweep_seconds = 60
+
+    _cache = OrderedDict()   # ip -> (istice_u monotonic, red_postoji, locked_until)
+    _lock = threading.Lock()
+    _sweep_lock = threading.Lock()
+    _next_sweep = 0.0
+    _metrics = {"checks": 0, "cache_hits": 0, "rejected": 0, "failures": 0, "locks": 0, "swept": 0}
+    _metrics_lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls.max_attempts = app.config.get("LOGIN_MAX_ATTEMPTS", cls.max_attempts)
+        cls.lock_seconds = app.config.get("LOGIN_LOCK_SECONDS", cls.lock_seconds)
+        cls.window_seconds = app.config.get("LOGIN_ATTEMPT_WINDOW_SECONDS", cls.window_seconds)
+        cls.cache_seconds = app.config.get("LOGIN_THROTTLE_CACHE_SECONDS", cls.cache_seconds)
+        cls.cache_max_entries = app.config.get("LOGIN_THROTTLE_CACHE_MAX_ENTRIES", cls.cache_max_entries)
+        cls.sweep_seconds = app.config.get("LOGIN_THROTTLE_SWEEP_SECONDS", cls.sweep_seconds)
+        with cls._lock:
+            cls._cache = OrderedDict()
+
+    @classmethod
+    def locked_until(cls, ip: str):
+        """Kraj blokade za IP ili None ako nije blokiran"""
+        cls._count("checks")
+        cls._sweep()
+
+        now = datetime.utcnow()
+        entry = cls._cached(ip)
+        if entry is None:
+            row = db.session.execute(
+                select(BlockedIPMac.locked_until).where(BlockedIPMac.ip_address == ip)
+            ).first()
+            entry = cls._remember(ip, row is not None, row.locked_until if row else None)
+        else:
+            cls._count("cache_hits")
+
+        locked_until = entry[2]
+        if locked_until is not None and locked_until > now:
+            cls._count("rejected")
+            return locked_until
+        return None
+
+    @classmethod
+    def register_failure(cls, ip: str):
+        """Broji neuspelu prijavu; vraca kraj blokade ako je ovim neuspehom (ili ranije) IP blokiran"""
+        cls._count("failures")
+        now = datetime.utcnow()
+        window_start = now - timedelta(seconds=cls.window_seconds)
+
+        # Broji se samo dok IP nije blokiran; neuspesi stariji od prozora se ne racunaju.
+        # failed_attempts pre updated_at: MySQL racuna SET s leva na desno nad vec izmenjenim vrednostima
+        statement = (
+            update(BlockedIPMac)
+            .where(
+                BlockedIPMac.ip_address == ip,
+                or_(BlockedIPMac.locked_until.is_(None), BlockedIPMac.locked_until <= now)
+            )
+            .ordered_values(
+                (BlockedIPMac.failed_attempts, case(
+                    (BlockedIPMac.updated_at < window_start, 1),
+                    else_=BlockedIPMac.failed_attempts + 1
+                )),
+                (BlockedIPMac.updated_at, now)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if not db.session.execute(statement).rowcount:
+            row = db.session.execute(
+                select(BlockedIPMac.locked_until).where(BlockedIPMac.ip_address == ip)
+            ).first()
+            if row is not None and row.locked_until is not None and row.locked_until > now:
+                db.session.commit()
+                cls._remember(ip, True, row.locked_until)
+                return row.locked_until
+
+            try:
+                with db.session.begin_nested():
+                    db.session.add(BlockedIPMac(ip_address=ip, failed_attempts=1, created_at=now, updated_at=now))
+            except IntegrityError:
+                # Drugi worker je upravo napravio red za isti IP
+                db.session.execute(statement)
+
+        attempts = db.session.execute(
+            select(BlockedIPMac.failed_attempts).where(BlockedIPMac.ip_address == ip)
+        ).scalar() or 0
+
+        locked_until = None
+        if attempts >= cls.max_attempts:
+            locked_until = now + timedelta(seconds=cls.lock_seconds)
+            db.session.execute(
+                update(BlockedIPMac)
+                .where(BlockedIPMac.ip_address == ip)
+                .values(locked_until=locked_until, failed_attempts=0, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            cls._count("locks")
+        db.session.commit()
+
+        cls._remember(ip, True, locked_until)
+        return locked_until
+
+    @classmethod
+    def register_success(cls, ip: str):
+        """Uspesna prijava brise brojac za IP - bez upisa ako red ne postoji"""
+        entry = cls._cached(ip)
+        if entry is not None and not entry[1]:
+            return
+
+        # Aktivna blokada ostaje (npr. ako je lokalni kes jos nije video)
+        result = db.session.execute(
+            delete(BlockedIPMac)
+            .where(
+                BlockedIPMac.ip_address == ip,
+                or_(BlockedIPMac.locked_until.is_(None), BlockedIPMac.locked_until <= datetime.utcnow())
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount:
+            cls._remember(ip, False, None)
+
+    @classmethod
+    def metrics(cls) -> dict:
+        with cls._metrics_lock:
+            metrics = dict(cls._metrics)
+        with cls._lock:
+            metrics["cached_ips"] = len(cls._cache)
+        metrics["cache_max_entries"] = cls.cache_max_entries
+        return metrics
+
+    @classmethod
+    def _cached(cls, ip: str):
+        with cls._lock:
+            entry = cls._cache.get(ip)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del cls._cache[ip]
+                return None
+            cls._cache.move_to_end(ip)
+            return entry
+
+    @classmethod
+    def _remember(cls, ip: str, exists: bool, locked_until):
+        """Blokada se kesira do svog isteka (skracuje je samo novi unos), sve ostalo cache_seconds"""
+        ttl = cls.cache_seconds
+        if locked_until is not None:
+            ttl = max(ttl, (locked_until - datetime.utcnow()).total_seconds())
+        entry = (time.monotonic() + ttl, exists, locked_until)
+        if ttl <= 0:
+            return entry
+
+        with cls._lock:
+            cls._cache[ip] = entry
+            cls._cache.move_to_end(ip)
+            while len(cls._cache) > cls.cache_max_entries:
+                cls._cache.popitem(last=False)
+        return entry
+
+    @classmethod
+    def _sweep(cls):
+        """Najvise jednom u sweep_seconds: istekli unosi kesa i redovi bez blokade i bez skorih neuspeha"""
+        now = time.monotonic()
+        if now < cls._next_sweep or not cls._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            cls._next_sweep = now + cls.sweep_seconds
+            with cls._lock:
+                for ip in [ip for ip, entry in cls._cache.items() if entry[0] <= now]:
+                    del cls._cache[ip]
+
+            utc_now = datetime.utcnow()
+            result = db.session.execute(
+                delete(BlockedIPMac)
+                .where(
+                    or_(BlockedIPMac.locked_until.is_(None), BlockedIPMac.locked_until <= utc_now),
+                    BlockedIPMac.updated_at < utc_now - timedelta(seconds=cls.window_seconds)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            cls._count("swept", result.rowcount or 0)
+        except Exception as e:
+            db.session.rollback()
+            print(f"LoginThrottle sweep failed: {e}")
+        finally:
+            cls._sweep_lock.release()
+
+    @classmethod
+    def _count(cls, name: str, amount: int = 1):
+        with cls._metrics_lock:
+            cls._metrics[name] += amount
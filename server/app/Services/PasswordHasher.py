@@ -0,0 +1,123 @@
+import threading
+import time
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    from eventlet import patcher, tpool
+except ImportError:  # eventlet je opcion - bez njega se hesira u pozivajucoj (nativnoj) niti
+    patcher = tpool = None
+
+class PasswordHasherBusy(RuntimeError):
+    """Previse zahteva ceka na hesiranje - klijent treba da pokusa ponovo"""
+
+class PasswordHasher:
+    """
+    Hesiranje lozinki van eventlet petlje, uz ogranicen broj istovremenih hesiranja.
+
+    scrypt/pbkdf2 traju desetine milisekundi CPU-a; na green niti bi za to
+    vreme stajali svi ostali zahtevi i WebSocket saobracaj jedinog worker-a.
+    Pod eventlet-om (monkey patch) posao ide u eventlet.tpool - nativne niti
+    u kojima hashlib pusta GIL - a green nit ceka bez blokiranja petlje.
+    Semafor ogranicava broj istovremenih hesiranja na workers; kad na red
+    ceka vise od max_waiting zahteva, novi se odbija sa PasswordHasherBusy.
+    method i salt_length su parametri werkzeug-a; needs_rehash() prepoznaje
+    hesove starijih parametara, pa ih prijava zamenjuje novim.
+    """
+    method = "scrypt:32768:8:1"
+    salt_length = 16
+    workers = 4
+    max_waiting = 64
+    enabled = True
+
+    _semaphore = threading.BoundedSemaphore(workers)
+    _method_prefix = None
+    _waiting = 0
+    _metrics = {"hashed": 0, "verified": 0, "rehashed": 0, "rejected": 0, "peak_waiting": 0,
+                "wait_seconds": 0.0, "work_seconds": 0.0}
+    _metrics_lock = threading.Lock()
+
+    @classmethod
+    def init_app(cls, app):
+        cls.method = app.config.get("PASSWORD_HASH_METHOD", cls.method)
+        cls.salt_length = app.config.get("PASSWORD_SALT_LENGTH", cls.salt_length)
+        cls.workers = app.config.get("PASSWORD_HASH_WORKERS", cls.workers)
+        cls.max_waiting = app.config.get("PASSWORD_HASH_MAX_WAITING", cls.max_waiting)
+        cls.enabled = app.config.get("PASSWORD_HASH_POOL_ENABLED", cls.enabled)
+        cls._semaphore = threading.BoundedSemaphore(cls.workers)
+        # Prefiks hesa sa punim parametrima (werkzeug dopunjava podrazumevane, npr. "pbkdf2" -> "pbkdf2:sha256:600000")
+        cls._method_prefix = generate_password_hash("", cls.method, cls.salt_length).split("$", 1)[0]
+        if tpool is not None and cls._offloaded():
+            tpool.set_num_threads(cls.workers)
+
+    @classmethod
+    def hash(cls, password: str) -> str:
+        cls._count("hashed")
+        return cls._run(generate_password_hash, password, cls.method, cls.salt_length)
+
+    @classmethod
+    def verify(cls, hashed_password: str, password: str) -> bool:
+        cls._count("verified")
+        return cls._run(check_password_hash, hashed_password, password)
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        """Hes napravljen drugim metodom/parametrima ili drugom duzinom soli od trenutno podesenih"""
+        if cls._method_prefix is None:
+            return False
+        method, _, rest = hashed_password.partition("$")
+        salt = rest.partition("$")[0]
+        return method != cls._method_prefix or len(salt) != cls.salt_length
+
+    @classmethod
+    def rehashed(cls):
+        cls._count("rehashed")
+
+    @classmethod
+    def metrics(cls) -> dict:
+        with cls._metrics_lock:
+            metrics = dict(cls._metrics)
+            metrics["waiting"] = cls._waiting
+        done = metrics["hashed"] + metrics["verified"]
+        metrics["avg_wait_ms"] = round(metrics["wait_seconds"] / done * 1000, 2) if done else 0
+        metrics["avg_work_ms"] = round(metrics["work_seconds"] / done * 1000, 2) if done else 0
+        metrics.update(workers=cls.workers, max_waiting=cls.max_waiting, method=cls.method,
+                       offloaded=cls._offloaded())
+        return metrics
+
+    @classmethod
+    def _offloaded(cls) -> bool:
+        return cls.enabled and patcher is not None and patcher.is_monkey_patched("thread")
+
+    @classmethod
+    def _run(cls, fn, *args):
+        queued_at = time.perf_counter()
+        # Slobodno mesto - bez cekanja; inace u red, ako red nije pun
+        if not cls._semaphore.acquire(blocking=False):
+            with cls._metrics_lock:
+                if cls._waiting >= cls.max_waiting:
+                    cls._metrics["rejected"] += 1
+                    raise PasswordHasherBusy("Server is busy, try again later.")
+                cls._waiting += 1
+                cls._metrics["peak_waiting"] = max(cls._metrics["peak_waiting"], cls._waiting)
+            try:
+                cls._semaphore.acquire()
+            finally:
+                with cls._metrics_lock:
+                    cls._waiting -= 1
+
+        started_at = time.perf_counter()
+        try:
+            if cls._offloaded():
+                return tpool.execute(fn, *args)
+            return fn(*args)
+        finally:
+            cls._semaphore.release()
+            with cls._metrics_lock:
+                cls._metrics["wait_seconds"] += started_at - queued_at
+                cls._metrics["work_seconds"] += time.perf_counter() - started_at
+
+    @classmethod
+    def _count(cls, name: str):
+        with cls._metrics_lock:
+            cls._metrics[name] += 1
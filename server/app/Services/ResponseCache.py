@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.Services.SingleFlight import SingleFlight
+from app.Services.UpstreamClient import UpstreamResult
+
+class ResponseCache:
+    """
+    In-process TTL kes sa LRU izbacivanjem za odgovore flight servisa.
+
+    Svaki unos zivi najvise ttl_seconds, a kad se predje max_entries izbacuje
+    se najdavnije korisceni. invalidate() podize generaciju, pa ucitavanje
+    koje je krenulo pre invalidacije ne upisuje zastareli odgovor.
+    Promasaji za isti kljuc idu kroz SingleFlight - istovremeni zahtevi
+    dele jedan upstream poziv umesto da svaki ode do flight servisa.
+    Istekli unos se ne baca odmah: njegov ETag ide uz sledeci upstream
+    zahtev, pa na 304 telo ostaje isto i samo mu se produzi TTL.
+    Vrednosti se dele izmedju zahteva i ne smeju se menjati.
+    """
+    _instances = []
+
+    def __init__(self, name: str, ttl_seconds: float = 30, max_entries: int = 512):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()   # key -> (istice_u, UpstreamResult)
+        self._single_flight = SingleFlight(name)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._revalidated = 0
+
+        ResponseCache._instances.append(self)
+
+    @classmethod
+    def init_app(cls, app):
+        for cache in cls._instances:
+            cache.ttl_seconds = app.config.get("GATEWAY_CACHE_TTL_SECONDS", cache.ttl_seconds)
+            cache.max_entries = app.config.get("GATEWAY_CACHE_MAX_ENTRIES", cache.max_entries)
+            cache.invalidate()
+
+    @classmethod
+    def invalidate_all(cls):
+        for cache in cls._instances:
+            cache.invalidate()
+
+    @classmethod
+    def metrics_all(cls) -> dict:
+        return {cache.name: cache.metrics() for cache in cls._instances}
+
+    def get_or_load(self, key, loader) -> UpstreamResult:
+        """
+        Vraca kesirani UpstreamResult ili poziva loader(etag) - etag isteklog unosa ili None.
+        Na not_modified odgovor loader-a zadrzava se staro telo; izuzeci se ne kesiraju.
+        """
+        if self.ttl_seconds <= 0:
+            return self._single_flight.do((self._generation, key), lambda: loader(None))
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            generation = self._generation
+            stale = entry[1] if entry is not None else None
+
+        def load():
+            result = loader(stale.etag if stale is not None and stale.etag else None)
+            if result.not_modified and stale is not None:
+                with self._lock:
+                    self._revalidated += 1
+                return stale
+            return result
+
+        # Generacija je deo kljuca - posle invalidacije se ne pridruzuje poziv koji je krenuo ranije
+        value = self._single_flight.do((generation, key), load)
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def invalidate(self, key=None):
+        """Brise jedan unos ili (bez kljuca) ceo kes"""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            if key is None:
+                self._entries = OrderedDict()
+            else:
+                self._entries.pop(key, None)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "revalidated": self._revalidated,
+                "single_flight": self._single_flight.metrics(),
+            }
@@ -0,0 +1,68 @@
+import threading
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Spaja istovremene identicne pozive: prvi pozivalac za kljuc izvrsava fn(),
+    a svi koji stignu dok je poziv u toku cekaju i dobijaju isti rezultat
+    (ili isti izuzetak). Posle zavrsetka kljuc se brise, pa se nista ne kesira.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._executions = 0
+        self._shared = 0
+        self._max_waiters = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            self._requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+            else:
+                call.waiters += 1
+                self._shared += 1
+                self._max_waiters = max(self._max_waiters, call.waiters)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "upstream_calls": self._executions,
+                "coalesced": self._shared,
+                "coalescing_ratio": round(self._shared / self._requests, 3) if self._requests else 0,
+                "max_waiters": self._max_waiters,
+                "in_flight": len(self._calls),
+            }
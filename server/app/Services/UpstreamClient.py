@@ -0,0 +1,157 @@
+import threading
+from typing import Any, NamedTuple, Optional
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class UpstreamResult(NamedTuple):
+    body: Any
+    etag: Optional[str]
+    not_modified: bool = False
+
+class UpstreamClient:
+    """
+    Deljeni HTTP klijent za sve pozive gateway -> flight_service.
+
+    Jedna requests.Session sa pool-om keep-alive konekcija, pa se TCP veza
+    ne otvara po pozivu. Svaki poziv ima connect/read timeout (podrazumevani
+    iz konfiguracije ili poseban po endpoint-u). Citanja (GET/HEAD/OPTIONS) se
+    ponavljaju ograniceni broj puta na greske konekcije, read timeout i
+    502/503/504. Upisi (POST/PUT/DELETE) samo kad konekcija nije uspostavljena,
+    tj. zahtev sigurno nije stigao - posle timeout-a ili 5xx flight servis je
+    mozda vec izvrsio izmenu (otkazivanje leta, odobrenje, brisanje), pa bi
+    ponovljen zahtev vratio pogresan rezultat ili poslao duple notifikacije.
+    """
+    RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+    RETRY_STATUSES = (502, 503, 504)
+
+    _session = None
+    _base_url = None
+    _timeout = (2, 10)
+    _lock = threading.Lock()
+
+    _metrics_lock = threading.Lock()
+    _requests_total = 0
+    _errors_total = 0
+    _in_flight = 0
+    _max_in_flight = 0
+
+    @classmethod
+    def init_app(cls, app):
+        config = app.config
+        retry = Retry(
+            total=config.get("UPSTREAM_RETRIES", 2),
+            connect=config.get("UPSTREAM_RETRIES", 2),
+            read=config.get("UPSTREAM_RETRIES", 2),
+            backoff_factor=config.get("UPSTREAM_RETRY_BACKOFF", 0.1),
+            status_forcelist=cls.RETRY_STATUSES,
+            allowed_methods=cls.RETRY_METHODS,     # ostali glagoli: samo connect retry
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=config.get("UPSTREAM_POOL_CONNECTIONS", 4),
+            pool_maxsize=config.get("UPSTREAM_POOL_MAXSIZE", 32),
+            pool_block=False,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+            cls._session = session
+            cls._base_url = config.get("FLIGHT_SERVICE_URL", "http://localhost:5051").rstrip("/")
+            cls._timeout = (
+                config.get("UPSTREAM_CONNECT_TIMEOUT", 2),
+                config.get("UPSTREAM_READ_TIMEOUT", 10)
+            )
+
+    @classmethod
+    def request(cls, method: str, path: str, timeout=None, **kwargs) -> requests.Response:
+        """path je relativan na FLIGHT_SERVICE_URL; timeout je (connect, read) ili None za podrazumevani"""
+        if cls._session is None:
+            cls.init_app(current_app)
+
+        with cls._metrics_lock:
+            cls._requests_total += 1
+            cls._in_flight += 1
+            cls._max_in_flight = max(cls._max_in_flight, cls._in_flight)
+
+        try:
+            return cls._session.request(
+                method,
+                f"{cls._base_url}{path}",
+                timeout=timeout or cls._timeout,
+                **kwargs
+            )
+        except requests.exceptions.RequestException:
+            with cls._metrics_lock:
+                cls._errors_total += 1
+            raise
+        finally:
+            with cls._metrics_lock:
+                cls._in_flight -= 1
+
+    @classmethod
+    def get_json(cls, path: str, etag: str = None, **kwargs) -> UpstreamResult:
+        """GET sa If-None-Match; na 304 vraca UpstreamResult bez tela i sa not_modified=True"""
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = cls.get(path, headers=headers, **kwargs)
+        if response.status_code == 304:
+            return UpstreamResult(None, response.headers.get("ETag") or etag, True)
+        response.raise_for_status()
+        return UpstreamResult(response.json(), response.headers.get("ETag"))
+
+    @classmethod
+    def get(cls, path: str, **kwargs) -> requests.Response:
+        return cls.request("GET", path, **kwargs)
+
+    @classmethod
+    def post(cls, path: str, **kwargs) -> requests.Response:
+        return cls.request("POST", path, **kwargs)
+
+    @classmethod
+    def put(cls, path: str, **kwargs) -> requests.Response:
+        return cls.request("PUT", path, **kwargs)
+
+    @classmethod
+    def delete(cls, path: str, **kwargs) -> requests.Response:
+        return cls.request("DELETE", path, **kwargs)
+
+    @classmethod
+    def metrics(cls) -> dict:
+        pools = []
+        if cls._session is not None:
+            adapter = cls._session.get_adapter(cls._base_url)
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+                pools.append({
+                    "host": f"{pool.host}:{pool.port}",
+                    "maxsize": pool.pool.maxsize if pool.pool else 0,
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle_connections": idle,
+                })
+
+        opened = sum(pool["connections_opened"] for pool in pools)
+        sent = sum(pool["requests"] for pool in pools)
+        with cls._metrics_lock:
+            return {
+                "requests_total": cls._requests_total,
+                "errors_total": cls._errors_total,
+                "in_flight": cls._in_flight,
+                "max_in_flight": cls._max_in_flight,
+                "connection_reuse_ratio": round(1 - opened / sent, 3) if sent else 0,
+                "pools": pools,
+            }
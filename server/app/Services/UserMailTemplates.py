@@ -1,3 +1,5 @@
+from html import escape
+
 def role_changed_body(name: str, old_role: str, new_role: str) -> str:
     return f"""
     <h2>Promena uloge</h2>
@@ -8,4 +10,13 @@ def role_changed_body(name: str, old_role: str, new_role: str) -> str:
       <li>Nova uloga: <b>{new_role}</b></li>
     </ul>
     <p>Prijatan dan,<br/>DRS tim</p>
-    """
\ No newline at end of file
+    """
+
+def notification_digest_body(items) -> str:
+    """Vise obavestenja (subject, body) za istog primaoca u jednom mejlu"""
+    sections = "".join(f"<hr/><h3>{escape(subject)}</h3>{body}" for subject, body in items)
+    return f"""
+    <h2>Pregled obaveštenja ({len(items)})</h2>
+    {sections}
+    <p>Prijatan dan,<br/>DRS tim</p>
+    """
@@ -1,18 +1,26 @@
 import os
 from app.WebSockets.events import register_socketio_events
-from flask import Flask, send_from_directory
-from app.Extensions import db, jwt, cors, socketio
+from flask import Flask, jsonify, send_from_directory
+from app.Extensions import db, jwt, cors, socketio, compress, FastJSONProvider
 from app.API.auth import auth_bp
 from app.API.users import users_bp
 from app.API.flights import flights_bp
 from app.API.airlines import airlines_bp
 from app.API.purchases import purchase_bp
 from app.API.ratings import rating_bp
+from app.Services.AdminRegistry import AdminRegistry
+from app.Services.EmailSender import EmailSender
+from app.Services.FlightEventListener import FlightEventListener
+from app.Services.LoginThrottle import LoginThrottle
+from app.Services.PasswordHasher import PasswordHasher
+from app.Services.ResponseCache import ResponseCache
+from app.Services.UpstreamClient import UpstreamClient
 import app.Config.config as config
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(config.Config)
+    app.json = FastJSONProvider(app)
 
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
@@ -25,6 +33,7 @@ def create_app():
         allow_headers=["Authorization", "Content-Type"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     )
+    compress.init_app(app)
     socketio.init_app(
         app, 
         cors_allowed_origins="*",
@@ -33,6 +42,13 @@ def create_app():
         engineio_logger=True
     )
     register_socketio_events(socketio)
+    UpstreamClient.init_app(app)
+    ResponseCache.init_app(app)
+    LoginThrottle.init_app(app)
+    AdminRegistry.init_app(app)
+    PasswordHasher.init_app(app)
+    if app.config.get("FLIGHT_EVENTS_ENABLED"):
+        FlightEventListener.start(app.config["FLIGHT_SERVICE_URL"])
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(users_bp)
@@ -45,7 +61,30 @@ def create_app():
     def uploaded_file(filename):
         return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
 
+    @app.route("/api/v1/mail/metrics")
+    def mail_metrics():
+        return jsonify(EmailSender.metrics())
+
+    @app.route("/api/v1/auth/throttle/metrics")
+    def login_throttle_metrics():
+        return jsonify(LoginThrottle.metrics())
+
+    @app.route("/api/v1/auth/hasher/metrics")
+    def password_hasher_metrics():
+        return jsonify(PasswordHasher.metrics())
+
+    @app.route("/api/v1/upstream/metrics")
+    def upstream_metrics():
+        return jsonify({**UpstreamClient.metrics(), "caches": ResponseCache.metrics_all()})
+
     with app.app_context():
         db.create_all()
 
+    EmailSender.start(
+        app,
+        batch_size=app.config.get("MAIL_OUTBOX_BATCH_SIZE", 50),
+        max_attempts=app.config.get("MAIL_OUTBOX_MAX_ATTEMPTS", 5),
+        idle_seconds=app.config.get("MAIL_SMTP_IDLE_SECONDS", 30)
+    )
+
     return app
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Benchmark prijave pod eventlet-om (kao gunicorn -k eventlet -w 1): hesiranje lozinke
+na green niti (stari put, PASSWORD_HASH_POOL_ENABLED=false) naspram PasswordHasher-a
+koji hesira u eventlet.tpool nativnim nitima.
+
+Pokretanje (iz server/):
+    python -m benchmarks.bench_login
+    python -m benchmarks.bench_login 64 16
+
+Uz prijave radi "ticker" green nit koja spava 5 ms i meri koliko kasni - to je
+kasnjenje koje bi u istom trenutku videli svi ostali zahtevi i WebSocket poruke.
+Prijave idu kroz Flask test klijent i /api/v1/login (baza je SQLite u temp fajlu),
+pa se meri ceo put: upit korisnika, LoginThrottle i provera lozinke.
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import os
+import sys
+import tempfile
+import time
+
+from flask import Flask
+
+from app.Extensions import db, jwt
+from app.API.auth import auth_bp
+from app.Domain.models import User
+from app.Domain.enums.UserRole import UserRole
+from app.Services.AdminRegistry import AdminRegistry
+from app.Services.LoginThrottle import LoginThrottle
+from app.Services.PasswordHasher import PasswordHasher
+
+PASSWORD = "bench-password"
+TICK = 0.005
+
+
+def _create_app(path: str):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    app.config["JWT_SECRET_KEY"] = "bench-secret-key-with-enough-length-for-hs256"
+    app.config["ADMINS_FILE"] = os.path.join(os.path.dirname(path), "no-admins.json")
+    app.config["PASSWORD_HASH_MAX_WAITING"] = 10_000
+    db.init_app(app)
+    jwt.init_app(app)
+    app.register_blueprint(auth_bp)
+    LoginThrottle.init_app(app)
+    AdminRegistry.init_app(app)
+    PasswordHasher.init_app(app)
+    return app
+
+
+def _seed(users: int):
+    db.create_all()
+    hashed = PasswordHasher.hash(PASSWORD)
+    db.session.add_all([
+        User(name="Bench", lastName=str(i), email=f"user{i}@example.com", role=UserRole.USER, password=hashed)
+        for i in range(users)
+    ])
+    db.session.commit()
+
+
+def _run(app, logins: int, concurrency: int, users: int) -> dict:
+    client = app.test_client()
+    lags = []
+    running = [True]
+
+    def ticker():
+        while running[0]:
+            start = time.perf_counter()
+            eventlet.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    def login(i):
+        response = client.post(
+            "/api/v1/login",
+            json={"email": f"user{i % users}@example.com", "password": PASSWORD},
+            environ_base={"REMOTE_ADDR": "10.0.0.1"}
+        )
+        assert response.status_code == 200, response.get_json()
+
+    tick = eventlet.spawn(ticker)
+    eventlet.sleep(0)
+    pool = eventlet.GreenPool(concurrency)
+    start = time.perf_counter()
+    list(pool.imap(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    running[0] = False
+    tick.wait()
+
+    lags.sort()
+    return {
+        "logins_per_second": logins / elapsed,
+        "loop_lag_p50_ms": lags[len(lags) // 2] * 1000 if lags else 0,
+        "loop_lag_max_ms": lags[-1] * 1000 if lags else 0,
+        "ticks": len(lags),
+    }
+
+
+def main(logins: int, concurrency: int):
+    users = 16
+    with tempfile.TemporaryDirectory() as directory:
+        app = _create_app(os.path.join(directory, "bench.db"))
+        with app.app_context():
+            _seed(users)
+
+        results = {}
+        for name, enabled in (("inline", False), ("pool", True)):
+            PasswordHasher.enabled = enabled
+            results[name] = _run(app, logins, concurrency, users)
+        metrics = PasswordHasher.metrics()
+
+    print(f"logins: {logins}, concurrency: {concurrency}, method: {PasswordHasher.method}, "
+          f"hash workers: {PasswordHasher.workers}, CPUs: {os.cpu_count()}")
+    print(f"{'path':>8} | {'logins/s':>9} | {'loop lag p50 (ms)':>17} | {'loop lag max (ms)':>17} | {'ticks':>6}")
+    for name, result in results.items():
+        print(f"{name:>8} | {result['logins_per_second']:>9.1f} | {result['loop_lag_p50_ms']:>17.2f} | "
+              f"{result['loop_lag_max_ms']:>17.2f} | {result['ticks']:>6}")
+    print(f"PasswordHasher: {metrics}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 64, int(args[1]) if len(args) > 1 else 16)